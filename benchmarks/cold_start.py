@@ -0,0 +1,96 @@
+"""Import-to-first-response time of a fresh process, with and without the startup warm-up.
+
+Each scenario runs ``--rounds`` times in a new interpreter that imports the
+ASGI app, optionally warms the model up (what Gunicorn's ``post_worker_init``
+does, along with importing the URLconf), then sends two ``POST /score/``
+requests in-process:
+
+- ``eager_imports``: joblib/pandas/sklearn imported with the app and the model
+  loaded by the first request, as before imports were deferred.
+- ``lazy``: deferred imports, the first request still loads the model.
+- ``warm_up``: deferred imports and ``model_service.warm_up()`` before serving.
+
+Needs a migrated database and a model (``MODEL_PATH``); numbers are medians.
+
+    DJANGO_SETTINGS_MODULE=config.test_settings python -m benchmarks.cold_start --rounds 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.fixtures import SAMPLE_FEATURES
+from benchmarks.score_load import asgi_request
+
+SCENARIOS = ("eager_imports", "lazy", "warm_up")
+
+
+def child(scenario: str) -> dict:
+    started = time.perf_counter()
+    if scenario == "eager_imports":
+        import joblib  # noqa: F401
+        import pandas  # noqa: F401
+
+        import scoring.ml.compiled  # noqa: F401
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    from config.asgi import application
+
+    imported = time.perf_counter()
+    if scenario == "warm_up":
+        from django.urls import get_resolver
+
+        from scoring.ml.service import model_service
+
+        model_service.warm_up()
+        get_resolver().url_patterns
+    warmed = time.perf_counter()
+
+    responses = []
+    for index in range(2):
+        body = json.dumps({"email": f"cold-start-{index}@example.com", **SAMPLE_FEATURES}).encode()
+        request_started = time.perf_counter()
+        status_code, _ = asyncio.run(asgi_request(application, "POST", "/api/v1/score/", body))
+        assert status_code == 200, status_code
+        responses.append((time.perf_counter() - request_started) * 1000)
+
+    return {
+        "import_ms": (imported - started) * 1000,
+        "warm_up_ms": (warmed - imported) * 1000,
+        "first_response_ms": responses[0],
+        "second_response_ms": responses[1],
+        "import_to_first_response_ms": (warmed - started) * 1000 + responses[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append")
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child)))
+        return
+
+    for scenario in args.scenario or SCENARIOS:
+        runs = []
+        for _ in range(args.rounds):
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.cold_start", "--child", scenario],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            runs.append(json.loads(completed.stdout.splitlines()[-1]))
+        result = {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]}
+        print(json.dumps({"scenario": scenario, "rounds": args.rounds, **result}))
+
+
+if __name__ == "__main__":
+    main()
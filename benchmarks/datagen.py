@@ -0,0 +1,71 @@
+"""Wall time and peak memory of the synthetic training data generator by ``--size``.
+
+Each run happens in a freshly forked child so peak RSS is not inherited from a
+previous, larger run. Peak RSS covers the process assembling the dataset;
+with ``--workers`` > 1 each generator process additionally holds about one
+chunk (Linux/macOS ``getrusage``).
+
+    python -m benchmarks.datagen --size 100000 --size 1000000 --size 5000000 --workers 4
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+
+from scoring.ml.datagen import DEFAULT_CHUNK_SIZE, generate_dataset
+
+SIZES = (100_000, 1_000_000, 5_000_000)
+
+
+def max_rss_mb(who: int) -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(who).ru_maxrss / scale
+
+
+def measure(size: int, seed: int, chunk_size: int, workers: int) -> dict:
+    baseline_mb = max_rss_mb(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    data, labels = generate_dataset(size, seed, chunk_size=chunk_size, workers=workers)
+    elapsed = time.perf_counter() - started
+    dataset_mb = (data.memory_usage(deep=True).sum() + labels.nbytes) / 1024**2
+    return {
+        "size": size,
+        "chunk_size": chunk_size,
+        "workers": workers,
+        "wall_seconds": elapsed,
+        "rows_per_second": size / elapsed,
+        "dataset_mb": dataset_mb,
+        "bytes_per_row": dataset_mb * 1024**2 / size,
+        "peak_rss_mb": max_rss_mb(resource.RUSAGE_SELF),
+        "baseline_rss_mb": baseline_mb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, action="append")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    for size in args.size or SIZES:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, json.dumps(measure(size, args.seed, args.chunk_size, args.workers)).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as reader:
+            result = json.loads(reader.read())
+        os.waitpid(pid, 0)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
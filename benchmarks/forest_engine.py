@@ -0,0 +1,97 @@
+"""Latency of the stock sklearn forest vs. the flat-array engine by batch size.
+
+Rows are random perturbations of a sample profile, preprocessed once with the
+compiled pipeline so only the forest evaluation is timed. ``pipeline`` is the
+full stock path (DataFrame + ColumnTransformer + forest) for reference.
+
+    python -m benchmarks.forest_engine --model-path scoring/ml/attendance_model.joblib
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import SAMPLE_FEATURES
+from scoring.ml.compiled import CompiledPipeline
+from scoring.ml.forest import FlatForest
+
+BATCH_SIZES = (1, 16, 256, 10000)
+
+
+def make_rows(compiled: CompiledPipeline, n_rows: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    categories = [list(category_map) for category_map in compiled._category_maps]
+    rows = []
+    for _ in range(n_rows):
+        row = dict(SAMPLE_FEATURES)
+        for column in compiled.numeric_columns:
+            row[column] = type(SAMPLE_FEATURES[column])(SAMPLE_FEATURES[column] * rng.uniform(0.0, 2.0))
+        for column, values in zip(compiled.categorical_columns, categories):
+            row[column] = values[rng.integers(len(values))]
+        rows.append(row)
+    return rows
+
+
+def time_call(function, min_seconds: float, min_repeats: int = 3) -> float:
+    timings = []
+    deadline = time.perf_counter() + min_seconds
+    while len(timings) < min_repeats or time.perf_counter() < deadline:
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", type=Path, default=Path("scoring/ml/attendance_model.joblib"))
+    parser.add_argument("--batch-size", type=int, action="append")
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="Minimum timing budget per engine and size.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model_path)
+    compiled = CompiledPipeline(pipeline)
+    classifier = compiled.classifier
+    started = time.perf_counter()
+    flat = FlatForest(classifier, max_rows=np.iinfo(np.int64).max)
+    build_seconds = time.perf_counter() - started
+    print(
+        json.dumps(
+            {
+                "trees": flat.n_trees,
+                "nodes": flat.n_nodes,
+                "depth": flat.depth,
+                "flat_build_ms": build_seconds * 1000,
+                "flat_max_rows": FlatForest(classifier).max_rows,
+            }
+        )
+    )
+
+    for batch_size in args.batch_size or BATCH_SIZES:
+        rows = make_rows(compiled, batch_size, args.seed)
+        frame = pd.DataFrame(rows)
+        matrix = compiled.transform_many(rows)
+        engines = {
+            "pipeline": lambda: pipeline.predict_proba(frame),
+            "sklearn": lambda: classifier.predict_proba(matrix),
+            "flat": lambda: flat.predict_proba(matrix),
+        }
+        result = {"batch_size": batch_size}
+        for name, function in engines.items():
+            seconds = time_call(function, args.min_seconds)
+            result[f"{name}_ms"] = seconds * 1000
+            result[f"{name}_us_per_row"] = seconds / batch_size * 1e6
+        result["speedup_vs_sklearn"] = result["sklearn_ms"] / result["flat_ms"]
+        result["max_abs_diff"] = float(np.abs(flat.predict_proba(matrix) - classifier.predict_proba(matrix)).max())
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
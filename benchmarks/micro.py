@@ -0,0 +1,163 @@
+"""Micro-benchmarks of the ``/score/`` building blocks: model load and predict, payload validation and ORM writes.
+
+- ``predict_cold``: a fresh ``ModelService`` loading (and compiling) the
+  artifact and answering its first request, per inference mode.
+- ``predict_warm`` / ``predict_many``: one row, and rows per call by batch
+  size, on an already loaded model.
+- ``validate``: ``ScoreRequestSerializer`` vs. ``ProfileValidator``.
+- ``orm_write``: the per-request write of ``ScoreView`` (upsert, insert,
+  latest score) vs. ``save_score_entries`` for a batch, per row. Needs a
+  migrated database; rows use ``bench-*@example.com`` emails.
+
+Each line is a JSON object with a ``name``; timings are the best of ``--rounds``.
+
+    python -m benchmarks.micro --model-path scoring/ml/attendance_model.joblib
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+from benchmarks.fixtures import SAMPLE_FEATURES, SAMPLE_PAYLOAD
+
+BATCH_SIZES = (1, 16, 256)
+RESULT = (0.93, 0.07, "attendee")
+
+
+def per_call_us(function, repeat: int, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best * 1e6
+
+
+def feature_rows(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            **SAMPLE_FEATURES,
+            "age": rng.randint(18, 70),
+            "distance_to_venue_km": round(rng.uniform(0, 80), 2),
+            "event_affinity_score": round(rng.random(), 3),
+        }
+        for _ in range(count)
+    ]
+
+
+def bench_predict(model_path: Path, mode: str, requests: int, rounds: int) -> list[dict]:
+    from scoring.ml.service import ModelService
+
+    def cold():
+        ModelService(model_path, inference_mode=mode, reload_check_interval=-1).predict(SAMPLE_FEATURES)
+
+    service = ModelService(model_path, inference_mode=mode, reload_check_interval=-1)
+    service.current()
+    predict_us = per_call_us(lambda: service.predict(SAMPLE_FEATURES), requests, rounds)
+    results = [
+        {"name": f"predict_cold/{mode}", "mode": mode, "load_and_first_ms": per_call_us(cold, 1, rounds) / 1000},
+        {"name": f"predict_warm/{mode}", "mode": mode, "predict_us": predict_us},
+    ]
+    for batch_size in BATCH_SIZES:
+        rows = feature_rows(batch_size, seed=batch_size)
+        batch_us = per_call_us(lambda: service.predict_many(rows), max(requests // batch_size, 3), rounds)
+        results.append(
+            {
+                "name": f"predict_many/{mode}/{batch_size}",
+                "mode": mode,
+                "batch_size": batch_size,
+                "batch_us": batch_us,
+                "per_row_us": batch_us / batch_size,
+            }
+        )
+    return results
+
+
+def bench_validate(requests: int, rounds: int) -> list[dict]:
+    from scoring.serializers import ScoreRequestSerializer
+    from scoring.validation import ProfileValidator
+
+    def serializer():
+        serializer = ScoreRequestSerializer(data=SAMPLE_PAYLOAD)
+        serializer.is_valid()
+        return serializer.validated_data
+
+    validator = ProfileValidator()
+    validator_us = per_call_us(lambda: validator(SAMPLE_PAYLOAD), requests, rounds)
+    return [
+        {"name": "validate/serializer", "validate_us": per_call_us(serializer, requests, rounds)},
+        {"name": "validate/profile_validator", "validate_us": validator_us},
+    ]
+
+
+def bench_orm(rows: int, batch_size: int, rounds: int) -> list[dict]:
+    from scoring.models import LatestPrediction, Prediction, UserProfile
+    from scoring.persistence import save_latest_predictions, save_score_entries
+
+    payloads = [{**SAMPLE_PAYLOAD, "email": f"bench-{index}@example.com"} for index in range(rows)]
+    state = {"index": 0}
+
+    def per_request():
+        payload = payloads[state["index"] % rows]
+        state["index"] += 1
+        user, _ = UserProfile.objects.update_or_create(email=payload["email"], defaults=payload)
+        prediction = Prediction.objects.create(
+            user=user,
+            attendance_probability=RESULT[0],
+            reseller_probability=RESULT[1],
+            risk_label=RESULT[2],
+            model_version="bench",
+        )
+        save_latest_predictions([LatestPrediction.from_prediction(user.email, prediction)])
+
+    def batch():
+        start = state["index"] % rows
+        state["index"] += batch_size
+        save_score_entries([(payload, RESULT, "bench") for payload in payloads[start : start + batch_size]])
+
+    # First pass creates the profiles; measured passes update them, like returning users do.
+    per_call_us(per_request, rows, 1)
+    per_request_us = per_call_us(per_request, rows, rounds)
+    batch_us = per_call_us(batch, max(rows // batch_size, 1), rounds)
+    UserProfile.objects.filter(email__startswith="bench-", email__endswith="@example.com").delete()
+    return [
+        {"name": "orm_write/per_request", "per_row_us": per_request_us},
+        {"name": f"orm_write/batch_{batch_size}", "batch_size": batch_size, "per_row_us": batch_us / batch_size},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", type=Path, default=Path("scoring/ml/attendance_model.joblib"))
+    parser.add_argument("--mode", choices=("pandas", "native", "forest"), action="append")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--orm-rows", type=int, default=500)
+    parser.add_argument("--orm-batch-size", type=int, default=100)
+    parser.add_argument("--skip", choices=("predict", "validate", "orm"), action="append", default=[])
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+
+    results = []
+    if "predict" not in args.skip:
+        for mode in args.mode or ("pandas", "native"):
+            results += bench_predict(args.model_path, mode, args.requests, args.rounds)
+    if "validate" not in args.skip:
+        results += bench_validate(args.requests, args.rounds)
+    if "orm" not in args.skip:
+        results += bench_orm(args.orm_rows, args.orm_batch_size, args.rounds)
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Run the benchmark suite, write a JSON report and compare it with a stored baseline.
+
+Every benchmark runs in its own subprocess (``python -m benchmarks.<name>``)
+against local resources only: the settings default to ``config.test_settings``
+with a SQLite file in ``--workdir`` (migrated first), and a small model is
+trained there when ``--model-path`` does not exist. Set
+``DJANGO_SETTINGS_MODULE``/``USE_POSTGRES_FOR_TESTS`` to benchmark PostgreSQL
+instead.
+
+The report maps a stable name (``score_load/sync/c64``,
+``predict_warm/native``...) to the numbers of that run. Against a baseline,
+each latency (``*_ms``, ``*_us``), memory (``*_kb``) and throughput
+(``*per_second``) figure that got worse by more than ``--tolerance`` is a
+regression, and the exit status is 1. A baseline from another profile, CPU
+count, platform or settings module is refused, and results that answered
+with non-2xx statuses are marked invalid and left out of the comparison.
+
+    python -m benchmarks.run --quick --save-baseline benchmark-baseline.json
+    python -m benchmarks.run --quick --baseline benchmark-baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CONCURRENCY_LEVELS = (1, 16, 64)
+LOWER_IS_BETTER = ("_ms", "_us", "_kb")
+HIGHER_IS_BETTER = ("per_second",)
+# A baseline is only meaningful on the machine and configuration that produced it.
+COMPARABLE_META = ("profile", "cpu_count", "platform", "settings")
+PROFILES = {
+    "full": {"micro_requests": 2000, "rounds": 3, "orm_rows": 500, "load_requests": 2000, "train_size": 20000},
+    "quick": {"micro_requests": 100, "rounds": 1, "orm_rows": 100, "load_requests": 300, "train_size": 5000},
+}
+
+
+def run_benchmark(module: str, args: list[str], env: dict, name) -> dict[str, dict]:
+    """Run `benchmarks.<module>` and key each JSON line it prints by `name(line)`."""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", f"benchmarks.{module}", *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"benchmarks.{module} failed:\n{completed.stderr}")
+    results = {}
+    for line in completed.stdout.splitlines():
+        line = json.loads(line)
+        failed = failed_requests(line)
+        if failed:
+            # Errors are cheap to serve: their latencies would pass for an improvement.
+            line["invalid"] = f"{failed} non-2xx responses"
+        results[name(line)] = line
+    elapsed = time.perf_counter() - started
+    print(f"benchmarks.{module} {' '.join(args)}: {len(results)} results in {elapsed:.1f}s", file=sys.stderr)
+    return results
+
+
+def failed_requests(result: dict) -> int:
+    """Responses outside 2xx in a load result's `statuses` (JSON keys are strings)."""
+    return sum(count for status, count in result.get("statuses", {}).items() if not 200 <= int(status) < 300)
+
+
+def metric_direction(metric: str) -> int:
+    """1 when higher is better, -1 when lower is better, 0 when the metric is not compared."""
+    if metric.endswith(HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """One entry per metric present in both reports, flagged when it got worse by more than `tolerance`.
+
+    Raises ValueError when the reports come from different machines or
+    configurations, and skips results marked invalid in either report.
+    """
+    report_meta, baseline_meta = report.get("meta", {}), baseline.get("meta", {})
+    mismatched = [key for key in COMPARABLE_META if report_meta.get(key) != baseline_meta.get(key)]
+    if mismatched:
+        raise ValueError(
+            ", ".join(f"{key} {baseline_meta.get(key)!r} != {report_meta.get(key)!r}" for key in mismatched)
+        )
+    comparisons = []
+    for name, result in report["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None or "invalid" in result or "invalid" in reference:
+            continue
+        for metric, value in result.items():
+            direction = metric_direction(metric)
+            before = reference.get(metric)
+            if not direction or not isinstance(value, (int, float)) or not before:
+                continue
+            change = (value - before) / before
+            comparisons.append(
+                {
+                    "name": name,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": value,
+                    "change": change,
+                    "regression": change * direction < -tolerance,
+                }
+            )
+    return comparisons
+
+
+def prepare(workdir: Path, model_path: Path, train_size: int, env: dict) -> Path:
+    subprocess.run([sys.executable, "manage.py", "migrate", "--noinput", "-v", "0"], cwd=ROOT, env=env, check=True)
+    if model_path.exists():
+        return model_path
+    trained = workdir / "attendance_model.joblib"
+    if not trained.exists():
+        print(f"{model_path} not found, training a {train_size}-row model in {workdir}", file=sys.stderr)
+        subprocess.run(
+            [sys.executable, "manage.py", "train_model", "--size", str(train_size)],
+            cwd=ROOT,
+            env={**env, "MODEL_PATH": str(trained)},
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+    return trained
+
+
+def git_commit() -> str | None:
+    completed = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=False)
+    return completed.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, default=Path("benchmark-report.json"))
+    parser.add_argument("--baseline", type=Path, default=None, help="Report to compare against.")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="Also write this run as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative slowdown tolerated before failing.")
+    parser.add_argument("--model-path", type=Path, default=ROOT / "scoring" / "ml" / "attendance_model.joblib")
+    parser.add_argument("--workdir", type=Path, default=None, help="Keeps the SQLite database and trained model.")
+    parser.add_argument("--concurrency", type=int, action="append", help="Load levels (default 1, 16 and 64).")
+    parser.add_argument("--workers", type=int, default=2, help="Forked workers measured by worker_rss.")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations, for CI smoke runs.")
+    args = parser.parse_args()
+
+    profile = PROFILES["quick" if args.quick else "full"]
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="api-queue-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    env.setdefault("DJANGO_SETTINGS_MODULE", "config.test_settings")
+    env.setdefault("SQLITE_DB_NAME", str(workdir / "bench.sqlite3"))
+    model_path = prepare(workdir, args.model_path.resolve(), profile["train_size"], env)
+    env["MODEL_PATH"] = str(model_path)
+    env["MODEL_RELOAD_CHECK_INTERVAL"] = "-1"
+
+    results = {}
+    results |= run_benchmark(
+        "micro",
+        [
+            *("--model-path", str(model_path), "--requests", str(profile["micro_requests"])),
+            *("--rounds", str(profile["rounds"]), "--orm-rows", str(profile["orm_rows"])),
+        ],
+        env,
+        lambda line: line.pop("name"),
+    )
+    for concurrency in args.concurrency or CONCURRENCY_LEVELS:
+        results |= run_benchmark(
+            "score_load",
+            ["--requests", str(profile["load_requests"]), "--concurrency", str(concurrency)],
+            env,
+            lambda line: f"score_load/{line['view']}/c{line['concurrency']}",
+        )
+    results |= run_benchmark(
+        "worker_rss",
+        ["--model-path", str(model_path), "--workers", str(args.workers), "--strategy", "per_worker", "--strategy", "preload"],
+        env,
+        lambda line: f"worker_rss/{line['strategy']}",
+    )
+    results |= run_benchmark(
+        "cold_start", ["--rounds", str(profile["rounds"])], env, lambda line: f"cold_start/{line['scenario']}"
+    )
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "commit": git_commit(),
+            "profile": "quick" if args.quick else "full",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "settings": env["DJANGO_SETTINGS_MODULE"],
+            "model_path": str(model_path),
+        },
+        "results": results,
+    }
+    invalid = {name: result["invalid"] for name, result in results.items() if "invalid" in result}
+    for name, reason in invalid.items():
+        print(f"INVALID {name}: {reason}, not compared", file=sys.stderr)
+    refused = None
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        try:
+            metrics = compare(report, baseline, args.tolerance)
+        except ValueError as exc:
+            refused = f"Refusing to compare with {args.baseline} from another machine or configuration: {exc}"
+        else:
+            report["comparison"] = {
+                "baseline": str(args.baseline),
+                "baseline_meta": baseline.get("meta", {}),
+                "tolerance": args.tolerance,
+                "invalid": sorted(invalid),
+                "metrics": metrics,
+            }
+
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline is not None:
+        baseline = {key: value for key, value in report.items() if key != "comparison"}
+        args.save_baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+    if refused is not None:
+        raise SystemExit(refused)
+
+    regressions = [item for item in report.get("comparison", {}).get("metrics", []) if item["regression"]]
+    for item in regressions:
+        print(
+            f"REGRESSION {item['name']} {item['metric']}: {item['baseline']:.4g} -> {item['current']:.4g} "
+            f"({item['change']:+.1%})",
+            file=sys.stderr,
+        )
+    print(
+        json.dumps(
+            {
+                "report": str(args.output),
+                "results": len(results),
+                "invalid": len(invalid),
+                "regressions": len(regressions),
+            }
+        )
+    )
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Closed-loop load test of the scoring endpoints through the ASGI application.
+
+Requests are driven in-process against ``config.asgi.application`` (no
+network stack), so the numbers isolate the Django/ORM/model cost of each view:
+``/score/`` goes through the sync-to-async thread bridge, ``/score/async/``
+stays on the event loop.
+
+    python -m benchmarks.score_load --requests 2000 --concurrency 64
+    python -m benchmarks.score_load --stub-model-ms 5   # no trained model needed
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from benchmarks.fixtures import SAMPLE_FEATURES
+
+SCORE_PATHS = {"sync": "/api/v1/score/", "async": "/api/v1/score/async/"}
+
+
+async def asgi_request(app, method: str, path: str, body: bytes = b"") -> tuple[int, bytes]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    response = {"status": 0, "body": b""}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return response["status"], response["body"]
+
+
+def rss_kb() -> int:
+    # Resident set of this process, i.e. of the single in-process "worker" (Linux).
+    with open("/proc/self/status") as handle:
+        for line in handle:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load(app, path: str, total: int, concurrency: int) -> dict:
+    latencies = []
+    statuses = {}
+    counter = iter(range(total))
+
+    async def client():
+        for index in counter:
+            body = json.dumps({"email": f"load-{index % 5000}@example.com", **SAMPLE_FEATURES}).encode()
+            started = time.perf_counter()
+            status_code, _ = await asgi_request(app, "POST", path, body)
+            latencies.append(time.perf_counter() - started)
+            statuses[status_code] = statuses.get(status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "path": path,
+        "requests": total,
+        "concurrency": concurrency,
+        "statuses": statuses,
+        "requests_per_second": total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "rss_kb": rss_kb(),
+    }
+
+
+def setup_application(stub_model_ms: float | None):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    from config.asgi import application
+    from scoring.ml.service import model_service
+    from scoring.views import AsyncScoreView, ScoreView
+
+    # The load generator is a single client IP; throttling would only measure the limiter.
+    ScoreView.throttle_classes = []
+    AsyncScoreView.throttle_classes = []
+
+    if stub_model_ms is not None:
+        def stub_predict(features):
+            time.sleep(stub_model_ms / 1000)
+            return 0.93, 0.07, "attendee"
+
+        model_service.predict = stub_predict
+    return application
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--view", choices=SCORE_PATHS, action="append")
+    parser.add_argument("--stub-model-ms", type=float, default=None, help="Replace the model with a fixed sleep.")
+    args = parser.parse_args()
+
+    application = setup_application(args.stub_model_ms)
+    for view in args.view or SCORE_PATHS:
+        result = asyncio.run(run_load(application, SCORE_PATHS[view], args.requests, args.concurrency))
+        print(json.dumps({"view": view, **result}))
+
+
+if __name__ == "__main__":
+    main()
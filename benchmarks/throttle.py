@@ -0,0 +1,99 @@
+"""Per-request cost of the anon throttle: DRF's cache-backed ``AnonRateThrottle`` vs. the shared token bucket.
+
+Each check runs ``allow_request`` on a prebuilt request, cycling through
+``--clients`` client addresses with a rate high enough never to throttle, so
+only the bookkeeping is timed. DRF's throttle keeps a list of timestamps per
+client in the cache and rewrites it on every request; its cost grows with the
+rate. A second part starts ``--processes`` processes hammering one client
+through the shared file and checks that exactly ``--capacity`` requests pass.
+
+    python -m benchmarks.throttle --checks 50000 --rate 5000/min
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def per_check_us(throttle, requests, checks: int) -> float:
+    started = time.perf_counter()
+    for index in range(checks):
+        throttle.allow_request(requests[index % len(requests)], None)
+    return (time.perf_counter() - started) / checks * 1e6
+
+
+def measure(name: str, throttle_class, rate: str, clients: int, checks: int, rounds: int) -> dict:
+    from django.core.cache import cache
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+    requests = [
+        Request(factory.get("/api/v1/score/", REMOTE_ADDR=f"10.0.{client // 256}.{client % 256}"), authenticators=())
+        for client in range(clients)
+    ]
+    throttle_class.THROTTLE_RATES = {"anon": rate}
+    cache.clear()
+    throttle = throttle_class()
+    # Best of several rounds; histories and buckets persist between rounds, like in a long-running worker.
+    check_us = min(per_check_us(throttle, requests, checks) for _ in range(rounds))
+    return {"throttle": name, "rate": rate, "clients": clients, "check_us": check_us}
+
+
+def consume(path: str, capacity: int, attempts: int) -> int:
+    from scoring.throttling import SharedTokenBuckets
+
+    buckets = SharedTokenBuckets(Path(path))
+    return sum(buckets.consume("client", capacity, 1e-9)[0] for _ in range(attempts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--rate", action="append", help="Throttle rate, e.g. 5000/min (repeatable).")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--capacity", type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from rest_framework.throttling import AnonRateThrottle
+
+    from scoring import throttling
+
+    with tempfile.TemporaryDirectory() as directory:
+        throttling.shared_token_buckets = throttling.SharedTokenBuckets(Path(directory) / "throttle")
+        for rate in args.rate or ["5000/min", "50000/hour"]:
+            drf = measure("drf_locmem", AnonRateThrottle, rate, args.clients, args.checks, args.rounds)
+            shared = measure("shared_bucket", throttling.SharedAnonRateThrottle, rate, args.clients, args.checks, args.rounds)
+            print(json.dumps(drf))
+            print(json.dumps(shared))
+            print(json.dumps({"rate": rate, "speedup": drf["check_us"] / shared["check_us"]}))
+
+        path = str(Path(directory) / "global")
+        attempts = args.capacity // args.processes * 2
+        with multiprocessing.get_context("forkserver").Pool(args.processes) as pool:
+            allowed = pool.starmap(consume, [(path, args.capacity, attempts)] * args.processes)
+        print(
+            json.dumps(
+                {
+                    "processes": args.processes,
+                    "attempts": attempts * args.processes,
+                    "capacity": args.capacity,
+                    "allowed": sum(allowed),
+                    "allowed_per_process": allowed,
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
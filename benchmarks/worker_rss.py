@@ -0,0 +1,104 @@
+"""Per-worker memory of N forked scoring workers, with and without a preloaded model.
+
+Mirrors what Gunicorn does: each strategy forks ``--workers`` children that run
+one prediction and then pause while the parent reads their
+``/proc/<pid>/smaps_rollup`` (Linux only).
+
+    python -m benchmarks.worker_rss --model-path scoring/ml/attendance_model.joblib --workers 4
+"""
+
+import argparse
+import gc
+import json
+import os
+from pathlib import Path
+
+from benchmarks.fixtures import SAMPLE_FEATURES
+from scoring.ml.service import ModelService
+
+STRATEGIES = ("per_worker", "per_worker_mmap", "preload")
+
+
+def read_memory_kb(pid: int) -> dict[str, int]:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as handle:
+        for line in handle:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_kb": values["Rss"],
+        "pss_kb": values["Pss"],
+        "uss_kb": values["Private_Clean"] + values["Private_Dirty"],
+        "shared_kb": values["Shared_Clean"] + values["Shared_Dirty"],
+    }
+
+
+def measure(strategy: str, model_path: Path, workers: int) -> dict:
+    service = ModelService(model_path, reload_check_interval=-1, mmap_mode="r" if strategy == "per_worker_mmap" else None)
+    if strategy == "preload":
+        service.current()
+        gc.freeze()
+
+    children = []
+    for _ in range(workers):
+        ready_read, ready_write = os.pipe()
+        release_read, release_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            os.close(release_write)
+            service.predict(SAMPLE_FEATURES)
+            os.write(ready_write, b"1")
+            os.read(release_read, 1)
+            os._exit(0)
+        os.close(ready_write)
+        os.close(release_read)
+        children.append((pid, ready_read, release_write))
+
+    samples = []
+    for pid, ready_read, _ in children:
+        os.read(ready_read, 1)
+    for pid, _, _ in children:
+        samples.append(read_memory_kb(pid))
+    for pid, ready_read, release_write in children:
+        os.write(release_write, b"1")
+        os.waitpid(pid, 0)
+        os.close(ready_read)
+        os.close(release_write)
+
+    return {
+        "strategy": strategy,
+        "workers": workers,
+        "mean_rss_kb": sum(s["rss_kb"] for s in samples) // workers,
+        "mean_pss_kb": sum(s["pss_kb"] for s in samples) // workers,
+        "mean_uss_kb": sum(s["uss_kb"] for s in samples) // workers,
+        "total_pss_kb": sum(s["pss_kb"] for s in samples),
+        "samples": samples,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", type=Path, default=Path("scoring/ml/attendance_model.joblib"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--strategy", choices=STRATEGIES, action="append")
+    args = parser.parse_args()
+
+    # Each strategy runs in its own child so the parent's heap stays clean.
+    for strategy in args.strategy or STRATEGIES:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, json.dumps(measure(strategy, args.model_path, args.workers)).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as reader:
+            result = json.loads(reader.read())
+        os.waitpid(pid, 0)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import gc
+import os
+
+# Load the app (and the model) once in the master and fork workers from it, so
+# the forest's tree arrays live in copy-on-write pages shared by every worker
+# instead of one private copy per worker. sklearn copies tree nodes out of the
+# pickle buffer on load, so MODEL_MMAP_MODE alone only shares part of the model.
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+
+    from scoring.ml.service import model_service
+
+    try:
+        handle = model_service.current()
+    except FileNotFoundError:
+        location = model_service.registry.pointer_path if model_service.registry else model_service.model_path
+        server.log.warning("Model not found at %s, workers will load it lazily", location)
+        return
+
+    # Move everything allocated so far out of the collector's generations so
+    # worker GC passes do not write to (and un-share) the inherited pages.
+    gc.freeze()
+    server.log.info("Preloaded model %s (generation %s) in master", handle.version, handle.generation)
+
+
+def post_worker_init(worker):
+    # Runs before the worker accepts connections: its first requests never pay for the model
+    # load or the first prediction's lazy setup, and /ready/ answers 200 from the start.
+    from django.urls import get_resolver
+
+    from scoring.ml.service import model_service
+
+    # The URLconf (views, serializers, DRF) is otherwise imported by the first request.
+    get_resolver().url_patterns
+    try:
+        seconds = model_service.warm_up()
+    except FileNotFoundError:
+        worker.log.warning("Model not found, /ready/ answers 503 until it can be loaded")
+        return
+    worker.log.info("Worker warmed up model %s in %.2fs", model_service.version, seconds)
+
+
+def worker_exit(server, worker):
+    from scoring.persistence import write_behind_buffer
+
+    write_behind_buffer.close()
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -6,8 +6,47 @@ SECRET_KEY = os.getenv("SECRET_KEY", "unsafe-dev-key")
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "*").split(",")
 MODEL_PATH = Path(os.getenv("MODEL_PATH", BASE_DIR / "scoring" / "ml" / "attendance_model.joblib"))
+# Optional directory of versioned model artifacts; when set it replaces MODEL_PATH.
+MODEL_REGISTRY_DIR = Path(os.getenv("MODEL_REGISTRY_DIR")) if os.getenv("MODEL_REGISTRY_DIR") else None
+MODEL_INFERENCE_MODE = os.getenv("MODEL_INFERENCE_MODE", "pandas").lower()
+MODEL_RELOAD_CHECK_INTERVAL = float(os.getenv("MODEL_RELOAD_CHECK_INTERVAL", "5"))
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE") or None
+# Optional directory of per-key models (<key>.joblib files or <key>/ registries) served via ?model_key=.
+MODEL_POOL_DIR = Path(os.getenv("MODEL_POOL_DIR")) if os.getenv("MODEL_POOL_DIR") else None
+MODEL_POOL_MAX_MB = int(os.getenv("MODEL_POOL_MAX_MB", "2048"))
+MODEL_RESULT_CACHE = os.getenv("MODEL_RESULT_CACHE", "false").lower() == "true"
+MODEL_RESULT_CACHE_SIZE = int(os.getenv("MODEL_RESULT_CACHE_SIZE", "10000"))
+MODEL_RESULT_CACHE_TTL = float(os.getenv("MODEL_RESULT_CACHE_TTL", "30"))
+# Optional alias from CACHES used as a shared, cross-worker second level.
+MODEL_RESULT_CACHE_BACKEND = os.getenv("MODEL_RESULT_CACHE_BACKEND", "")
+SCORE_CACHE_DEDUPE_PREDICTIONS = os.getenv("SCORE_CACHE_DEDUPE_PREDICTIONS", "false").lower() == "true"
+LATEST_SCORE_CACHE_SIZE = int(os.getenv("LATEST_SCORE_CACHE_SIZE", "10000"))
+# Bounds how long another worker may serve a superseded score for GET /score/<email>/.
+LATEST_SCORE_CACHE_TTL = float(os.getenv("LATEST_SCORE_CACHE_TTL", "2"))
+LATEST_SCORE_CACHE_BACKEND = os.getenv("LATEST_SCORE_CACHE_BACKEND", "")
 ENABLE_MODEL_TRAIN_ENDPOINT = os.getenv("ENABLE_MODEL_TRAIN_ENDPOINT", "false").lower() == "true"
 MODEL_TRAIN_TOKEN = os.getenv("MODEL_TRAIN_TOKEN", "")
+MODEL_TRAIN_SIZE = int(os.getenv("MODEL_TRAIN_SIZE", "120000"))
+MODEL_TRAIN_SEED = int(os.getenv("MODEL_TRAIN_SEED", "42"))
+MODEL_TRAIN_N_JOBS = int(os.getenv("MODEL_TRAIN_N_JOBS", "1"))
+MODEL_TRAIN_NICENESS = int(os.getenv("MODEL_TRAIN_NICENESS", "10"))
+MODEL_TRAIN_JOB_STALE_AFTER = int(os.getenv("MODEL_TRAIN_JOB_STALE_AFTER", "3600"))
+SCORE_BATCH_MAX_ITEMS = int(os.getenv("SCORE_BATCH_MAX_ITEMS", "1000"))
+SCORE_INFERENCE_THREADS = int(os.getenv("SCORE_INFERENCE_THREADS", "4"))
+SCORE_MICROBATCH = os.getenv("SCORE_MICROBATCH", "false").lower() == "true"
+SCORE_MICROBATCH_MAX_SIZE = int(os.getenv("SCORE_MICROBATCH_MAX_SIZE", "64"))
+SCORE_MICROBATCH_MAX_WAIT_MS = float(os.getenv("SCORE_MICROBATCH_MAX_WAIT_MS", "2"))
+# orjson-backed DRF parser/renderer (scoring.fastjson); falls back to the stdlib without orjson.
+API_FAST_JSON = os.getenv("API_FAST_JSON", "false").lower() == "true"
+# Validate /score/ payloads with scoring.validation.ProfileValidator and skip the response serializer.
+SCORE_LEAN_VALIDATION = os.getenv("SCORE_LEAN_VALIDATION", "false").lower() == "true"
+# File for the cross-worker token-bucket anon throttle (scoring.throttling); empty keeps DRF's per-worker throttle.
+THROTTLE_SHARED_PATH = os.getenv("THROTTLE_SHARED_PATH", "")
+THROTTLE_SHARED_SLOTS = int(os.getenv("THROTTLE_SHARED_SLOTS", "65536"))
+SCORE_WRITE_BEHIND = os.getenv("SCORE_WRITE_BEHIND", "false").lower() == "true"
+SCORE_WRITE_BEHIND_MAX_BATCH = int(os.getenv("SCORE_WRITE_BEHIND_MAX_BATCH", "500"))
+SCORE_WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("SCORE_WRITE_BEHIND_FLUSH_INTERVAL", "0.5"))
+SCORE_WRITE_BEHIND_MAX_PENDING = int(os.getenv("SCORE_WRITE_BEHIND_MAX_PENDING", "10000"))
 
 INSTALLED_APPS = [
     "django.contrib.auth",
@@ -57,6 +96,21 @@ DATABASES = {
         "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "300")),
     }
 }
+# psycopg_pool connection pool per worker process, shared by every thread and async view of the worker.
+DB_POOL = os.getenv("DB_POOL", "true").lower() == "true"
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "8")),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "5")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+        }
+    }
+    # Pooled connections go back to the pool after each request instead of staying open per thread.
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
@@ -76,6 +130,19 @@ REST_FRAMEWORK = {
     },
 }
 
+if THROTTLE_SHARED_PATH:
+    REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"] = ["scoring.throttling.SharedAnonRateThrottle"]
+if API_FAST_JSON:
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = [
+        "scoring.fastjson.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ]
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [
+        "scoring.fastjson.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ]
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "API Queue Scoring API",
     "DESCRIPTION": "API para scoring de asistencia y riesgo de reventa.",
@@ -6,6 +6,11 @@ MODEL_PATH="${MODEL_PATH:-/app/scoring/ml/attendance_model.joblib}"
 echo "[entrypoint] Running migrations"
 .venv/bin/python manage.py migrate --noinput
 
+if [ -n "${MODEL_REGISTRY_DIR:-}" ]; then
+  # With a registry, the served model is whatever CURRENT points at.
+  MODEL_PATH="$MODEL_REGISTRY_DIR/CURRENT"
+fi
+
 if [ ! -f "$MODEL_PATH" ]; then
   echo "[entrypoint] Model not found, training initial model"
   .venv/bin/python manage.py train_model
@@ -24,7 +29,18 @@ if [ "${DEV_RELOAD:-false}" = "true" ]; then
 fi
 
 echo "[entrypoint] Starting gunicorn"
+# Workers write metric samples to per-process files here; /metrics aggregates them.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus-multiproc}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+# Token buckets of the anon throttle, shared by all workers; set it empty to use DRF's per-worker throttle.
+export THROTTLE_SHARED_PATH="${THROTTLE_SHARED_PATH-/tmp/api-queue-throttle}"
+if [ -n "$THROTTLE_SHARED_PATH" ]; then
+  rm -f "$THROTTLE_SHARED_PATH"
+fi
+
 exec .venv/bin/gunicorn config.asgi:application \
+  --config config/gunicorn.conf.py \
   -k uvicorn.workers.UvicornWorker \
   --bind 0.0.0.0:8000 \
   --workers "${GUNICORN_WORKERS:-4}" \
@@ -1,6 +1,63 @@
+from pathlib import Path
+
 from django.apps import AppConfig
 
 
 class ScoringConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "scoring"
+
+    def ready(self):
+        from django.conf import settings
+        from django.core.cache import caches
+        from django.core.signals import request_finished
+        from django.db.backends.signals import connection_created
+
+        from scoring.metrics import count_connection_created, record_db_pool_stats, register_connection_metrics
+        from scoring.ml.batching import micro_batcher
+        from scoring.ml.cache import ResultCache
+        from scoring.ml.pool import model_pool
+        from scoring.ml.registry import ModelRegistry
+        from scoring.ml.service import model_service
+        from scoring.persistence import latest_score_cache, write_behind_buffer
+        from scoring.throttling import shared_token_buckets
+
+        if settings.DB_POOL:
+            request_finished.connect(record_db_pool_stats, dispatch_uid="scoring.record_db_pool_stats")
+        else:
+            register_connection_metrics()
+            connection_created.connect(count_connection_created, dispatch_uid="scoring.count_connection_created")
+
+        model_service.model_path = settings.MODEL_PATH
+        model_service.registry = ModelRegistry(settings.MODEL_REGISTRY_DIR) if settings.MODEL_REGISTRY_DIR else None
+        model_service.inference_mode = settings.MODEL_INFERENCE_MODE
+        model_service.reload_check_interval = settings.MODEL_RELOAD_CHECK_INTERVAL
+        model_service.mmap_mode = settings.MODEL_MMAP_MODE
+        model_pool.root = settings.MODEL_POOL_DIR
+        model_pool.max_bytes = settings.MODEL_POOL_MAX_MB << 20
+        model_pool.inference_mode = settings.MODEL_INFERENCE_MODE
+        model_pool.reload_check_interval = settings.MODEL_RELOAD_CHECK_INTERVAL
+        model_pool.mmap_mode = settings.MODEL_MMAP_MODE
+        if settings.MODEL_RESULT_CACHE:
+            model_service.result_cache = ResultCache(
+                max_entries=settings.MODEL_RESULT_CACHE_SIZE,
+                ttl=settings.MODEL_RESULT_CACHE_TTL,
+                backend=caches[settings.MODEL_RESULT_CACHE_BACKEND] if settings.MODEL_RESULT_CACHE_BACKEND else None,
+            )
+
+        latest_score_cache.max_entries = settings.LATEST_SCORE_CACHE_SIZE
+        latest_score_cache.ttl = settings.LATEST_SCORE_CACHE_TTL
+        latest_score_cache.backend = (
+            caches[settings.LATEST_SCORE_CACHE_BACKEND] if settings.LATEST_SCORE_CACHE_BACKEND else None
+        )
+
+        micro_batcher.max_batch_size = settings.SCORE_MICROBATCH_MAX_SIZE
+        micro_batcher.max_wait = settings.SCORE_MICROBATCH_MAX_WAIT_MS / 1000
+
+        if settings.THROTTLE_SHARED_PATH:
+            shared_token_buckets.path = Path(settings.THROTTLE_SHARED_PATH)
+        shared_token_buckets.slots = settings.THROTTLE_SHARED_SLOTS
+
+        write_behind_buffer.max_batch = settings.SCORE_WRITE_BEHIND_MAX_BATCH
+        write_behind_buffer.flush_interval = settings.SCORE_WRITE_BEHIND_FLUSH_INTERVAL
+        write_behind_buffer.max_pending = settings.SCORE_WRITE_BEHIND_MAX_PENDING
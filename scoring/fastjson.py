@@ -0,0 +1,58 @@
+"""orjson-backed JSON parser and renderer for DRF.
+
+orjson is optional (`pip install "api-queue[fast-json]"`). Without it these
+classes fall back to the standard library and behave like DRF's own
+`JSONParser`/`JSONRenderer`: compact, UTF-8, NaN/Infinity rejected.
+"""
+
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+from rest_framework.utils.json import strict_constant
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Types orjson does not know natively (Decimal, lazy strings, querysets...) go through DRF's encoder,
+# and so do datetimes, so both backends render them exactly like DRF (millisecond precision, "Z").
+drf_default = encoders.JSONEncoder().default
+
+
+def loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data, parse_constant=strict_constant)
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=drf_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(
+        data, cls=encoders.JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+class FastJSONParser(BaseParser):
+    media_type = "application/json"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
+
+
+class FastJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data)
@@ -0,0 +1,105 @@
+from itertools import batched
+from pathlib import Path
+import csv
+import gzip
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from scoring.persistence import bulk_upsert_profiles, copy_upsert_profiles
+from scoring.validation import ProfileValidator
+
+FORMATS = ("csv", "jsonl")
+SUFFIX_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def detect_format(path: Path) -> str | None:
+    suffixes = [suffix for suffix in path.suffixes if suffix != ".gz"]
+    return SUFFIX_FORMATS.get(suffixes[-1].lower()) if suffixes else None
+
+
+def read_records(path: Path, file_format: str):
+    """Yield `(line_number, record)` one row at a time; a record is a dict, or an error message string."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8", newline="") as source:
+        if file_format == "csv":
+            reader = csv.DictReader(source)
+            for record in reader:
+                record.pop(None, None)  # Cells beyond the header.
+                yield reader.line_num, record
+            return
+
+        for line_number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, f"Invalid JSON: {exc.msg}."
+                continue
+            yield line_number, record if isinstance(record, dict) else "Expected a JSON object."
+
+
+class Command(BaseCommand):
+    help = "Validate and upsert user profiles from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path, help="CSV (with header) or JSONL file, optionally gzip-compressed.")
+        parser.add_argument("--format", choices=FORMATS, default=None, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Valid rows upserted per transaction.")
+        parser.add_argument("--rejects", type=Path, default=None, help="Write rejected rows and errors as JSONL.")
+
+    def handle(self, *args, **kwargs):
+        path = kwargs["path"]
+        file_format = kwargs["format"] or detect_format(path)
+        if file_format is None:
+            raise CommandError(f"Cannot tell the format of {path}; pass --format csv|jsonl")
+        if not path.is_file():
+            raise CommandError(f"{path} does not exist")
+        if kwargs["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        # COPY into a staging table on PostgreSQL; a multi-row upsert elsewhere.
+        upsert = copy_upsert_profiles if connection.vendor == "postgresql" else bulk_upsert_profiles
+        validator = ProfileValidator()
+        rejects = kwargs["rejects"].open("w", encoding="utf-8") if kwargs["rejects"] else None
+        imported = rejected = 0
+        started = time.perf_counter()
+        try:
+            for batch in batched(read_records(path, file_format), kwargs["batch_size"]):
+                profiles = []
+                for line_number, record in batch:
+                    if isinstance(record, str):
+                        validated, errors = {}, {"non_field_errors": [record]}
+                    else:
+                        validated, errors = validator(record)
+                    if errors:
+                        rejected += 1
+                        self._reject(rejects, line_number, errors, rejected)
+                    else:
+                        profiles.append(validated)
+                upsert(profiles)
+                imported += len(profiles)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"Imported {imported} profiles, rejected {rejected} ({(imported + rejected) / elapsed:.0f} rows/s)"
+                )
+        finally:
+            if rejects is not None:
+                rejects.close()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} profiles from {path} in {elapsed:.2f}s; rejected {rejected} rows"
+                + (f" (see {kwargs['rejects']})" if rejects is not None and rejected else "")
+            )
+        )
+
+    def _reject(self, rejects, line_number, errors, rejected):
+        if rejects is not None:
+            rejects.write(json.dumps({"line": line_number, "errors": errors}) + "\n")
+        elif rejected <= 5:
+            self.stderr.write(f"Line {line_number}: {json.dumps(errors)}")
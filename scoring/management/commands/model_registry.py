@@ -0,0 +1,55 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from scoring.ml.registry import ModelRegistry, UnknownModelVersion
+
+
+class Command(BaseCommand):
+    help = "List, promote or roll back model versions in MODEL_REGISTRY_DIR"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["list", "promote", "rollback"])
+        parser.add_argument(
+            "version",
+            nargs="?",
+            default=None,
+            help="Version to promote (required) or roll back to (defaults to the previous one).",
+        )
+
+    def handle(self, *args, **kwargs):
+        if settings.MODEL_REGISTRY_DIR is None:
+            raise CommandError("MODEL_REGISTRY_DIR is not configured")
+        registry = ModelRegistry(settings.MODEL_REGISTRY_DIR)
+        action = kwargs["action"]
+        version = kwargs["version"]
+
+        try:
+            if action == "list":
+                self._list(registry)
+            elif action == "promote":
+                if version is None:
+                    raise CommandError("promote requires a version")
+                registry.promote(version)
+                self.stdout.write(self.style.SUCCESS(f"Promoted model version {version}"))
+            else:
+                pointer = registry.rollback(version)
+                self.stdout.write(self.style.SUCCESS(f"Rolled back to model version {pointer['version']}"))
+        except FileNotFoundError:
+            raise CommandError("No model version has been promoted yet") from None
+        except UnknownModelVersion as exc:
+            raise CommandError(str(exc)) from None
+
+    def _list(self, registry):
+        try:
+            current = registry.current_version()
+        except FileNotFoundError:
+            current = None
+        for record in registry.versions():
+            marker = "*" if record["version"] == current else " "
+            summary = {
+                key: record.get(key)
+                for key in ("created_at", "validation_accuracy", "training_size", "seed", "fit_seconds")
+            }
+            self.stdout.write(f"{marker} {record['version']} {json.dumps(summary)}")
@@ -0,0 +1,215 @@
+from datetime import UTC, datetime, timedelta
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from scoring.models import Prediction
+
+INTERVALS = ("month", "day")
+BOUND = re.compile(r"FROM \((?P<lower>[^)]+)\) TO \((?P<upper>[^)]+)\)")
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    start = moment.astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start.replace(day=1) if interval == "month" else start
+
+
+def next_period(start: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return start + timedelta(days=1)
+    return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+
+def partition_name(start: datetime, interval: str) -> str:
+    suffix = start.strftime("%Y_%m") if interval == "month" else start.strftime("%Y_%m_%d")
+    return f"{Prediction._meta.db_table}_p{suffix}"
+
+
+def bound_literal(moment: datetime) -> str:
+    # Partition DDL takes no bind parameters; an ISO timestamp is a safe literal.
+    return f"'{moment.astimezone(UTC).isoformat()}'"
+
+
+def parse_bound(value: str) -> datetime | None:
+    """A `pg_get_expr(relpartbound)` datetime literal; None for MINVALUE/MAXVALUE."""
+    value = value.strip().strip("'")
+    return None if value.upper() in ("MINVALUE", "MAXVALUE") else datetime.fromisoformat(value).astimezone(UTC)
+
+
+class Command(BaseCommand):
+    help = "Convert Prediction to a created_at range-partitioned table and create or drop its partitions (PostgreSQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["status", "convert", "create", "drop"])
+        parser.add_argument("--interval", choices=INTERVALS, default="month", help="Range covered by new partitions.")
+        parser.add_argument("--ahead", type=int, default=3, help="Future partitions kept ready by convert/create.")
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help="drop: remove partitions whose rows are all older than this many days.",
+        )
+
+    def handle(self, *args, **kwargs):
+        if connection.vendor != "postgresql":
+            raise CommandError("Prediction partitioning requires PostgreSQL")
+        self.table = Prediction._meta.db_table
+        self.quote = connection.ops.quote_name
+        action = kwargs["action"]
+
+        if action == "convert":
+            if self._is_partitioned():
+                raise CommandError(f"{self.table} is already partitioned")
+            self._convert(kwargs["interval"], kwargs["ahead"])
+            return
+        if not self._is_partitioned():
+            raise CommandError(f"{self.table} is not partitioned yet; run `prediction_partitions convert` first")
+        if action == "status":
+            self._status()
+        elif action == "create":
+            self._create_ahead(kwargs["interval"], kwargs["ahead"])
+        else:
+            if kwargs["retention_days"] is None or kwargs["retention_days"] < 1:
+                raise CommandError("drop requires a positive --retention-days")
+            self._drop(datetime.now(UTC) - timedelta(days=kwargs["retention_days"]))
+
+    def _is_partitioned(self) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [self.table])
+            return cursor.fetchone() is not None
+
+    def _partitions(self) -> list[tuple[str, datetime | None, datetime | None, bool]]:
+        """(name, lower, upper, is_default) per partition, ordered by lower bound with the default last."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid WHERE pg_inherits.inhparent = %s::regclass",
+                [self.table],
+            )
+            rows = cursor.fetchall()
+        partitions = []
+        for name, bound in rows:
+            match = BOUND.search(bound)
+            if match is None:
+                partitions.append((name, None, None, True))
+            else:
+                partitions.append((name, parse_bound(match["lower"]), parse_bound(match["upper"]), False))
+        return sorted(partitions, key=lambda item: (item[3], item[1] or datetime.min.replace(tzinfo=UTC)))
+
+    def _convert(self, interval: str, ahead: int) -> None:
+        """Swap the plain table for a partitioned one, keeping the existing rows as its first partition.
+
+        The old table is attached as the partition for everything before the
+        next period boundary, so no rows are copied. Runs in one transaction
+        under an exclusive lock; attaching scans the old table once to check
+        the bound, and the new primary key (id, created_at) is built on it.
+        """
+        quote = self.quote
+        table = quote(self.table)
+        legacy_name = f"{self.table}_legacy"
+        legacy = quote(legacy_name)
+        sequence = quote(f"{self.table}_id_seq")
+        user = Prediction._meta.get_field("user")
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(f"SELECT coalesce(max(id), 0), max(created_at) FROM {table}")
+            max_id, newest = cursor.fetchone()
+            now = datetime.now(UTC)
+            boundary = next_period(period_start(max(newest, now) if newest else now, interval), interval)
+
+            # Index and primary key names are schema-wide; free them for the new parent.
+            cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+            cursor.execute(
+                f"ALTER TABLE {legacy} RENAME CONSTRAINT {quote(self.table + '_pkey')} TO {quote(legacy_name + '_pkey')}"
+            )
+            for index in Prediction._meta.indexes:
+                cursor.execute(f"ALTER INDEX IF EXISTS {quote(index.name)} RENAME TO {quote(index.name + '_legacy')}")
+
+            # A partition cannot own an identity column or serial sequence; the parent owns a new one.
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [legacy_name])
+            (old_sequence,) = cursor.fetchone()
+            cursor.execute(f"ALTER TABLE {legacy} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+            cursor.execute(f"ALTER TABLE {legacy} ALTER COLUMN id DROP DEFAULT")
+            if old_sequence:
+                cursor.execute(f"DROP SEQUENCE IF EXISTS {old_sequence}")
+
+            cursor.execute(f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+            cursor.execute(f"CREATE SEQUENCE {sequence} AS bigint START WITH {int(max_id) + 1} OWNED BY {table}.id")
+            cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+            # The partition key has to be part of every unique constraint.
+            cursor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {quote(self.table + '_pkey')} PRIMARY KEY (id, created_at)")
+            cursor.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {quote(self.table + '_user_id_fk')} FOREIGN KEY ({quote(user.column)}) "
+                f"REFERENCES {quote(user.related_model._meta.db_table)} (id) DEFERRABLE INITIALLY DEFERRED"
+            )
+            with connection.schema_editor(atomic=False) as editor:
+                for index in Prediction._meta.indexes:
+                    editor.add_index(Prediction, index)
+
+            cursor.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {legacy} FOR VALUES FROM (MINVALUE) TO ({bound_literal(boundary)})"
+            )
+            cursor.execute(f"CREATE TABLE {quote(self.table + '_default')} PARTITION OF {table} DEFAULT")
+            created = self._create_range(cursor, boundary, interval, ahead)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Partitioned {self.table} by created_at: existing rows kept in {legacy_name} (before "
+                f"{boundary.isoformat()}), created {', '.join(created) or 'no new partitions'}"
+            )
+        )
+
+    def _create_ahead(self, interval: str, ahead: int) -> None:
+        ranged = [partition for partition in self._partitions() if not partition[3]]
+        start = max((upper for _, _, upper, _ in ranged if upper), default=period_start(datetime.now(UTC), interval))
+        with transaction.atomic(), connection.cursor() as cursor:
+            created = self._create_range(cursor, start, interval, ahead)
+        self.stdout.write(self.style.SUCCESS(f"Created {', '.join(created) or 'no new partitions'}"))
+
+    def _create_range(self, cursor, start: datetime, interval: str, ahead: int) -> list[str]:
+        """Create consecutive partitions from `start` until `ahead` periods past the current one are covered."""
+        until = period_start(datetime.now(UTC), interval)
+        for _ in range(ahead + 1):
+            until = next_period(until, interval)
+
+        created = []
+        lower = period_start(start, interval)
+        if lower < start:
+            # `start` is an existing upper bound inside a period (e.g. switching month -> day).
+            lower = start
+        while lower < until:
+            upper = next_period(period_start(lower, interval), interval)
+            name = partition_name(lower, interval)
+            cursor.execute(
+                f"CREATE TABLE {self.quote(name)} PARTITION OF {self.quote(self.table)} "
+                f"FOR VALUES FROM ({bound_literal(lower)}) TO ({bound_literal(upper)})"
+            )
+            created.append(name)
+            lower = upper
+        return created
+
+    def _drop(self, cutoff: datetime) -> None:
+        dropped = []
+        for name, _, upper, is_default in self._partitions():
+            if is_default or upper is None or upper > cutoff:
+                continue
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {self.quote(self.table)} DETACH PARTITION {self.quote(name)}")
+                cursor.execute(f"DROP TABLE {self.quote(name)}")
+            dropped.append(name)
+        self.stdout.write(
+            self.style.SUCCESS(f"Dropped {', '.join(dropped) or 'no partitions'} (rows before {cutoff.isoformat()})")
+        )
+
+    def _status(self) -> None:
+        with connection.cursor() as cursor:
+            for name, lower, upper, is_default in self._partitions():
+                cursor.execute(f"SELECT count(*) FROM {self.quote(name)}")
+                (rows,) = cursor.fetchone()
+                if is_default:
+                    bounds = "DEFAULT" + (" (holds rows: run `create` to cover them)" if rows else "")
+                else:
+                    bounds = f"[{lower.isoformat() if lower else 'MINVALUE'}, {upper.isoformat()})"
+                self.stdout.write(f"{name} {bounds} rows={rows}")
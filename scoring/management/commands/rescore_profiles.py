@@ -0,0 +1,144 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import batched
+from pathlib import Path
+import json
+import multiprocessing
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from scoring.ml.offline import init_worker, pinned_service, score_rows
+from scoring.ml.service import model_service
+from scoring.models import LatestPrediction, Prediction, UserProfile
+from scoring.persistence import PROFILE_FIELDS, save_latest_predictions
+from scoring.training import model_state_dir
+
+
+class Command(BaseCommand):
+    help = "Re-score every stored profile with the served model and store the results as Predictions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Profiles fetched and scored per chunk.")
+        parser.add_argument("--workers", type=int, default=1, help="Processes scoring chunks in parallel.")
+        parser.add_argument(
+            "--checkpoint",
+            type=Path,
+            default=None,
+            help="Progress file (default: rescore_checkpoint.json next to the model artifacts).",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and re-score from the first profile.",
+        )
+
+    def handle(self, *args, **kwargs):
+        chunk_size = kwargs["chunk_size"]
+        workers = kwargs["workers"]
+        if chunk_size < 1 or workers < 1:
+            raise CommandError("--chunk-size and --workers must be positive")
+        checkpoint_path = kwargs["checkpoint"] or model_state_dir() / "rescore_checkpoint.json"
+
+        try:
+            version, model_path = model_service.resolve()
+        except FileNotFoundError:
+            model_path = None
+        if model_path is None or not model_path.exists():
+            raise CommandError("No served model to re-score with; train one first")
+
+        # A retrained MODEL_PATH keeps its version, so the artifact's stat identifies the model too.
+        stat = model_path.stat()
+        model_key = f"{version}:{stat.st_mtime_ns}:{stat.st_size}"
+        checkpoint = self._read_checkpoint(checkpoint_path)
+        if kwargs["restart"] or checkpoint.get("model") != model_key:
+            checkpoint = {"model": model_key, "last_pk": 0, "rows": 0}
+        elif checkpoint["last_pk"]:
+            self.stdout.write(f"Resuming {version} after profile id {checkpoint['last_pk']} ({checkpoint['rows']} done)")
+
+        rows = (
+            UserProfile.objects.filter(pk__gt=checkpoint["last_pk"])
+            .order_by("pk")
+            .values_list("pk", "email", *PROFILE_FIELDS)
+            .iterator(chunk_size=chunk_size)
+        )
+        chunks = batched(rows, chunk_size)
+
+        started = time.perf_counter()
+        scored = 0
+        for keys, results in self._score(chunks, version, model_path, workers):
+            with transaction.atomic():
+                predictions = Prediction.objects.bulk_create(
+                    [
+                        Prediction(
+                            user_id=pk,
+                            attendance_probability=attendance_probability,
+                            reseller_probability=reseller_probability,
+                            risk_label=risk_label,
+                            model_version=version,
+                        )
+                        for (pk, _), (attendance_probability, reseller_probability, risk_label) in zip(keys, results)
+                    ],
+                    batch_size=1000,
+                )
+                save_latest_predictions(
+                    [
+                        LatestPrediction.from_prediction(email, prediction)
+                        for (_, email), prediction in zip(keys, predictions)
+                    ]
+                )
+            # Written after the commit: a crash in between re-scores at most this chunk on resume.
+            last_pk = keys[-1][0]
+            scored += len(keys)
+            checkpoint = {"model": model_key, "last_pk": last_pk, "rows": checkpoint["rows"] + len(keys)}
+            self._write_checkpoint(checkpoint_path, checkpoint)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"Scored {checkpoint['rows']} profiles (last id {last_pk}), {scored / elapsed:.0f} rows/s")
+
+        elapsed = time.perf_counter() - started
+        rate = scored / elapsed if elapsed else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Re-scored {scored} profiles with model {version} in {elapsed:.2f}s ({rate:.0f} rows/s); "
+                f"checkpoint at {checkpoint_path}"
+            )
+        )
+
+    def _score(self, chunks, version, model_path, workers):
+        """Yield ((pk, email) keys, results) per chunk in primary-key order."""
+        if workers == 1:
+            service = pinned_service(str(model_path), version, model_service.inference_mode)
+            for chunk in chunks:
+                yield score_rows(chunk, PROFILE_FIELDS, service)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=init_worker,
+            initargs=(str(model_path), version, model_service.inference_mode),
+        ) as executor:
+            # Bounded window: reading runs ahead of the pool by at most two chunks per worker.
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(score_rows, chunk, PROFILE_FIELDS))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    @staticmethod
+    def _read_checkpoint(path: Path) -> dict:
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def _write_checkpoint(path: Path, checkpoint: dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(checkpoint))
+        os.replace(tmp_path, path)
@@ -1,18 +1,38 @@
+from itertools import batched
+import argparse
+import os
+import time
+
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.compose import ColumnTransformer
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+import sklearn
+
+from scoring.ml.datagen import DEFAULT_CHUNK_SIZE, generate_dataset
+from scoring.ml.pipeline import (
+    CATEGORICAL_FEATURES,
+    DEFAULT_FOREST_PARAMS,
+    NUMERIC_FEATURES,
+    build_pipeline,
+    parse_max_depth,
+)
+from scoring.ml.registry import ModelRegistry
+from scoring.models import Prediction, TrainingJob, UserProfile
+from scoring.persistence import PROFILE_FIELDS
+from scoring.training import ACTIVE_STATUSES, fail_training_job, read_tuning
 
 
+def format_score(score):
+    return "n/a" if score is None else f"{score:.4f}"
+
 
 class Command(BaseCommand):
-    help = "Train attendance scoring model with mock data"
+    help = "Train attendance scoring model with mock data, or grow the served forest from database history"
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -27,135 +47,337 @@ class Command(BaseCommand):
             default=42,
             help="Random seed for reproducible datasets.",
         )
+        parser.add_argument(
+            "--n-jobs",
+            type=int,
+            default=-1,
+            help="Parallel jobs used to fit the forest (-1 uses every core).",
+        )
+        parser.add_argument(
+            "--tuned",
+            action="store_true",
+            help="Use the forest parameters chosen by the last tune_model run.",
+        )
+        parser.add_argument("--n-estimators", type=int, default=None, help="Trees in the forest (default 300).")
+        parser.add_argument(
+            "--max-depth",
+            type=parse_max_depth,
+            default=argparse.SUPPRESS,
+            help="Maximum tree depth, or 'none' (default 16).",
+        )
+        parser.add_argument("--min-samples-leaf", type=int, default=None, help="Minimum rows per leaf (default 3).")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Rows generated per independently seeded chunk.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes generating chunks in parallel.",
+        )
+        parser.add_argument(
+            "--source",
+            choices=["synthetic", "database"],
+            default="synthetic",
+            help=(
+                "synthetic: fit a new model on mock data. database: load the served model and add trees "
+                "fitted on stored profiles labelled with their latest Prediction.risk_label (requires --self-label)."
+            ),
+        )
+        parser.add_argument(
+            "--self-label",
+            action="store_true",
+            help=(
+                "Required with --source database. WARNING: no real outcomes are stored yet, so the labels are the "
+                "served model's own predictions; the new trees reinforce its decisions instead of correcting them."
+            ),
+        )
+        parser.add_argument(
+            "--add-trees",
+            type=int,
+            default=50,
+            help="Trees added to the served forest with --source database.",
+        )
+        parser.add_argument(
+            "--max-trees",
+            type=int,
+            default=None,
+            help="With --source database, drop the oldest trees beyond this many.",
+        )
+        parser.add_argument(
+            "--since",
+            default=None,
+            help="With --source database, only use profiles updated at or after this ISO datetime.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows fetched per round trip when streaming database history.",
+        )
+        parser.add_argument(
+            "--niceness",
+            type=int,
+            default=0,
+            help="Increment applied to this process' scheduling priority before training.",
+        )
+        parser.add_argument(
+            "--job-id",
+            default=None,
+            help="TrainingJob whose status, metrics and timings are updated by this run.",
+        )
+        parser.add_argument(
+            "--no-promote",
+            action="store_true",
+            help="Register the artifact in MODEL_REGISTRY_DIR without making it the served version.",
+        )
 
     def handle(self, *args, **kwargs):
         size = kwargs["size"]
-        seed = kwargs["seed"]
+        from_database = kwargs["source"] == "database"
 
-        if size < 1000:
-            raise CommandError("--size must be at least 1000")
+        job_id = None
+        if kwargs["job_id"]:
+            job_id = kwargs["job_id"]
+            # Conditional: a job the view already failed as stale must not come back to life.
+            claimed = TrainingJob.objects.filter(pk=job_id, status__in=ACTIVE_STATUSES).update(
+                status=TrainingJob.Status.RUNNING,
+                started_at=timezone.now(),
+            )
+            if not claimed:
+                if not TrainingJob.objects.filter(pk=job_id).exists():
+                    raise CommandError(f"Training job {job_id} does not exist")
+                raise CommandError(f"Training job {job_id} is no longer active")
 
-        rng = np.random.default_rng(seed)
+        try:
+            if size < 1000 and not from_database:
+                raise CommandError("--size must be at least 1000")
+            if kwargs["chunk_size"] < 1 or kwargs["workers"] < 1:
+                raise CommandError("--chunk-size and --workers must be positive")
+            if kwargs["add_trees"] < 1 or kwargs["batch_size"] < 1:
+                raise CommandError("--add-trees and --batch-size must be positive")
+            if from_database and not kwargs["self_label"]:
+                raise CommandError(
+                    "--source database labels profiles with the model's own latest prediction (no outcome labels "
+                    "are stored yet); pass --self-label to train on them anyway"
+                )
+            since = None
+            if kwargs["since"]:
+                since = parse_datetime(kwargs["since"])
+                if since is None:
+                    raise CommandError("--since must be an ISO 8601 datetime")
+                if timezone.is_naive(since):
+                    since = timezone.make_aware(since)
+            if kwargs["niceness"]:
+                os.nice(kwargs["niceness"])
 
-        data = pd.DataFrame(
-            {
-                "age": rng.integers(16, 75, size),
-                "country": rng.choice(
-                    ["CL", "AR", "PE", "MX", "CO", "UY", "EC", "BR", "US", "ES"],
-                    size=size,
-                    p=[0.2, 0.15, 0.12, 0.16, 0.12, 0.05, 0.06, 0.06, 0.04, 0.04],
-                ),
-                "city": rng.choice(
-                    [
-                        "Santiago",
-                        "Valparaiso",
-                        "Lima",
-                        "Bogota",
-                        "Medellin",
-                        "CDMX",
-                        "Monterrey",
-                        "BuenosAires",
-                        "Cordoba",
-                        "Montevideo",
-                        "Quito",
-                        "SaoPaulo",
-                        "Miami",
-                        "Madrid",
-                    ],
-                    size=size,
-                ),
-                "account_age_days": rng.integers(1, 3650, size),
-                "purchases_last_12_months": rng.poisson(6, size),
-                "canceled_orders": rng.poisson(1.2, size),
-                "tickets_per_order_avg": rng.uniform(1, 6, size),
-                "distance_to_venue_km": rng.uniform(0.2, 400, size),
-                "payment_failures_ratio": rng.uniform(0, 0.35, size),
-                "event_affinity_score": rng.uniform(0, 1, size),
-                "night_purchase_ratio": rng.uniform(0, 1, size),
-                "resale_reports_count": rng.poisson(0.8, size),
-                "attendance_rate": rng.uniform(0, 1, size),
-            }
-        )
-
-        trusted_segment = rng.random(size) < 0.3
-        risky_segment = rng.random(size) < 0.15
-
-        data.loc[trusted_segment, "account_age_days"] = rng.integers(900, 3650, trusted_segment.sum())
-        data.loc[trusted_segment, "attendance_rate"] = rng.uniform(0.65, 1, trusted_segment.sum())
-        data.loc[trusted_segment, "event_affinity_score"] = rng.uniform(0.6, 1, trusted_segment.sum())
-        data.loc[trusted_segment, "payment_failures_ratio"] = rng.uniform(0, 0.08, trusted_segment.sum())
-
-        data.loc[risky_segment, "tickets_per_order_avg"] = rng.uniform(3.2, 8.5, risky_segment.sum())
-        data.loc[risky_segment, "night_purchase_ratio"] = rng.uniform(0.45, 1, risky_segment.sum())
-        data.loc[risky_segment, "resale_reports_count"] = rng.poisson(3.3, risky_segment.sum())
-        data.loc[risky_segment, "payment_failures_ratio"] = rng.uniform(0.12, 0.55, risky_segment.sum())
-        data.loc[risky_segment, "attendance_rate"] = rng.uniform(0, 0.45, risky_segment.sum())
-
-        risk_index = (
-            (data["tickets_per_order_avg"] - 1.8) * 0.30
-            + data["payment_failures_ratio"] * 2.3
-            + data["night_purchase_ratio"] * 0.85
-            + data["resale_reports_count"] * 0.35
-            - data["event_affinity_score"] * 1.7
-            - data["attendance_rate"] * 2.1
-            - np.log1p(data["account_age_days"]) * 0.12
-        )
-
-        probability = 1 / (1 + np.exp(risk_index))
-        labels = rng.binomial(1, probability)
-
-        numeric_features = [
-            "age",
-            "account_age_days",
-            "purchases_last_12_months",
-            "canceled_orders",
-            "tickets_per_order_avg",
-            "distance_to_venue_km",
-            "payment_failures_ratio",
-            "event_affinity_score",
-            "night_purchase_ratio",
-            "resale_reports_count",
-            "attendance_rate",
-        ]
-        categorical_features = ["country", "city"]
-
-        preprocessor = ColumnTransformer(
-            transformers=[
-                ("numeric", StandardScaler(), numeric_features),
-                ("categorical", OneHotEncoder(handle_unknown="ignore"), categorical_features),
-            ]
-        )
-
-        model = Pipeline(
-            steps=[
-                ("preprocessor", preprocessor),
-                (
-                    "classifier",
-                    RandomForestClassifier(
-                        n_estimators=300,
-                        max_depth=16,
-                        min_samples_leaf=3,
-                        random_state=42,
-                        n_jobs=-1,
-                    ),
-                ),
-            ]
-        )
-
-        x_train, x_test, y_train, y_test = train_test_split(
-            data,
-            labels,
-            test_size=0.2,
-            random_state=42,
-            stratify=labels,
-        )
+            if from_database:
+                self.stderr.write(
+                    self.style.WARNING("Self-labelled training: targets are the served model's own predictions")
+                )
+                model, score, timings, metadata = self._warm_start(
+                    kwargs["add_trees"],
+                    kwargs["max_trees"],
+                    since,
+                    kwargs["batch_size"],
+                    kwargs["n_jobs"],
+                )
+                size = metadata["training_size"]
+            else:
+                params, tuned_at = self._forest_params(kwargs)
+                model, score, timings = self._train(
+                    size,
+                    kwargs["seed"],
+                    kwargs["n_jobs"],
+                    kwargs["chunk_size"],
+                    kwargs["workers"],
+                    params,
+                )
+                metadata = {"source": "synthetic", "training_size": size, "seed": kwargs["seed"], "tuned_at": tuned_at}
+            started = time.perf_counter()
+            saved_at, version = self._save(
+                model,
+                {**metadata, "validation_accuracy": score, "fit_seconds": timings["fit_seconds"]},
+                not kwargs["no_promote"],
+            )
+            timings["save_seconds"] = time.perf_counter() - started
+        except Exception as exc:
+            if job_id is not None:
+                fail_training_job(job_id, repr(exc))
+            raise
+
+        if job_id is not None:
+            TrainingJob.objects.filter(pk=job_id, status__in=ACTIVE_STATUSES).update(
+                status=TrainingJob.Status.SUCCEEDED,
+                validation_accuracy=score,
+                timings=timings,
+                model_path=str(saved_at),
+                finished_at=timezone.now(),
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Model trained. Validation accuracy={format_score(score)}"))
+        self.stdout.write(self.style.SUCCESS(f"Saved at {saved_at}"))
+        if version is not None:
+            promoted = "promoted" if not kwargs["no_promote"] else "not promoted"
+            self.stdout.write(self.style.SUCCESS(f"Registered model version {version} ({promoted})"))
+        if from_database:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rows read from database: {size} ({metadata['rows_per_second']:.0f} rows/s), "
+                    f"trees added: {metadata['added_trees']} ({metadata['seconds_per_tree']:.3f}s per tree), "
+                    f"base model accuracy on holdout={format_score(metadata['base_validation_accuracy'])}"
+                )
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Training records generated: {size}"))
+        self.stdout.write(self.style.SUCCESS("Timings: " + ", ".join(f"{k}={v:.2f}s" for k, v in timings.items())))
 
+    def _forest_params(self, kwargs):
+        params = dict(DEFAULT_FOREST_PARAMS)
+        tuned_at = None
+        if kwargs["tuned"]:
+            try:
+                tuning = read_tuning()
+            except FileNotFoundError:
+                raise CommandError("No tuning results found; run tune_model first") from None
+            params.update(tuning["params"])
+            tuned_at = tuning["created_at"]
+        for name in ("n_estimators", "min_samples_leaf"):
+            if kwargs[name] is not None:
+                params[name] = kwargs[name]
+        if "max_depth" in kwargs:
+            params["max_depth"] = kwargs["max_depth"]
+        return params, tuned_at
+
+    def _train(self, size, seed, n_jobs, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, params=None):
+        started = time.perf_counter()
+        data, labels = generate_dataset(size, seed, chunk_size=chunk_size, workers=workers)
+
+        model = build_pipeline(params, n_jobs=n_jobs)
+
+        # Rows are i.i.d. draws, so a positional 80/20 split is a random split
+        # and, unlike train_test_split, slices instead of copying the frame.
+        n_train = size - size // 5
+        x_train, x_test = data.iloc[:n_train], data.iloc[n_train:]
+        y_train, y_test = labels[:n_train], labels[n_train:]
+
+        generated = time.perf_counter()
         model.fit(x_train, y_train)
+        fitted = time.perf_counter()
         score = model.score(x_test, y_test)
+        evaluated = time.perf_counter()
+
+        timings = {
+            "generate_seconds": generated - started,
+            "fit_seconds": fitted - generated,
+            "evaluate_seconds": evaluated - fitted,
+        }
+        return model, score, timings
+
+    def _warm_start(self, add_trees, max_trees, since, batch_size, n_jobs):
+        started = time.perf_counter()
+        model, base_version = self._load_served_model()
+        preprocessor = model.named_steps["preprocessor"]
+        classifier = model.named_steps["classifier"]
+
+        # No ground truth is stored yet: the latest served label is the target,
+        # so this adapts the forest to recent traffic rather than correcting it.
+        latest_label = Prediction.objects.filter(user=OuterRef("pk")).order_by("-created_at", "-id").values("risk_label")[:1]
+        profiles = UserProfile.objects.annotate(label=Subquery(latest_label)).filter(label__isnull=False)
+        if since is not None:
+            profiles = profiles.filter(updated_at__gte=since)
+        # iterator() streams through a server-side cursor on PostgreSQL.
+        rows = profiles.order_by("pk").values_list("pk", *PROFILE_FIELDS, "label").iterator(chunk_size=batch_size)
 
-        settings.MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
-        joblib.dump(model, settings.MODEL_PATH)
+        train_x, train_y, test_x, test_y = [], [], [], []
+        for batch in batched(rows, batch_size):
+            frame = pd.DataFrame.from_records(batch, columns=["pk", *PROFILE_FIELDS, "label"])
+            # The base model's fitted preprocessor is reused so old and new trees see the same features.
+            features = preprocessor.transform(frame[NUMERIC_FEATURES + CATEGORICAL_FEATURES])
+            features = np.asarray(features.toarray() if hasattr(features, "toarray") else features, dtype=np.float32)
+            labels = (frame["label"] == "attendee").to_numpy(dtype=np.int8)
+            holdout = (frame["pk"] % 5 == 0).to_numpy()
+            train_x.append(features[~holdout])
+            train_y.append(labels[~holdout])
+            test_x.append(features[holdout])
+            test_y.append(labels[holdout])
+        read = time.perf_counter()
 
-        self.stdout.write(self.style.SUCCESS(f"Model trained. Validation accuracy={score:.4f}"))
-        self.stdout.write(self.style.SUCCESS(f"Saved at {settings.MODEL_PATH}"))
-        self.stdout.write(self.style.SUCCESS(f"Training records generated: {size}"))
+        n_rows = sum(len(labels) for labels in train_y + test_y)
+        if not train_y or len(np.unique(np.concatenate(train_y))) < 2:
+            raise CommandError("Database history needs labelled profiles of both classes to add trees")
+        x_train, y_train = np.concatenate(train_x), np.concatenate(train_y)
+        x_test, y_test = np.concatenate(test_x), np.concatenate(test_y)
+        base_score = classifier.score(x_test, y_test) if len(y_test) else None
+
+        classifier.set_params(warm_start=True, n_estimators=len(classifier.estimators_) + add_trees, n_jobs=n_jobs)
+        classifier.fit(x_train, y_train)
+        fitted = time.perf_counter()
+        if max_trees is not None and len(classifier.estimators_) > max_trees:
+            classifier.estimators_ = classifier.estimators_[-max_trees:]
+            classifier.n_estimators = max_trees
+        classifier.set_params(warm_start=False)
+        score = classifier.score(x_test, y_test) if len(y_test) else None
+        evaluated = time.perf_counter()
+
+        timings = {
+            "read_seconds": read - started,
+            "fit_seconds": fitted - read,
+            "evaluate_seconds": evaluated - fitted,
+        }
+        metadata = {
+            "source": "database",
+            "labels": "self",
+            "base_version": base_version,
+            "training_size": n_rows,
+            "added_trees": add_trees,
+            "since": since.isoformat() if since else None,
+            "rows_per_second": n_rows / max(timings["read_seconds"], 1e-9),
+            "seconds_per_tree": timings["fit_seconds"] / add_trees,
+            "base_validation_accuracy": base_score,
+        }
+        return model, score, timings, metadata
+
+    def _load_served_model(self):
+        if settings.MODEL_REGISTRY_DIR is None:
+            if not settings.MODEL_PATH.exists():
+                raise CommandError(f"No model at {settings.MODEL_PATH} to grow; train one first")
+            return joblib.load(settings.MODEL_PATH), None
+        registry = ModelRegistry(settings.MODEL_REGISTRY_DIR)
+        try:
+            version = registry.current_version()
+        except FileNotFoundError:
+            raise CommandError("No promoted model version to grow; train one first") from None
+        return joblib.load(registry.artifact_path(version)), version
+
+    def _save(self, model, metadata, promote):
+        if settings.MODEL_REGISTRY_DIR is None:
+            settings.MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+            # Serving workers watch MODEL_PATH, so it must only ever point at a complete file.
+            tmp_path = settings.MODEL_PATH.with_name(f".{settings.MODEL_PATH.name}.{os.getpid()}.tmp")
+            # Uncompressed so the artifact can be loaded with MODEL_MMAP_MODE.
+            joblib.dump(model, tmp_path, compress=0)
+            os.replace(tmp_path, settings.MODEL_PATH)
+            return settings.MODEL_PATH, None
+
+        registry = ModelRegistry(settings.MODEL_REGISTRY_DIR)
+        classifier = model.named_steps["classifier"]
+        record = registry.register(
+            model,
+            {
+                **metadata,
+                "features": {"numeric": NUMERIC_FEATURES, "categorical": CATEGORICAL_FEATURES},
+                "params": {
+                    "n_estimators": classifier.n_estimators,
+                    "max_depth": classifier.max_depth,
+                    "min_samples_leaf": classifier.min_samples_leaf,
+                },
+                "sklearn_version": sklearn.__version__,
+            },
+        )
+        if promote:
+            registry.promote(record["version"])
+        return registry.artifact_path(record["version"]), record["version"]
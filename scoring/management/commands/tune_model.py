@@ -0,0 +1,155 @@
+from datetime import datetime, timezone
+from itertools import product
+import json
+import os
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from joblib import Parallel, delayed
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+
+from scoring.ml.datagen import generate_dataset
+from scoring.ml.pipeline import DEFAULT_FOREST_PARAMS, build_pipeline, parse_max_depth
+from scoring.training import tuning_path
+
+
+def int_list(value):
+    return [int(item) for item in value.split(",")]
+
+
+def depth_list(value):
+    return [parse_max_depth(item) for item in value.split(",")]
+
+
+def fit_fold(data, labels, params, train_index, test_index, keep_model):
+    # One core per fit: the candidates and folds themselves run in parallel.
+    model = build_pipeline(params, n_jobs=1)
+    started = time.perf_counter()
+    model.fit(data.iloc[train_index], labels[train_index])
+    fit_seconds = time.perf_counter() - started
+    accuracy = model.score(data.iloc[test_index], labels[test_index])
+    return accuracy, fit_seconds, model if keep_model else None
+
+
+def single_row_latency_us(model, rows) -> float:
+    matrix = model.named_steps["preprocessor"].transform(rows)
+    classifier = model.named_steps["classifier"]
+    classifier.set_params(n_jobs=1)
+    timings = []
+    for index in range(matrix.shape[0]):
+        row = matrix[index : index + 1]
+        started = time.perf_counter()
+        classifier.predict_proba(row)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def pareto_front(candidates: list[dict]) -> list[dict]:
+    """Candidates no other candidate beats on both accuracy and latency."""
+    front = []
+    best_accuracy = -1.0
+    for candidate in sorted(candidates, key=lambda item: (item["latency_us"], -item["accuracy"])):
+        if candidate["accuracy"] > best_accuracy:
+            front.append(candidate)
+            best_accuracy = candidate["accuracy"]
+    return front
+
+
+class Command(BaseCommand):
+    help = "Cross-validate forest size/depth candidates for accuracy and single-row predict latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=40000, help="Mock records used for the search.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for data and folds.")
+        parser.add_argument("--n-estimators", type=int_list, default=[50, 100, 200, 300])
+        parser.add_argument("--max-depth", type=depth_list, default=[8, 12, 16], help="Comma separated; 'none' allowed.")
+        parser.add_argument("--min-samples-leaf", type=int, default=DEFAULT_FOREST_PARAMS["min_samples_leaf"])
+        parser.add_argument("--cv", type=int, default=3, help="Cross-validation folds.")
+        parser.add_argument("--n-jobs", type=int, default=-1, help="Fits run in parallel (-1 uses every core).")
+        parser.add_argument("--latency-rows", type=int, default=200, help="Single-row predictions timed per candidate.")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.005,
+            help="Pick the fastest candidate within this accuracy of the best one.",
+        )
+        parser.add_argument("--no-save", action="store_true", help="Print results without writing tuning.json.")
+
+    def handle(self, *args, **kwargs):
+        if kwargs["size"] < 1000:
+            raise CommandError("--size must be at least 1000")
+        if kwargs["cv"] < 2:
+            raise CommandError("--cv must be at least 2")
+
+        started = time.perf_counter()
+        data, labels = generate_dataset(kwargs["size"], kwargs["seed"])
+        folds = list(StratifiedKFold(kwargs["cv"], shuffle=True, random_state=kwargs["seed"]).split(data, labels))
+        grid = [
+            {"n_estimators": n_estimators, "max_depth": max_depth, "min_samples_leaf": kwargs["min_samples_leaf"]}
+            for n_estimators, max_depth in product(kwargs["n_estimators"], kwargs["max_depth"])
+        ]
+
+        fits = Parallel(n_jobs=kwargs["n_jobs"])(
+            delayed(fit_fold)(data, labels, params, train_index, test_index, fold == 0)
+            for params in grid
+            for fold, (train_index, test_index) in enumerate(folds)
+        )
+
+        # Latency is timed afterwards, one candidate at a time, so parallel fits do not skew it.
+        latency_rows = data.iloc[folds[0][1][: kwargs["latency_rows"]]]
+        candidates = []
+        for position, params in enumerate(grid):
+            results = fits[position * len(folds) : (position + 1) * len(folds)]
+            accuracies = [accuracy for accuracy, _, _ in results]
+            model = results[0][2]
+            candidates.append(
+                {
+                    "params": params,
+                    "accuracy": float(np.mean(accuracies)),
+                    "accuracy_std": float(np.std(accuracies)),
+                    "fit_seconds": float(np.mean([fit_seconds for _, fit_seconds, _ in results])),
+                    "latency_us": single_row_latency_us(model, latency_rows),
+                    "nodes": int(sum(tree.tree_.node_count for tree in model.named_steps["classifier"].estimators_)),
+                }
+            )
+
+        front = pareto_front(candidates)
+        best_accuracy = max(candidate["accuracy"] for candidate in candidates)
+        chosen = min(
+            (candidate for candidate in candidates if candidate["accuracy"] >= best_accuracy - kwargs["tolerance"]),
+            key=lambda candidate: candidate["latency_us"],
+        )
+
+        for candidate in sorted(candidates, key=lambda item: item["latency_us"]):
+            marker = ">" if candidate is chosen else "*" if candidate in front else " "
+            params = candidate["params"]
+            self.stdout.write(
+                f"{marker} n_estimators={params['n_estimators']:<4} max_depth={str(params['max_depth']):<4} "
+                f"accuracy={candidate['accuracy']:.4f}±{candidate['accuracy_std']:.4f} "
+                f"latency={candidate['latency_us']:.0f}us/row fit={candidate['fit_seconds']:.2f}s "
+                f"nodes={candidate['nodes']}"
+            )
+        self.stdout.write("* Pareto front (accuracy vs. latency), > chosen")
+
+        if kwargs["no_save"]:
+            return
+        record = {
+            "params": chosen["params"],
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "size": kwargs["size"],
+            "seed": kwargs["seed"],
+            "cv": kwargs["cv"],
+            "tolerance": kwargs["tolerance"],
+            "search_seconds": time.perf_counter() - started,
+            "candidates": candidates,
+            "pareto_front": [candidate["params"] for candidate in front],
+        }
+        path = tuning_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(record, indent=2))
+        os.replace(tmp_path, path)
+        self.stdout.write(self.style.SUCCESS(f"Chosen parameters {chosen['params']} saved to {path}"))
+        self.stdout.write(self.style.SUCCESS("Use them with: python manage.py train_model --tuned"))
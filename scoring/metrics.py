@@ -0,0 +1,165 @@
+from contextlib import contextmanager
+import os
+import time
+
+from django.db import connections
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Metric values live in per-process mmap files under PROMETHEUS_MULTIPROC_DIR
+# when it is set (Gunicorn), and in the default in-memory registry otherwise.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+SCORE_STAGE_SECONDS = Histogram(
+    "score_stage_seconds",
+    "Time spent in each stage of the scoring hot path.",
+    ["view", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+MODEL_STAGE_SECONDS = Histogram(
+    "model_predict_stage_seconds",
+    "Time spent building model input vs. running predict_proba.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+MODEL_LOAD_SECONDS = Histogram(
+    "model_load_seconds",
+    "Time spent loading (and compiling) a model artifact.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+MODEL_INFO = Gauge(
+    "model_generation",
+    "Generation of the model currently served, labelled with its version.",
+    ["version"],
+    multiprocess_mode="liveall",
+)
+MODEL_POOL_EVENTS = Counter("model_pool_events_total", "Keyed model pool lookups: hit, load and evict.", ["event"])
+MODEL_POOL_BYTES = Gauge(
+    "model_pool_bytes",
+    "Artifact bytes of the keyed models loaded in the pool.",
+    multiprocess_mode="livesum",
+)
+# Filled by `register_connection_metrics()` only when DB_POOL is off: pooled connections go back to
+# the pool after each request (CONN_MAX_AGE=0), so every request would count as a new connection.
+# With the pool, `record_db_pool_stats` derives opened vs reused connections from the pool's stats.
+connection_metrics: dict[str, Counter] = {}
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Connections held by the worker's psycopg pool, idle or in use.",
+    ["alias", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_REQUESTS_WAITING = Gauge(
+    "db_pool_requests_waiting",
+    "Requests queued for a pooled connection.",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_ACQUIRES = Counter(
+    "db_pool_acquires_total", "Connections requested from the pool, by outcome (ok, queued, error).", ["alias", "outcome"]
+)
+DB_POOL_ACQUIRE_WAIT_SECONDS = Counter(
+    "db_pool_acquire_wait_seconds_total", "Time requests spent queued for a pooled connection.", ["alias"]
+)
+DB_POOL_CONNECTIONS_OPENED = Counter(
+    "db_pool_connections_opened_total", "New server connections opened by the pool.", ["alias"]
+)
+DB_POOL_CONNECTIONS_REUSED = Counter(
+    "db_pool_connections_reused_total", "Successful pool acquires served by an already open connection.", ["alias"]
+)
+RESULT_CACHE_EVENTS = Counter("model_result_cache_events_total", "Result cache lookups and evictions.", ["event"])
+LATEST_SCORE_CACHE_EVENTS = Counter(
+    "latest_score_cache_events_total", "Latest-score lookup cache lookups and evictions.", ["event"]
+)
+MICROBATCH_SIZE = Histogram(
+    "inference_microbatch_size",
+    "Rows scored per coalesced predict_proba call.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+WRITE_BEHIND_DEPTH = Gauge(
+    "score_write_behind_depth",
+    "Score writes waiting in the write-behind buffer.",
+    multiprocess_mode="livesum",
+)
+WRITE_BEHIND_FLUSH_SECONDS = Histogram(
+    "score_write_behind_flush_seconds",
+    "Duration of one write-behind bulk flush.",
+    buckets=LATENCY_BUCKETS,
+)
+WRITE_BEHIND_ROWS = Counter("score_write_behind_rows_total", "Write-behind rows by outcome.", ["outcome"])
+
+
+@contextmanager
+def observe_stage(view: str, stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        SCORE_STAGE_SECONDS.labels(view=view, stage=stage).observe(time.perf_counter() - started)
+
+
+def register_connection_metrics(registry=REGISTRY) -> None:
+    if connection_metrics:
+        return
+    connection_metrics["opened"] = Counter(
+        "db_connections_opened_total", "New database connections opened.", registry=registry
+    )
+    connection_metrics["checkouts"] = Counter(
+        "db_connection_checkouts_total",
+        "Score requests that found an open (reused) or no (new) database connection.",
+        ["state"],
+        registry=registry,
+    )
+
+
+def count_connection_created(sender, connection, **kwargs):
+    connection_metrics["opened"].inc()
+
+
+def count_connection_checkout(connection) -> None:
+    checkouts = connection_metrics.get("checkouts")
+    if checkouts is not None:
+        checkouts.labels(state="reused" if connection.connection is not None else "new").inc()
+
+
+def record_db_pool_stats(sender=None, **kwargs):
+    """Copy each pool's stats into the metrics; connected to `request_finished` when DB_POOL is on.
+
+    `pop_stats()` resets psycopg's counters, so each call adds only what
+    happened since the previous one. Reused connections are the successful
+    acquires that did not open one; connections the pool opens on its own
+    (refilling `min_size`, replacing expired ones) make this a lower bound.
+    """
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            continue
+        stats = pool.pop_stats()
+        DB_POOL_CONNECTIONS.labels(alias=alias, state="idle").set(stats["pool_available"])
+        DB_POOL_CONNECTIONS.labels(alias=alias, state="in_use").set(stats["pool_size"] - stats["pool_available"])
+        DB_POOL_REQUESTS_WAITING.labels(alias=alias).set(stats["requests_waiting"])
+        acquired = stats.get("requests_num", 0) - stats.get("requests_errors", 0)
+        DB_POOL_ACQUIRES.labels(alias=alias, outcome="ok").inc(acquired)
+        DB_POOL_ACQUIRES.labels(alias=alias, outcome="queued").inc(stats.get("requests_queued", 0))
+        DB_POOL_ACQUIRES.labels(alias=alias, outcome="error").inc(stats.get("requests_errors", 0))
+        DB_POOL_ACQUIRE_WAIT_SECONDS.labels(alias=alias).inc(stats.get("requests_wait_ms", 0) / 1000)
+        DB_POOL_CONNECTIONS_OPENED.labels(alias=alias).inc(stats.get("connections_num", 0))
+        DB_POOL_CONNECTIONS_REUSED.labels(alias=alias).inc(max(acquired - stats.get("connections_num", 0), 0))
+
+
+def metrics_view(request):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
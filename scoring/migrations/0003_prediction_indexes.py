@@ -0,0 +1,51 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+INDEXES = [
+    models.Index(fields=["user", "-created_at", "-id"], name="prediction_user_latest_idx"),
+    models.Index(fields=["model_version", "created_at"], name="prediction_version_time_idx"),
+    models.Index(fields=["risk_label", "created_at"], name="prediction_label_time_idx"),
+]
+
+
+def index_options(schema_editor):
+    # Prediction is append-only and hot: on PostgreSQL build without blocking inserts.
+    return {"concurrently": True} if schema_editor.connection.vendor == "postgresql" else {}
+
+
+def add_indexes(apps, schema_editor):
+    model = apps.get_model("scoring", "Prediction")
+    for index in INDEXES:
+        schema_editor.add_index(model, index, **index_options(schema_editor))
+
+
+def remove_indexes(apps, schema_editor):
+    model = apps.get_model("scoring", "Prediction")
+    for index in INDEXES:
+        schema_editor.remove_index(model, index, **index_options(schema_editor))
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("scoring", "0002_training_job"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(add_indexes, remove_indexes)],
+            state_operations=[migrations.AddIndex(model_name="prediction", index=index) for index in INDEXES],
+        ),
+        # Only after the composite index exists, so user lookups never lose their index.
+        migrations.AlterField(
+            model_name="prediction",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="predictions",
+                to="scoring.userprofile",
+            ),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from itertools import batched
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def backfill_latest_predictions(apps, schema_editor):
+    Prediction = apps.get_model("scoring", "Prediction")
+    UserProfile = apps.get_model("scoring", "UserProfile")
+    LatestPrediction = apps.get_model("scoring", "LatestPrediction")
+
+    latest_id = Prediction.objects.filter(user=OuterRef("pk")).order_by("-created_at", "-id").values("id")[:1]
+    prediction_ids = (
+        UserProfile.objects.annotate(latest_id=Subquery(latest_id))
+        .exclude(latest_id=None)
+        .values_list("latest_id", flat=True)
+        .iterator(chunk_size=5000)
+    )
+    for batch in batched(prediction_ids, 5000):
+        LatestPrediction.objects.bulk_create(
+            [
+                LatestPrediction(
+                    email=prediction.user.email,
+                    user_id=prediction.user_id,
+                    attendance_probability=prediction.attendance_probability,
+                    reseller_probability=prediction.reseller_probability,
+                    risk_label=prediction.risk_label,
+                    model_version=prediction.model_version,
+                    scored_at=prediction.created_at,
+                )
+                for prediction in Prediction.objects.filter(pk__in=batch).select_related("user")
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scoring", "0003_prediction_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LatestPrediction",
+            fields=[
+                ("email", models.EmailField(max_length=254, primary_key=True, serialize=False)),
+                ("attendance_probability", models.FloatField()),
+                ("reseller_probability", models.FloatField()),
+                ("risk_label", models.CharField(max_length=32)),
+                ("model_version", models.CharField(max_length=64)),
+                ("scored_at", models.DateTimeField()),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="latest_prediction",
+                        to="scoring.userprofile",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_latest_predictions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+ACTIVE = ["queued", "running"]
+
+
+def fail_duplicate_active_jobs(apps, schema_editor):
+    # Keep the newest active job; older ones could not be told apart from it under the new index anyway.
+    TrainingJob = apps.get_model("scoring", "TrainingJob")
+    newest = TrainingJob.objects.filter(status__in=ACTIVE).order_by("-created_at").first()
+    if newest is not None:
+        TrainingJob.objects.filter(status__in=ACTIVE).exclude(pk=newest.pk).update(
+            status="failed",
+            error="Superseded by a newer active training job.",
+            finished_at=timezone.now(),
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scoring", "0004_latest_prediction"),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_duplicate_active_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="trainingjob",
+            constraint=models.UniqueConstraint(
+                models.Value(True),
+                condition=models.Q(status__in=ACTIVE),
+                name="training_job_single_active",
+            ),
+        ),
+    ]
@@ -0,0 +1,95 @@
+from concurrent.futures import Future
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+import logging
+import time
+
+from scoring.metrics import MICROBATCH_SIZE
+from scoring.ml.service import model_service
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row predictions into one `predict_many` call.
+
+    The first queued request opens a window of `max_wait` seconds; everything
+    that arrives before it closes (up to `max_batch_size` rows) is scored by a
+    single forest call on a dedicated thread and each caller's future resolved.
+    """
+
+    def __init__(self, predict_many, max_batch_size: int = 64, max_wait: float = 0.002) -> None:
+        self.predict_many = predict_many
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = SimpleQueue()
+        self._thread = None
+        self._lock = Lock()
+        self._stats = {"requests": 0, "batches": 0, "max_batch_size": 0, "batch_size_histogram": {}}
+
+    def submit(self, features: dict) -> Future:
+        future = Future()
+        self._ensure_thread()
+        self._queue.put((features, future))
+        return future
+
+    def predict(self, features: dict) -> tuple[float, float, str]:
+        return self.submit(features).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "batch_size_histogram": dict(self._stats["batch_size_histogram"])}
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="inference-microbatch", daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _record(self, size: int) -> None:
+        MICROBATCH_SIZE.observe(size)
+        # Power-of-two buckets: 1, 2, 4, ... up to max_batch_size.
+        bucket = 1 << (size - 1).bit_length()
+        with self._lock:
+            self._stats["requests"] += size
+            self._stats["batches"] += 1
+            self._stats["max_batch_size"] = max(self._stats["max_batch_size"], size)
+            histogram = self._stats["batch_size_histogram"]
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                self._run_batch(batch)
+            except Exception as exc:
+                # Never let one batch take the thread down: every later caller would wait forever.
+                logger.exception("Micro-batch of %s rows failed", len(batch))
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _run_batch(self, batch: list) -> None:
+        # Callers that gave up (a cancelled `asyncio.wrap_future`) are dropped before scoring.
+        batch = [(features, future) for features, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self._record(len(batch))
+        results = self.predict_many([features for features, _ in batch])
+        for (_, future), result in zip(batch, results, strict=True):
+            future.set_result(result)
+
+micro_batcher = MicroBatcher(lambda features_list: model_service.predict_many(features_list))
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from threading import Lock
+import hashlib
+import json
+import time
+
+from scoring.metrics import RESULT_CACHE_EVENTS
+
+
+class ResultCache:
+    """Bounded LRU + TTL cache of prediction results.
+
+    Keys hash the normalized feature dict together with a model namespace, so
+    entries of a previous model can never be served. An optional Django cache
+    alias acts as a shared second level for hits across workers.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 30.0, backend=None, events=RESULT_CACHE_EVENTS) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self.events = events
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._stats = {"hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @staticmethod
+    def key(features: dict, namespace: str) -> str:
+        normalized = sorted(
+            (name, float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else value)
+            for name, value in features.items()
+        )
+        digest = hashlib.blake2b(json.dumps(normalized, separators=(",", ":")).encode(), digest_size=16)
+        return f"score:{namespace}:{digest.hexdigest()}"
+
+    def get(self, key: str):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self.events.labels(event="hit").inc()
+                    return value
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self.events.labels(event="expiration").inc()
+
+        if self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self._store(key, value, now)
+                with self._lock:
+                    self._stats["shared_hits"] += 1
+                self.events.labels(event="shared_hit").inc()
+                return value
+
+        with self._lock:
+            self._stats["misses"] += 1
+        self.events.labels(event="miss").inc()
+        return None
+
+    def set(self, key: str, value) -> None:
+        self._store(key, value, time.monotonic())
+        if self.backend is not None:
+            self.backend.set(key, value, timeout=self.ttl)
+
+    def add(self, key: str, value) -> bool:
+        """Store `value` only if `key` is absent; returns whether it was stored."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                return False
+        if self.backend is not None and not self.backend.add(key, value, timeout=self.ttl):
+            return False
+        self._store(key, value, now)
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def _store(self, key: str, value, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+                self.events.labels(event="eviction").inc()
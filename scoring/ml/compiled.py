@@ -0,0 +1,110 @@
+from threading import local
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+
+class PipelineNotCompilable(ValueError):
+    pass
+
+
+class CompiledPipeline:
+    """Fitted `train_model` pipeline flattened into a fixed feature order.
+
+    Rows are built straight into a preallocated NumPy buffer with the same
+    arithmetic `StandardScaler` and `OneHotEncoder` apply, so the classifier
+    receives exactly the matrix the `ColumnTransformer` would have produced.
+    """
+
+    def __init__(self, pipeline: Pipeline, flat_forest: bool = False) -> None:
+        if len(pipeline.steps) != 2:
+            raise PipelineNotCompilable("Expected a preprocessor + classifier pipeline.")
+        preprocessor = pipeline.steps[0][1]
+        self.classifier = pipeline.steps[-1][1]
+        if not isinstance(preprocessor, ColumnTransformer):
+            raise PipelineNotCompilable("Preprocessor must be a ColumnTransformer.")
+
+        numeric_columns = []
+        numeric_mean = []
+        numeric_scale = []
+        categorical_columns = []
+        category_maps = []
+        offset = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+            if isinstance(transformer, StandardScaler):
+                if categorical_columns:
+                    raise PipelineNotCompilable("Numeric columns must precede categorical columns.")
+                numeric_columns.extend(columns)
+                mean = transformer.mean_ if transformer.with_mean else np.zeros(len(columns))
+                scale = transformer.scale_ if transformer.with_std else np.ones(len(columns))
+                numeric_mean.append(mean)
+                numeric_scale.append(scale)
+                offset += len(columns)
+            elif isinstance(transformer, OneHotEncoder):
+                if transformer.drop is not None or (transformer.min_frequency, transformer.max_categories) != (None, None):
+                    raise PipelineNotCompilable(f"Transformer {name!r} drops or groups categories.")
+                if transformer.handle_unknown != "ignore":
+                    raise PipelineNotCompilable(f"Transformer {name!r} must ignore unknown categories.")
+                for column, categories in zip(columns, transformer.categories_):
+                    categorical_columns.append(column)
+                    category_maps.append({value: offset + index for index, value in enumerate(categories)})
+                    offset += len(categories)
+            else:
+                raise PipelineNotCompilable(f"Unsupported transformer {name!r}: {type(transformer).__name__}.")
+
+        if offset != self.classifier.n_features_in_:
+            raise PipelineNotCompilable("Compiled feature width does not match the classifier.")
+
+        if flat_forest:
+            from scoring.ml.forest import FlatForest
+
+            self.classifier = FlatForest(self.classifier)
+
+        self.numeric_columns = tuple(numeric_columns)
+        self.categorical_columns = tuple(categorical_columns)
+        self.n_features = offset
+        self._n_numeric = len(numeric_columns)
+        self._mean = np.concatenate(numeric_mean) if numeric_mean else np.zeros(0)
+        self._scale = np.concatenate(numeric_scale) if numeric_scale else np.ones(0)
+        self._category_maps = tuple(category_maps)
+        self._buffers = local()
+
+    def _row_buffer(self) -> np.ndarray:
+        row = getattr(self._buffers, "row", None)
+        if row is None:
+            row = self._buffers.row = np.empty((1, self.n_features), dtype=np.float64)
+        return row
+
+    def _fill(self, out: np.ndarray, features: dict) -> None:
+        numeric = np.fromiter(
+            (features[column] for column in self.numeric_columns),
+            dtype=np.float64,
+            count=self._n_numeric,
+        )
+        out[: self._n_numeric] = (numeric - self._mean) / self._scale
+        out[self._n_numeric :] = 0.0
+        for column, category_map in zip(self.categorical_columns, self._category_maps):
+            position = category_map.get(features[column])
+            if position is not None:
+                out[position] = 1.0
+
+    def transform_one(self, features: dict) -> np.ndarray:
+        row = self._row_buffer()
+        self._fill(row[0], features)
+        return row
+
+    def transform_many(self, features_list: list[dict]) -> np.ndarray:
+        matrix = np.empty((len(features_list), self.n_features), dtype=np.float64)
+        for out, features in zip(matrix, features_list):
+            self._fill(out, features)
+        return matrix
+
+    def predict_proba_one(self, features: dict) -> np.ndarray:
+        return self.classifier.predict_proba(self.transform_one(features))[0]
+
+    def predict_proba_many(self, features_list: list[dict]) -> np.ndarray:
+        return self.classifier.predict_proba(self.transform_many(features_list))
@@ -0,0 +1,159 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 100_000
+COUNTRIES = ["CL", "AR", "PE", "MX", "CO", "UY", "EC", "BR", "US", "ES"]
+COUNTRY_WEIGHTS = [0.2, 0.15, 0.12, 0.16, 0.12, 0.05, 0.06, 0.06, 0.04, 0.04]
+CITIES = [
+    "Santiago",
+    "Valparaiso",
+    "Lima",
+    "Bogota",
+    "Medellin",
+    "CDMX",
+    "Monterrey",
+    "BuenosAires",
+    "Cordoba",
+    "Montevideo",
+    "Quito",
+    "SaoPaulo",
+    "Miami",
+    "Madrid",
+]
+CATEGORIES = {"country": COUNTRIES, "city": CITIES}
+# Categorical columns travel as int8 codes; the forest casts features to
+# float32 anyway, so continuous columns are stored at that precision.
+COLUMN_DTYPES = {
+    "age": np.int32,
+    "country": np.int8,
+    "city": np.int8,
+    "account_age_days": np.int32,
+    "purchases_last_12_months": np.int32,
+    "canceled_orders": np.int32,
+    "tickets_per_order_avg": np.float32,
+    "distance_to_venue_km": np.float32,
+    "payment_failures_ratio": np.float32,
+    "event_affinity_score": np.float32,
+    "night_purchase_ratio": np.float32,
+    "resale_reports_count": np.int32,
+    "attendance_rate": np.float32,
+}
+
+
+def generate_chunk(seed: int, index: int, size: int) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """Rows of chunk `index`; the same (seed, index, size) always yields the same rows."""
+    rng = np.random.default_rng(np.random.SeedSequence([seed, index]))
+
+    age = rng.integers(16, 75, size)
+    country = rng.choice(len(COUNTRIES), size=size, p=COUNTRY_WEIGHTS)
+    city = rng.integers(0, len(CITIES), size)
+    account_age_days = rng.integers(1, 3650, size)
+    purchases = rng.poisson(6, size)
+    canceled_orders = rng.poisson(1.2, size)
+    tickets_per_order_avg = rng.uniform(1, 6, size)
+    distance_to_venue_km = rng.uniform(0.2, 400, size)
+    payment_failures_ratio = rng.uniform(0, 0.35, size)
+    event_affinity_score = rng.uniform(0, 1, size)
+    night_purchase_ratio = rng.uniform(0, 1, size)
+    resale_reports_count = rng.poisson(0.8, size)
+    attendance_rate = rng.uniform(0, 1, size)
+
+    trusted = rng.random(size) < 0.3
+    risky = rng.random(size) < 0.15
+    n_trusted = int(trusted.sum())
+    n_risky = int(risky.sum())
+
+    account_age_days[trusted] = rng.integers(900, 3650, n_trusted)
+    attendance_rate[trusted] = rng.uniform(0.65, 1, n_trusted)
+    event_affinity_score[trusted] = rng.uniform(0.6, 1, n_trusted)
+    payment_failures_ratio[trusted] = rng.uniform(0, 0.08, n_trusted)
+
+    tickets_per_order_avg[risky] = rng.uniform(3.2, 8.5, n_risky)
+    night_purchase_ratio[risky] = rng.uniform(0.45, 1, n_risky)
+    resale_reports_count[risky] = rng.poisson(3.3, n_risky)
+    payment_failures_ratio[risky] = rng.uniform(0.12, 0.55, n_risky)
+    attendance_rate[risky] = rng.uniform(0, 0.45, n_risky)
+
+    risk_index = (
+        (tickets_per_order_avg - 1.8) * 0.30
+        + payment_failures_ratio * 2.3
+        + night_purchase_ratio * 0.85
+        + resale_reports_count * 0.35
+        - event_affinity_score * 1.7
+        - attendance_rate * 2.1
+        - np.log1p(account_age_days) * 0.12
+    )
+    labels = rng.binomial(1, 1 / (1 + np.exp(risk_index))).astype(np.int8)
+
+    values = {
+        "age": age,
+        "country": country,
+        "city": city,
+        "account_age_days": account_age_days,
+        "purchases_last_12_months": purchases,
+        "canceled_orders": canceled_orders,
+        "tickets_per_order_avg": tickets_per_order_avg,
+        "distance_to_venue_km": distance_to_venue_km,
+        "payment_failures_ratio": payment_failures_ratio,
+        "event_affinity_score": event_affinity_score,
+        "night_purchase_ratio": night_purchase_ratio,
+        "resale_reports_count": resale_reports_count,
+        "attendance_rate": attendance_rate,
+    }
+    return {name: values[name].astype(dtype, copy=False) for name, dtype in COLUMN_DTYPES.items()}, labels
+
+
+def iter_chunks(size: int, seed: int, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1):
+    """Yield `(start, columns, labels)` in order, generating up to `workers` chunks in parallel."""
+    bounds = [(index, start, min(chunk_size, size - start)) for index, start in enumerate(range(0, size, chunk_size))]
+    if workers <= 1:
+        for index, start, length in bounds:
+            yield (start, *generate_chunk(seed, index, length))
+        return
+
+    # forkserver: the caller may be a threaded Django process, which fork() does not survive reliably.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("forkserver")) as executor:
+        # A bounded window keeps finished-but-unconsumed chunks from piling up.
+        pending = deque()
+        remaining = iter(bounds)
+        for index, start, length in remaining:
+            pending.append((start, executor.submit(generate_chunk, seed, index, length)))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            start, future = pending.popleft()
+            columns, labels = future.result()
+            next_bound = next(remaining, None)
+            if next_bound is not None:
+                index, next_start, length = next_bound
+                pending.append((next_start, executor.submit(generate_chunk, seed, index, length)))
+            yield start, columns, labels
+
+
+def to_frame(columns: dict[str, np.ndarray]) -> pd.DataFrame:
+    frame = {
+        name: pd.Categorical.from_codes(values, categories=CATEGORIES[name]) if name in CATEGORIES else values
+        for name, values in columns.items()
+    }
+    return pd.DataFrame(frame, copy=False)
+
+
+def generate_dataset(
+    size: int,
+    seed: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """Full dataset filled chunk by chunk into preallocated columns (peak ~ dataset + in-flight chunks)."""
+    columns = {name: np.empty(size, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+    labels = np.empty(size, dtype=np.int8)
+    for start, chunk, chunk_labels in iter_chunks(size, seed, chunk_size, workers):
+        stop = start + len(chunk_labels)
+        for name, values in chunk.items():
+            columns[name][start:stop] = values
+        labels[start:stop] = chunk_labels
+    return to_frame(columns), labels
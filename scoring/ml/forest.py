@@ -0,0 +1,89 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from scoring.ml.compiled import PipelineNotCompilable
+
+
+class FlatForest:
+    """`RandomForestClassifier` flattened into contiguous node arrays.
+
+    Every tree's nodes are concatenated into shared `feature`, `threshold`,
+    `children` and `value` arrays, with leaves rewritten to loop onto
+    themselves. Prediction walks all rows through all trees at once, one tree
+    level per step, instead of dispatching 300 `Tree.predict` calls through
+    joblib. Splits compare the float32-cast input against float64 thresholds,
+    exactly like sklearn, so probabilities match up to summation order.
+
+    The walk is pure NumPy gathers, so it wins on the small batches the API
+    serves; batches above `max_rows` go to sklearn's compiled traversal.
+    """
+
+    def __init__(self, classifier: RandomForestClassifier, chunk_size: int = 1024, max_rows: int = 256) -> None:
+        if not isinstance(classifier, RandomForestClassifier):
+            raise PipelineNotCompilable(f"Unsupported classifier: {type(classifier).__name__}.")
+        if classifier.n_outputs_ != 1:
+            raise PipelineNotCompilable("Multi-output forests are not supported.")
+
+        trees = [estimator.tree_ for estimator in classifier.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        n_nodes = int(offsets[-1])
+        if n_nodes >= np.iinfo(np.int32).max // 2:
+            raise PipelineNotCompilable("Forest is too large for 32-bit node indexes.")
+
+        feature = np.zeros(n_nodes, dtype=np.intp)
+        threshold = np.empty(n_nodes, dtype=np.float64)
+        # children[2 * node] is the left child, children[2 * node + 1] the right one.
+        children = np.empty(2 * n_nodes, dtype=np.int32)
+        value = np.empty((n_nodes, classifier.n_classes_), dtype=np.float64)
+        for tree, offset in zip(trees, offsets[:-1]):
+            nodes = slice(offset, offset + tree.node_count)
+            own = np.arange(offset, offset + tree.node_count, dtype=np.int32)
+            leaf = tree.children_left == -1
+            feature[nodes] = np.where(leaf, 0, tree.feature)
+            # A leaf compares against +inf and both branches return to itself.
+            threshold[nodes] = np.where(leaf, np.inf, tree.threshold)
+            children[2 * offset : 2 * (offset + tree.node_count) : 2] = np.where(leaf, own, tree.children_left + offset)
+            children[2 * offset + 1 : 2 * (offset + tree.node_count) : 2] = np.where(leaf, own, tree.children_right + offset)
+            counts = tree.value[:, 0, :]
+            value[nodes] = counts / counts.sum(axis=1, keepdims=True)
+
+        self.classes_ = classifier.classes_
+        self.n_features_in_ = classifier.n_features_in_
+        self.n_trees = len(trees)
+        self.n_nodes = n_nodes
+        self.depth = max(tree.max_depth for tree in trees)
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+        self.classifier = classifier
+        self._roots = offsets[:-1].astype(np.int32)
+        self._feature = feature
+        self._threshold = threshold
+        self._children = children
+        self._value = value
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Global leaf index reached by every row in every tree, shaped (trees, rows)."""
+        # sklearn validates to float32 before walking the trees.
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n_rows = X.shape[0]
+        # Tree-major layout: consecutive lookups stay inside one tree's nodes.
+        nodes = np.repeat(self._roots[:, None], n_rows, axis=1)
+        row_base = np.arange(n_rows) * X.shape[1]
+        flat_X = X.ravel()
+        for _ in range(self.depth):
+            go_right = flat_X[row_base + self._feature[nodes]] > self._threshold[nodes]
+            nodes = self._children[2 * nodes + go_right]
+        return nodes
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected rows with {self.n_features_in_} features, got shape {X.shape}.")
+        if X.shape[0] > self.max_rows:
+            return self.classifier.predict_proba(X)
+        proba = np.empty((X.shape[0], len(self.classes_)), dtype=np.float64)
+        # Chunking bounds the (trees, rows) index matrices when max_rows is raised.
+        for start in range(0, X.shape[0], self.chunk_size):
+            stop = start + self.chunk_size
+            proba[start:stop] = self._value[self.apply(X[start:stop])].mean(axis=0)
+        return proba
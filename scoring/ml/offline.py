@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from scoring.ml.service import ModelService
+
+# forkserver/spawn pool processes unpickle these. Importing them pulls in Django
+# (scoring.ml.service -> scoring.metrics) but needs neither django.setup() nor a database.
+
+# Set by init_worker in each pool process.
+worker_service = None
+
+
+def pinned_service(path: str, version: str, inference_mode: str) -> ModelService:
+    # Reload disabled: a promotion mid-run must not mix versions within one pass.
+    return ModelService(Path(path), version=version, inference_mode=inference_mode, reload_check_interval=-1)
+
+
+def init_worker(path: str, version: str, inference_mode: str) -> None:
+    global worker_service
+    worker_service = pinned_service(path, version, inference_mode)
+    # Parallelism comes from the pool; a forest with n_jobs=-1 would oversubscribe every core.
+    worker_service.current().pipeline.steps[-1][1].n_jobs = 1
+
+
+def score_rows(
+    rows, fields, service: ModelService | None = None
+) -> tuple[list[tuple[int, str]], list[tuple[float, float, str]]]:
+    """Score `(pk, email, *fields)` rows; returns their `(pk, email)` keys and results in the same order."""
+    service = service or worker_service
+    keys = [(row[0], row[1]) for row in rows]
+    return keys, service.predict_many([dict(zip(fields, row[2:])) for row in rows])
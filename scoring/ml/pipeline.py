@@ -0,0 +1,46 @@
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+NUMERIC_FEATURES = [
+    "age",
+    "account_age_days",
+    "purchases_last_12_months",
+    "canceled_orders",
+    "tickets_per_order_avg",
+    "distance_to_venue_km",
+    "payment_failures_ratio",
+    "event_affinity_score",
+    "night_purchase_ratio",
+    "resale_reports_count",
+    "attendance_rate",
+]
+CATEGORICAL_FEATURES = ["country", "city"]
+DEFAULT_FOREST_PARAMS = {"n_estimators": 300, "max_depth": 16, "min_samples_leaf": 3}
+
+
+def parse_max_depth(value: str) -> int | None:
+    return None if value.lower() == "none" else int(value)
+
+
+def build_pipeline(params: dict | None = None, n_jobs: int = -1, random_state: int = 42) -> Pipeline:
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("numeric", StandardScaler(), NUMERIC_FEATURES),
+            ("categorical", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_FEATURES),
+        ]
+    )
+    return Pipeline(
+        steps=[
+            ("preprocessor", preprocessor),
+            (
+                "classifier",
+                RandomForestClassifier(
+                    **{**DEFAULT_FOREST_PARAMS, **(params or {})},
+                    random_state=random_state,
+                    n_jobs=n_jobs,
+                ),
+            ),
+        ]
+    )
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+import logging
+import os
+import re
+
+from scoring.metrics import MODEL_POOL_BYTES, MODEL_POOL_EVENTS
+from scoring.ml.registry import ModelRegistry
+from scoring.ml.service import LoadedModel, ModelService
+
+# Keys become file names under the pool root, so no separators or dots.
+MODEL_KEY = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+logger = logging.getLogger(__name__)
+
+
+class UnknownModelKey(LookupError):
+    pass
+
+
+class ModelPool:
+    """Separately trained models, one per key (event, region...), kept loaded under a memory budget.
+
+    Key `k` is served from `<root>/k/` when that directory is a
+    `ModelRegistry` (its promoted version, with hot reload), otherwise from
+    `<root>/k.joblib`, reported as version `k`. Each key gets its own
+    `ModelService`, so concurrent first requests for a key wait on that
+    service's load lock and the model is loaded once, while other keys load
+    in parallel. A loaded model counts its artifact size against
+    `max_bytes`; the least recently used ones are dropped until the pool
+    fits again, except the one just loaded. Requests already holding an
+    evicted service finish with it.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        max_bytes: int = 2 << 30,
+        inference_mode: str = "pandas",
+        reload_check_interval: float = 5.0,
+        mmap_mode: str | None = None,
+    ) -> None:
+        self.root = Path(root) if root is not None else None
+        self.max_bytes = max_bytes
+        self.inference_mode = inference_mode
+        self.reload_check_interval = reload_check_interval
+        self.mmap_mode = mmap_mode
+        self._services: OrderedDict[str, ModelService] = OrderedDict()
+        # Handle each key was last accounted for, and its size in bytes.
+        self._accounted: dict[str, tuple[LoadedModel, int]] = {}
+        self._lock = Lock()
+
+    def service(self, key: str) -> ModelService:
+        """The service for `key`, with its model loaded; raises `UnknownModelKey` when there is no artifact for it."""
+        with self._lock:
+            service = self._services.get(key)
+            if service is None:
+                service = self._new_service(key)
+                self._services[key] = service
+            else:
+                self._services.move_to_end(key)
+        try:
+            handle = service.current()
+        except FileNotFoundError:
+            self._discard(key, service)
+            raise UnknownModelKey(key) from None
+
+        accounted = self._accounted.get(key)
+        if accounted is None or accounted[0] is not handle:
+            self._account(key, service, handle)
+        else:
+            MODEL_POOL_EVENTS.labels(event="hit").inc()
+        return service
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "models": list(self._services),
+                "bytes": sum(size for _, size in self._accounted.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+    def _new_service(self, key: str) -> ModelService:
+        if self.root is None or not MODEL_KEY.match(key):
+            raise UnknownModelKey(key)
+        registry_root = self.root / key
+        if registry_root.is_dir():
+            registry = ModelRegistry(registry_root)
+        elif (self.root / f"{key}.joblib").is_file():
+            registry = None
+        else:
+            raise UnknownModelKey(key)
+        return ModelService(
+            self.root / f"{key}.joblib",
+            version=key,
+            inference_mode=self.inference_mode,
+            reload_check_interval=self.reload_check_interval,
+            mmap_mode=self.mmap_mode,
+            registry=registry,
+        )
+
+    def _account(self, key: str, service: ModelService, handle: LoadedModel) -> None:
+        try:
+            size = os.stat(handle.path).st_size
+        except FileNotFoundError:
+            size = 0
+        with self._lock:
+            if self._services.get(key) is not service:
+                return
+            if key not in self._accounted or self._accounted[key][0].generation < handle.generation:
+                MODEL_POOL_EVENTS.labels(event="load").inc()
+            self._accounted[key] = (handle, size)
+            total = sum(size for _, size in self._accounted.values())
+            for candidate in list(self._services):
+                if total <= self.max_bytes:
+                    break
+                # Keys still loading have no size yet and are left alone.
+                if candidate == key or candidate not in self._accounted:
+                    continue
+                del self._services[candidate]
+                _, evicted_size = self._accounted.pop(candidate, (None, 0))
+                total -= evicted_size
+                MODEL_POOL_EVENTS.labels(event="evict").inc()
+                logger.info("Evicted model %s (%s bytes) from the model pool", candidate, evicted_size)
+            MODEL_POOL_BYTES.set(total)
+
+    def _discard(self, key: str, service: ModelService) -> None:
+        with self._lock:
+            if self._services.get(key) is service:
+                del self._services[key]
+                self._accounted.pop(key, None)
+
+
+model_pool = ModelPool()
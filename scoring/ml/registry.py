@@ -0,0 +1,137 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+import fcntl
+import hashlib
+import json
+import os
+
+HISTORY_LIMIT = 20
+
+
+class UnknownModelVersion(LookupError):
+    pass
+
+
+class ModelRegistry:
+    """Directory of immutable, content-addressed model artifacts.
+
+    Layout::
+
+        <root>/artifacts/<version>.joblib   pickled pipeline, never rewritten
+        <root>/artifacts/<version>.json     metadata sidecar
+        <root>/CURRENT                      {"version": ..., "history": [...]}
+
+    The version is a prefix of the artifact's SHA-256. Promotion and rollback
+    only rewrite the small CURRENT pointer with `os.replace`, so readers see
+    either the old or the new version and every artifact stays loadable.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.artifacts_dir = self.root / "artifacts"
+        self.pointer_path = self.root / "CURRENT"
+
+    def artifact_path(self, version: str) -> Path:
+        return self.artifacts_dir / f"{version}.joblib"
+
+    def metadata_path(self, version: str) -> Path:
+        return self.artifacts_dir / f"{version}.json"
+
+    def register(self, model, metadata: dict) -> dict:
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.artifacts_dir / f".incoming.{os.getpid()}.tmp"
+        import joblib
+
+        # Uncompressed so the artifact can be loaded with MODEL_MMAP_MODE.
+        joblib.dump(model, tmp_path, compress=0)
+        digest = hashlib.sha256()
+        with open(tmp_path, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+        version = digest.hexdigest()[:12]
+
+        if self.metadata_path(version).exists():
+            # Identical bytes were registered before; keep the original record.
+            tmp_path.unlink()
+            return self.metadata(version)
+
+        os.replace(tmp_path, self.artifact_path(version))
+        record = {
+            **metadata,
+            "version": version,
+            "sha256": digest.hexdigest(),
+            "size_bytes": self.artifact_path(version).stat().st_size,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._write_json(self.metadata_path(version), record)
+        return record
+
+    def metadata(self, version: str) -> dict:
+        try:
+            return json.loads(self.metadata_path(version).read_text())
+        except FileNotFoundError:
+            raise UnknownModelVersion(f"Model version {version!r} is not registered.") from None
+
+    def versions(self) -> list[dict]:
+        if not self.artifacts_dir.exists():
+            return []
+        records = [json.loads(path.read_text()) for path in self.artifacts_dir.glob("*.json")]
+        return sorted(records, key=lambda record: record["created_at"])
+
+    def pointer(self) -> dict:
+        """Raises FileNotFoundError until a version has been promoted."""
+        return json.loads(self.pointer_path.read_text())
+
+    def current_version(self) -> str:
+        return self.pointer()["version"]
+
+    def promote(self, version: str) -> dict:
+        self.metadata(version)
+        with self._pointer_lock():
+            try:
+                pointer = self.pointer()
+            except FileNotFoundError:
+                pointer = {"version": None, "history": []}
+            if pointer["version"] == version:
+                return pointer
+            history = [pointer["version"], *pointer["history"]] if pointer["version"] else pointer["history"]
+            return self._write_pointer(version, history[:HISTORY_LIMIT])
+
+    def rollback(self, version: str | None = None) -> dict:
+        """Point back at `version`, or at the previously promoted one."""
+        with self._pointer_lock():
+            pointer = self.pointer()
+            history = pointer["history"]
+            if version is None:
+                if not history:
+                    raise UnknownModelVersion("No previous model version to roll back to.")
+                version = history[0]
+            self.metadata(version)
+            remaining = [entry for entry in history if entry != version]
+            return self._write_pointer(version, remaining)
+
+    def _write_pointer(self, version: str, history: list[str]) -> dict:
+        pointer = {
+            "version": version,
+            "history": history,
+            "promoted_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._write_json(self.pointer_path, pointer)
+        return pointer
+
+    @contextmanager
+    def _pointer_lock(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _write_json(path: Path, payload: dict) -> None:
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+        os.replace(tmp_path, path)
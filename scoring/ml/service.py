@@ -1,30 +1,330 @@
+from dataclasses import dataclass
 from pathlib import Path
-from threading import Lock
-import joblib
-import pandas as pd
+from threading import Lock, Thread
+from typing import TYPE_CHECKING
+import logging
+import os
+import time
+
+from scoring.metrics import MODEL_INFO, MODEL_LOAD_SECONDS, MODEL_STAGE_SECONDS
+from scoring.ml.cache import ResultCache
+from scoring.ml.registry import ModelRegistry
+
+# joblib, pandas and sklearn (through scoring.ml.compiled) take about two seconds to import and are
+# only needed once a model is loaded, so they are imported there: app startup and manage.py stay fast.
+if TYPE_CHECKING:
+    from scoring.ml.compiled import CompiledPipeline
+
+ATTENDEE_THRESHOLD = 0.65
+INFERENCE_MODES = ("pandas", "native", "forest")
+logger = logging.getLogger(__name__)
+FRAME_BUILD_SECONDS = MODEL_STAGE_SECONDS.labels(stage="frame_build")
+PREDICT_PROBA_SECONDS = MODEL_STAGE_SECONDS.labels(stage="predict_proba")
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    pipeline: object
+    compiled: "CompiledPipeline | None"
+    signature: tuple[int, int, int]
+    generation: int
+    loaded_at: float
+    version: str
+    path: Path
+
+
+class Score(tuple):
+    """`(attendance_probability, reseller_probability, risk_label)`, tagged with the version of the model that produced it.
+
+    A hot reload can swap the model between a prediction and the write of its
+    row, so callers label results with `model_version` rather than
+    `ModelService.version`.
+    """
+
+    model_version: str
+
+    def __new__(cls, values: tuple[float, float, str], model_version: str) -> "Score":
+        score = super().__new__(cls, values)
+        score.model_version = model_version
+        return score
+
+    def __getnewargs__(self) -> tuple:
+        return tuple(self), self.model_version
 
 
 class ModelService:
-    def __init__(self, model_path: Path, version: str = "v1") -> None:
+    def __init__(
+        self,
+        model_path: Path,
+        version: str = "v1",
+        inference_mode: str = "pandas",
+        reload_check_interval: float = 5.0,
+        mmap_mode: str | None = None,
+        registry: ModelRegistry | None = None,
+    ) -> None:
         self.model_path = Path(model_path)
-        self.version = version
-        self._model = None
+        # Reported for a plain MODEL_PATH artifact; registry models carry their own version.
+        self.default_version = version
+        # When set, the promoted registry version is served and MODEL_PATH is ignored.
+        self.registry = registry
+        self.inference_mode = inference_mode
+        # Seconds between artifact stat checks; a negative value disables hot reload.
+        self.reload_check_interval = reload_check_interval
+        # joblib memory-maps plain NumPy arrays of uncompressed dumps; sklearn
+        # trees still copy their nodes on unpickle, see config/gunicorn.conf.py.
+        self.mmap_mode = mmap_mode
+        self.result_cache: ResultCache | None = None
+        self._handle: LoadedModel | None = None
+        self._next_check = 0.0
         self._lock = Lock()
+        self._warm_up_lock = Lock()
+        self._warm_up_thread: Thread | None = None
+        self._reload_thread: Thread | None = None
 
-    def _load_model(self):
+    @property
+    def version(self) -> str:
+        handle = self._handle
+        return handle.version if handle is not None else self.default_version
+
+    def current(self) -> LoadedModel:
+        # Readers never take the lock once a model is loaded: the handle is
+        # immutable and swapped with a single attribute assignment.
+        handle = self._handle
+        if handle is None:
+            with self._lock:
+                if self._handle is None:
+                    self._swap(self._load(generation=1))
+                return self._handle
+        if self.reload_check_interval >= 0 and time.monotonic() >= self._next_check:
+            self._reload_if_changed(handle)
+            return self._handle
+        return handle
+
+    @property
+    def ready(self) -> bool:
+        """Whether a model is loaded; every load runs a warm-up prediction before it is served."""
+        return self._handle is not None
+
+    def warm_up(self) -> float:
+        """Load the model if needed and run a prediction through it in this process; returns the seconds taken."""
+        started = time.perf_counter()
+        self._warm(self.current())
+        return time.perf_counter() - started
+
+    def start_warm_up(self) -> None:
+        """`warm_up()` in a background thread, unless one is already running."""
+        with self._warm_up_lock:
+            if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+                return
+            self._warm_up_thread = Thread(target=self._warm_up_in_background, name="model-warm-up", daemon=True)
+            self._warm_up_thread.start()
+
+    def _warm_up_in_background(self) -> None:
+        try:
+            logger.info("Model %s warmed up in %.2fs", self.version, self.warm_up())
+        except Exception:
+            logger.exception("Model warm-up failed")
+
+    def reload(self) -> LoadedModel:
         with self._lock:
-            if self._model is None:
-                self._model = joblib.load(self.model_path)
-        return self._model
-
-    def predict(self, features: dict) -> tuple[float, float, str]:
-        model = self._load_model()
-        frame = pd.DataFrame([features])
-        proba = model.predict_proba(frame)[0]
-        attendance_probability = float(proba[1])
+            previous = self._handle
+            self._swap(self._load(generation=previous.generation + 1 if previous else 1))
+            return self._handle
+
+    def request_reload(self) -> None:
+        self._next_check = 0.0
+
+    def _reload_if_changed(self, handle: LoadedModel) -> None:
+        # Only one thread checks; a changed artifact loads in the background while every
+        # reader, including this one, keeps serving the current handle until `_swap`.
+        if not self._lock.acquire(blocking=False):
+            return
+        loading = False
+        try:
+            self._next_check = time.monotonic() + self.reload_check_interval
+            if self._handle is not handle:
+                return
+            try:
+                signature = self._signature()
+            except FileNotFoundError:
+                return
+            if signature != handle.signature:
+                # The loader thread owns the lock until the load finishes, so checks stay cheap meanwhile.
+                self._reload_thread = Thread(
+                    target=self._reload_in_background, args=(handle,), name="model-reload", daemon=True
+                )
+                self._reload_thread.start()
+                loading = True
+        except Exception:
+            logger.exception("Model reload failed, keeping generation %s", handle.generation)
+        finally:
+            if not loading:
+                self._lock.release()
+
+    def _reload_in_background(self, handle: LoadedModel) -> None:
+        try:
+            self._swap(self._load(generation=handle.generation + 1))
+            logger.info(
+                "Reloaded model %s from %s (generation %s)",
+                self._handle.version,
+                self._handle.path,
+                self._handle.generation,
+            )
+        except Exception:
+            logger.exception("Model reload failed, keeping generation %s", handle.generation)
+        finally:
+            self._lock.release()
+
+    def _swap(self, handle: LoadedModel) -> None:
+        previous, self._handle = self._handle, handle
+        if previous is not None and previous.version != handle.version:
+            # Zero rather than remove: multiprocess files keep removed samples.
+            MODEL_INFO.labels(version=previous.version).set(0)
+        MODEL_INFO.labels(version=handle.version).set(handle.generation)
+        if self.result_cache is not None:
+            self.result_cache.clear()
+
+    def _cache_namespace(self, handle: LoadedModel) -> str:
+        if self.registry is not None:
+            return handle.version
+        mtime_ns, size, _ = handle.signature
+        return f"{handle.version}:{mtime_ns}:{size}"
+
+    def _signature(self) -> tuple[int, int, int]:
+        # Promotion replaces the registry pointer, so watching it is enough.
+        stat = os.stat(self.registry.pointer_path if self.registry is not None else self.model_path)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def resolve(self) -> tuple[str, Path]:
+        """Version and artifact path the next load would use, without loading it."""
+        if self.registry is None:
+            return self.default_version, self.model_path
+        version = self.registry.current_version()
+        return version, self.registry.artifact_path(version)
+
+    def _load(self, generation: int) -> LoadedModel:
+        import joblib
+
+        with MODEL_LOAD_SECONDS.time():
+            # Stat before resolving: a promotion in between only costs one extra reload.
+            signature = self._signature()
+            version, path = self.resolve()
+            pipeline = joblib.load(path, mmap_mode=self.mmap_mode)
+            compiled = self._compile(pipeline, path)
+        self._next_check = time.monotonic() + self.reload_check_interval
+        handle = LoadedModel(
+            pipeline=pipeline,
+            compiled=compiled,
+            signature=signature,
+            generation=generation,
+            loaded_at=time.time(),
+            version=version,
+            path=path,
+        )
+        # Pay for the first prediction's lazy setup here, before the handle serves any request.
+        self._warm(handle)
+        return handle
+
+    @staticmethod
+    def _warm(handle: LoadedModel) -> None:
+        from scoring.ml.pipeline import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+
+        features = {**dict.fromkeys(NUMERIC_FEATURES, 0.0), **dict.fromkeys(CATEGORICAL_FEATURES, "")}
+        if handle.compiled is not None:
+            handle.compiled.classifier.predict_proba(handle.compiled.transform_one(features))
+        else:
+            import pandas as pd
+
+            handle.pipeline.predict_proba(pd.DataFrame([features]))
+
+    def _compile(self, model, path: Path) -> "CompiledPipeline | None":
+        if self.inference_mode not in INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode {self.inference_mode!r}; expected one of {INFERENCE_MODES}.")
+        if self.inference_mode == "pandas":
+            return None
+        from scoring.ml.compiled import CompiledPipeline, PipelineNotCompilable
+
+        try:
+            return CompiledPipeline(model, flat_forest=self.inference_mode == "forest")
+        except PipelineNotCompilable:
+            logger.warning("Model at %s cannot be compiled, falling back to pandas inference", path, exc_info=True)
+            return None
+
+    @staticmethod
+    def _to_result(attendance_probability: float, model_version: str) -> Score:
         reseller_probability = 1.0 - attendance_probability
-        risk_label = "attendee" if attendance_probability >= 0.65 else "reseller_risk"
-        return attendance_probability, reseller_probability, risk_label
+        risk_label = "attendee" if attendance_probability >= ATTENDEE_THRESHOLD else "reseller_risk"
+        return Score((attendance_probability, reseller_probability, risk_label), model_version)
+
+    def predict(self, features: dict) -> Score:
+        handle = self.current()
+        cache = self.result_cache
+        if cache is not None:
+            key = cache.key(features, self._cache_namespace(handle))
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        with FRAME_BUILD_SECONDS.time():
+            if handle.compiled is not None:
+                estimator, rows = handle.compiled.classifier, handle.compiled.transform_one(features)
+            else:
+                import pandas as pd
+
+                estimator, rows = handle.pipeline, pd.DataFrame([features])
+        with PREDICT_PROBA_SECONDS.time():
+            proba = estimator.predict_proba(rows)[0]
+        result = self._to_result(float(proba[1]), handle.version)
+
+        if cache is not None:
+            cache.set(key, result)
+        return result
+
+    def predict_many(self, features_list: list[dict]) -> list[Score]:
+        if not features_list:
+            return []
+        handle = self.current()
+        cache = self.result_cache
+        results = [None] * len(features_list)
+        keys = []
+        if cache is not None:
+            namespace = self._cache_namespace(handle)
+            keys = [cache.key(features, namespace) for features in features_list]
+            results = [cache.get(key) for key in keys]
+
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            pending = [features_list[index] for index in missing]
+            with FRAME_BUILD_SECONDS.time():
+                if handle.compiled is not None:
+                    estimator, rows = handle.compiled.classifier, handle.compiled.transform_many(pending)
+                else:
+                    import pandas as pd
+
+                    estimator, rows = handle.pipeline, pd.DataFrame.from_records(pending)
+            with PREDICT_PROBA_SECONDS.time():
+                attendance = estimator.predict_proba(rows)[:, 1]
+            for index, probability in zip(missing, attendance):
+                results[index] = self._to_result(float(probability), handle.version)
+                if cache is not None:
+                    cache.set(keys[index], results[index])
+        return results
+
+    def claim_write(self, email: str, features: dict) -> bool:
+        """False when this email was already persisted with these features and model within the cache TTL."""
+        cache = self.result_cache
+        if cache is None:
+            return True
+        return cache.add(self._write_key(cache, email, features), True)
+
+    def release_write(self, email: str, features: dict) -> None:
+        """Drop a `claim_write` claim whose write failed, so a retry persists the row."""
+        cache = self.result_cache
+        if cache is not None:
+            cache.delete(self._write_key(cache, email, features))
+
+    def _write_key(self, cache: ResultCache, email: str, features: dict) -> str:
+        return cache.key({**features, "email": email}, f"write:{self._cache_namespace(self.current())}")
 
 
 model_service = ModelService(Path(__file__).resolve().parent / "attendance_model.joblib")
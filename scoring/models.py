@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 
 
@@ -21,9 +23,72 @@ class UserProfile(models.Model):
 
 
 class Prediction(models.Model):
-    user = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="predictions")
+    # The (user, -created_at) index leads with user_id, so the FK's own index would only add write cost.
+    user = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="predictions", db_index=False)
     attendance_probability = models.FloatField()
     reseller_probability = models.FloatField()
     risk_label = models.CharField(max_length=32)
     model_version = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"], name="prediction_user_latest_idx"),
+            models.Index(fields=["model_version", "created_at"], name="prediction_version_time_idx"),
+            models.Index(fields=["risk_label", "created_at"], name="prediction_label_time_idx"),
+        ]
+
+
+class LatestPrediction(models.Model):
+    """Denormalized copy of each user's most recent Prediction, keyed by email for lookups."""
+
+    email = models.EmailField(primary_key=True)
+    user = models.OneToOneField(UserProfile, on_delete=models.CASCADE, related_name="latest_prediction")
+    attendance_probability = models.FloatField()
+    reseller_probability = models.FloatField()
+    risk_label = models.CharField(max_length=32)
+    model_version = models.CharField(max_length=64)
+    scored_at = models.DateTimeField()
+
+    @classmethod
+    def from_prediction(cls, email: str, prediction: Prediction) -> "LatestPrediction":
+        return cls(
+            email=email,
+            user_id=prediction.user_id,
+            attendance_probability=prediction.attendance_probability,
+            reseller_probability=prediction.reseller_probability,
+            risk_label=prediction.risk_label,
+            model_version=prediction.model_version,
+            scored_at=prediction.created_at,
+        )
+
+
+class TrainingJob(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = "queued"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    size = models.PositiveIntegerField()
+    seed = models.IntegerField()
+    n_jobs = models.IntegerField()
+    validation_accuracy = models.FloatField(null=True, blank=True)
+    timings = models.JSONField(default=dict, blank=True)
+    model_path = models.CharField(max_length=512, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # At most one queued or running job: concurrent POST /model/train/ calls race on this index, not on a read.
+            models.UniqueConstraint(
+                models.Value(True),
+                condition=models.Q(status__in=["queued", "running"]),
+                name="training_job_single_active",
+            ),
+        ]
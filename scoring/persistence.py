@@ -0,0 +1,303 @@
+from collections import deque
+from itertools import batched
+from threading import Event, Lock, Thread
+import atexit
+import hashlib
+import json
+import logging
+import time
+
+from django.db import close_old_connections, connection, transaction
+
+from scoring.metrics import (
+    LATEST_SCORE_CACHE_EVENTS,
+    WRITE_BEHIND_DEPTH,
+    WRITE_BEHIND_FLUSH_SECONDS,
+    WRITE_BEHIND_ROWS,
+)
+from scoring.ml.cache import ResultCache
+from scoring.models import LatestPrediction, Prediction, UserProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FIELDS = [
+    "age",
+    "country",
+    "city",
+    "account_age_days",
+    "purchases_last_12_months",
+    "canceled_orders",
+    "tickets_per_order_avg",
+    "distance_to_venue_km",
+    "payment_failures_ratio",
+    "event_affinity_score",
+    "night_purchase_ratio",
+    "resale_reports_count",
+    "attendance_rate",
+]
+LATEST_SCORE_FIELDS = [
+    "email",
+    "attendance_probability",
+    "reseller_probability",
+    "risk_label",
+    "model_version",
+    "scored_at",
+]
+
+# Writes invalidate this process's entry (and the shared backend's); other
+# workers' local copies may trail a new score by at most the TTL.
+latest_score_cache = ResultCache(max_entries=10000, ttl=2.0, events=LATEST_SCORE_CACHE_EVENTS)
+
+
+def bulk_upsert_profiles(payloads: list[dict]) -> dict[str, int]:
+    # ON CONFLICT cannot touch the same row twice in one statement, so the last
+    # payload for a repeated email wins.
+    latest = {payload["email"]: payload for payload in payloads}
+    if not latest:
+        return {}
+
+    UserProfile.objects.bulk_create(
+        [UserProfile(**payload) for payload in latest.values()],
+        update_conflicts=True,
+        unique_fields=["email"],
+        update_fields=[*PROFILE_FIELDS, "updated_at"],
+    )
+    return dict(UserProfile.objects.filter(email__in=latest.keys()).values_list("email", "id"))
+
+
+def copy_upsert_profiles(payloads: list[dict]) -> int:
+    """PostgreSQL-only `bulk_upsert_profiles` for large imports: COPY, then one upsert.
+
+    Rows are streamed into a session temp table with COPY and merged with a
+    single `INSERT ... ON CONFLICT (email) DO UPDATE`; like
+    `bulk_upsert_profiles`, the last payload for a repeated email wins.
+    Returns the number of profiles written.
+    """
+    if not payloads:
+        return 0
+
+    quote = connection.ops.quote_name
+    fields = [UserProfile._meta.get_field(name) for name in ["email", *PROFILE_FIELDS]]
+    columns = ", ".join(quote(field.column) for field in fields)
+    definitions = ", ".join(f"{quote(field.column)} {field.db_type(connection)}" for field in fields)
+    email = quote(UserProfile._meta.get_field("email").column)
+    updates = ", ".join(f"{quote(field.column)} = EXCLUDED.{quote(field.column)}" for field in fields[1:])
+    staging = quote(f"{UserProfile._meta.db_table}_staging")
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Emptied by every commit, so the table is created once per connection and reused.
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {staging} (seq bigint, {definitions}) ON COMMIT DELETE ROWS"
+        )
+        with cursor.copy(f"COPY {staging} (seq, {columns}) FROM STDIN") as copy:
+            for seq, payload in enumerate(payloads):
+                copy.write_row((seq, *(payload[field.name] for field in fields)))
+        cursor.execute(
+            f"INSERT INTO {quote(UserProfile._meta.db_table)} ({columns}, created_at, updated_at) "
+            f"SELECT DISTINCT ON ({email}) {columns}, now(), now() FROM {staging} ORDER BY {email}, seq DESC "
+            f"ON CONFLICT ({email}) DO UPDATE SET {updates}, updated_at = EXCLUDED.updated_at"
+        )
+        return cursor.rowcount
+
+
+def bulk_save_scores(payloads: list[dict], results: list[tuple[float, float, str]], model_version: str) -> None:
+    save_score_entries([(payload, result, model_version) for payload, result in zip(payloads, results)])
+
+
+@transaction.atomic
+def save_score_entries(entries: list[tuple[dict, tuple[float, float, str], str]]) -> None:
+    user_ids = bulk_upsert_profiles([payload for payload, _, _ in entries])
+    predictions = Prediction.objects.bulk_create(
+        [
+            Prediction(
+                user_id=user_ids[payload["email"]],
+                attendance_probability=attendance_probability,
+                reseller_probability=reseller_probability,
+                risk_label=risk_label,
+                model_version=model_version,
+            )
+            for payload, (attendance_probability, reseller_probability, risk_label), model_version in entries
+        ]
+    )
+    save_latest_predictions(
+        [
+            LatestPrediction.from_prediction(payload["email"], prediction)
+            for (payload, _, _), prediction in zip(entries, predictions)
+        ]
+    )
+
+
+def save_latest_predictions(rows: list[LatestPrediction]) -> None:
+    """Upsert each user's `LatestPrediction`, never replacing a newer score with an older one.
+
+    Concurrent writers (request threads, the write-behind flush, `rescore_profiles`)
+    commit in any order, so the update is guarded by `scored_at` in the same
+    `INSERT ... ON CONFLICT` statement. The last row for a repeated email wins.
+    """
+    latest = {row.email: row for row in rows}
+    if not latest:
+        return
+
+    quote = connection.ops.quote_name
+    table = quote(LatestPrediction._meta.db_table)
+    fields = LatestPrediction._meta.concrete_fields
+    columns = ", ".join(quote(field.column) for field in fields)
+    updates = ", ".join(
+        f"{quote(field.column)} = EXCLUDED.{quote(field.column)}" for field in fields if not field.primary_key
+    )
+    pk_column = quote(LatestPrediction._meta.pk.column)
+    scored_at = quote(LatestPrediction._meta.get_field("scored_at").column)
+    row_placeholder = f"({', '.join(['%s'] * len(fields))})"
+    objs = list(latest.values())
+    batch_size = connection.ops.bulk_batch_size(fields, objs) or len(objs)
+
+    with connection.cursor() as cursor:
+        for batch in batched(objs, batch_size):
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES {', '.join([row_placeholder] * len(batch))} "
+                f"ON CONFLICT ({pk_column}) DO UPDATE SET {updates} "
+                f"WHERE EXCLUDED.{scored_at} >= {table}.{scored_at}",
+                [field.get_db_prep_save(getattr(row, field.attname), connection) for row in batch for field in fields],
+            )
+    transaction.on_commit(lambda: [latest_score_cache.delete(latest_score_key(email)) for email in latest])
+
+
+def latest_score_key(email: str) -> str:
+    return f"latest:{email}"
+
+
+def latest_score(email: str) -> tuple[dict, str] | None:
+    """The latest score stored for `email` and its ETag, or None when it was never scored."""
+    key = latest_score_key(email)
+    entry = latest_score_cache.get(key)
+    if entry is None:
+        row = LatestPrediction.objects.filter(pk=email).values(*LATEST_SCORE_FIELDS).first()
+        # Unknown emails are cached too, so repeated lookups of unscored buyers skip the database.
+        entry = (row, score_etag(row)) if row else (None, None)
+        latest_score_cache.set(key, entry)
+    return None if entry[0] is None else entry
+
+
+def score_etag(row: dict) -> str:
+    digest = hashlib.blake2b(json.dumps(row, sort_keys=True, default=str).encode(), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
+class WriteBehindBuffer:
+    """In-process queue of scored requests persisted in bulk off the request path.
+
+    A background thread flushes every `flush_interval` seconds or as soon as
+    `max_batch` entries are pending. When `max_pending` entries are queued the
+    caller flushes inline, so memory stays bounded and a stalled database
+    surfaces as request errors instead of unbounded growth.
+    """
+
+    def __init__(self, max_batch: int = 500, flush_interval: float = 0.5, max_pending: int = 10000) -> None:
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._wakeup = Event()
+        self._stopped = Event()
+        self._thread = None
+        self._stats = {
+            "enqueued": 0,
+            "flushed": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "dropped": 0,
+            "last_flush_seconds": 0.0,
+            "max_flush_seconds": 0.0,
+            "total_flush_seconds": 0.0,
+        }
+
+    def add(self, payload: dict, result: tuple[float, float, str], model_version: str) -> None:
+        if len(self._pending) >= self.max_pending:
+            self.flush()
+        with self._lock:
+            self._pending.append((payload, result, model_version))
+            self._stats["enqueued"] += 1
+            depth = len(self._pending)
+        WRITE_BEHIND_DEPTH.inc()
+        WRITE_BEHIND_ROWS.labels(outcome="enqueued").inc()
+        self._ensure_thread()
+        if depth >= self.max_batch:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        flushed = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+                if not batch:
+                    return flushed
+                started = time.perf_counter()
+                try:
+                    save_score_entries(batch)
+                except Exception:
+                    self._requeue(batch)
+                    raise
+                elapsed = time.perf_counter() - started
+                flushed += len(batch)
+                WRITE_BEHIND_DEPTH.dec(len(batch))
+                WRITE_BEHIND_FLUSH_SECONDS.observe(elapsed)
+                WRITE_BEHIND_ROWS.labels(outcome="flushed").inc(len(batch))
+                with self._lock:
+                    self._stats["flushed"] += len(batch)
+                    self._stats["flushes"] += 1
+                    self._stats["last_flush_seconds"] = elapsed
+                    self._stats["max_flush_seconds"] = max(self._stats["max_flush_seconds"], elapsed)
+                    self._stats["total_flush_seconds"] += elapsed
+
+    def _requeue(self, batch: list) -> None:
+        with self._lock:
+            self._stats["failed_flushes"] += 1
+            room = max(self.max_pending - len(self._pending), 0)
+            kept = batch[-room:] if room else []
+            self._stats["dropped"] += len(batch) - len(kept)
+            self._pending.extendleft(reversed(kept))
+        WRITE_BEHIND_DEPTH.dec(len(batch) - len(kept))
+        WRITE_BEHIND_ROWS.labels(outcome="dropped").inc(len(batch) - len(kept))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "depth": len(self._pending)}
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=max(self.flush_interval * 4, 5))
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Dropping %s pending score writes on shutdown", len(self._pending))
+        finally:
+            close_old_connections()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = Thread(target=self._run, name="score-write-behind", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed, %s entries pending", len(self._pending))
+            finally:
+                close_old_connections()
+
+
+write_behind_buffer = WriteBehindBuffer()
@@ -1,7 +1,8 @@
+from django.conf import settings
 from drf_spectacular.utils import OpenApiExample, extend_schema_serializer
 from rest_framework import serializers
 
-from scoring.models import Prediction, UserProfile
+from scoring.models import Prediction, TrainingJob, UserProfile
 
 
 @extend_schema_serializer(
@@ -67,6 +68,105 @@ class ScoreResponseSerializer(serializers.Serializer):
     model_version = serializers.CharField()
 
 
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            "Latest score response example",
+            value={
+                "email": "persona@example.com",
+                "attendance_probability": 0.93,
+                "reseller_probability": 0.07,
+                "risk_label": "attendee",
+                "model_version": "v1",
+                "scored_at": "2025-08-01T12:00:00Z",
+            },
+            response_only=True,
+            status_codes=["200"],
+        )
+    ]
+)
+class LatestScoreResponseSerializer(ScoreResponseSerializer):
+    email = serializers.EmailField()
+    scored_at = serializers.DateTimeField()
+
+
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            "Batch score request example",
+            value={
+                "items": [
+                    {
+                        "email": "persona@example.com",
+                        "age": 29,
+                        "country": "CL",
+                        "city": "Santiago",
+                        "account_age_days": 950,
+                        "purchases_last_12_months": 8,
+                        "canceled_orders": 0,
+                        "tickets_per_order_avg": 1.4,
+                        "distance_to_venue_km": 12.5,
+                        "payment_failures_ratio": 0.02,
+                        "event_affinity_score": 0.91,
+                        "night_purchase_ratio": 0.12,
+                        "resale_reports_count": 0,
+                        "attendance_rate": 0.88,
+                    }
+                ]
+            },
+            request_only=True,
+        )
+    ]
+)
+class ScoreBatchRequestSerializer(serializers.Serializer):
+    items = serializers.ListField(child=serializers.JSONField(), allow_empty=False)
+
+    def validate_items(self, value):
+        max_items = settings.SCORE_BATCH_MAX_ITEMS
+        if len(value) > max_items:
+            raise serializers.ValidationError(f"Ensure this field has no more than {max_items} elements.")
+        return value
+
+
+class ScoreBatchResultSerializer(ScoreResponseSerializer):
+    index = serializers.IntegerField()
+    email = serializers.EmailField()
+
+
+class ScoreBatchErrorSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            "Batch score response example",
+            value={
+                "model_version": "v1",
+                "results": [
+                    {
+                        "index": 0,
+                        "email": "persona@example.com",
+                        "attendance_probability": 0.93,
+                        "reseller_probability": 0.07,
+                        "risk_label": "attendee",
+                        "model_version": "v1",
+                    }
+                ],
+                "errors": [{"index": 1, "errors": {"age": ["Ensure this value is greater than or equal to 13."]}}],
+            },
+            response_only=True,
+            status_codes=["200"],
+        )
+    ]
+)
+class ScoreBatchResponseSerializer(serializers.Serializer):
+    model_version = serializers.CharField()
+    results = ScoreBatchResultSerializer(many=True)
+    errors = ScoreBatchErrorSerializer(many=True)
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -98,7 +198,12 @@ class DetailResponseSerializer(serializers.Serializer):
     examples=[
         OpenApiExample(
             "Training accepted example",
-            value={"status": "trained", "model_path": "/app/.data/attendance_model.joblib"},
+            value={
+                "status": "queued",
+                "job_id": "3f1c2a52-4c8e-4a43-9f0e-7d2f1b9e8a10",
+                "status_url": "/api/v1/model/train/3f1c2a52-4c8e-4a43-9f0e-7d2f1b9e8a10/",
+                "model_path": "/app/.data/attendance_model.joblib",
+            },
             response_only=True,
             status_codes=["202"],
         )
@@ -106,9 +211,45 @@ class DetailResponseSerializer(serializers.Serializer):
 )
 class TrainModelResponseSerializer(serializers.Serializer):
     status = serializers.CharField()
+    job_id = serializers.UUIDField()
+    status_url = serializers.CharField()
     model_path = serializers.CharField()
 
 
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            "Training job example",
+            value={
+                "id": "3f1c2a52-4c8e-4a43-9f0e-7d2f1b9e8a10",
+                "status": "succeeded",
+                "size": 120000,
+                "seed": 42,
+                "n_jobs": 1,
+                "validation_accuracy": 0.7992,
+                "timings": {
+                    "generate_seconds": 0.41,
+                    "fit_seconds": 98.2,
+                    "evaluate_seconds": 1.9,
+                    "save_seconds": 0.6,
+                },
+                "model_path": "/app/.data/attendance_model.joblib",
+                "error": "",
+                "created_at": "2026-01-01T12:00:00Z",
+                "started_at": "2026-01-01T12:00:01Z",
+                "finished_at": "2026-01-01T12:01:42Z",
+            },
+            response_only=True,
+            status_codes=["200"],
+        )
+    ]
+)
+class TrainingJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TrainingJob
+        fields = "__all__"
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -123,6 +264,27 @@ class HealthResponseSerializer(serializers.Serializer):
     status = serializers.CharField()
 
 
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            "Ready response example",
+            value={"status": "ready", "model_version": "v1"},
+            response_only=True,
+            status_codes=["200"],
+        ),
+        OpenApiExample(
+            "Warming up response example",
+            value={"status": "warming_up", "model_version": None},
+            response_only=True,
+            status_codes=["503"],
+        ),
+    ]
+)
+class ReadyResponseSerializer(serializers.Serializer):
+    status = serializers.CharField()
+    model_version = serializers.CharField(allow_null=True)
+
+
 class EmptyRequestSerializer(serializers.Serializer):
     pass
 
@@ -0,0 +1,108 @@
+from pathlib import Path
+from threading import Lock
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+
+from rest_framework.throttling import AnonRateThrottle
+
+# One way: key hash, tokens left, last refill (monotonic seconds).
+WAY = struct.Struct("<Qdd")
+WAYS_PER_SET = 4
+SET_SIZE = WAY.size * WAYS_PER_SET
+THREAD_LOCK_STRIPES = 64
+
+
+class SharedTokenBuckets:
+    """Token buckets in a file-backed shared memory segment, one per key, shared by every process mapping the file.
+
+    The file is a 4-way set-associative table: a key hashes to one set, and
+    a new key replaces the set's least recently refilled bucket. A check
+    locks only that set (an `fcntl` byte-range lock across processes plus a
+    striped thread lock, since `fcntl` locks do not exclude threads of one
+    process), so it is O(1) and never rewrites per-request history. An
+    evicted key simply starts again with a full bucket.
+    """
+
+    def __init__(self, path: Path, slots: int = 65536) -> None:
+        self.path = Path(path)
+        self.slots = slots
+        self._sets = None
+        self._pid = None
+        self._fd = None
+        self._map = None
+        self._open_lock = Lock()
+        self._thread_locks = [Lock() for _ in range(THREAD_LOCK_STRIPES)]
+
+    def consume(self, key: str, capacity: float, rate: float, now: float | None = None) -> tuple[bool, float]:
+        """Take one token from `key`'s bucket; returns whether it was allowed and the seconds until the next token."""
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+        segment = self._segment()
+        index = digest % self._sets
+        offset = index * SET_SIZE
+
+        with self._thread_locks[index % THREAD_LOCK_STRIPES]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, SET_SIZE, offset)
+            try:
+                # Read the clock under the lock so timestamps of one bucket never go backwards.
+                now = time.monotonic() if now is None else now
+                ways = [WAY.unpack_from(segment, offset + way * WAY.size) for way in range(WAYS_PER_SET)]
+                for way, (stored, tokens, last) in enumerate(ways):
+                    if stored == digest:
+                        # Clamp: a stale file from before a reboot has timestamps from another clock epoch.
+                        tokens = min(capacity, tokens + max(now - last, 0.0) * rate)
+                        break
+                else:
+                    way = min(range(WAYS_PER_SET), key=lambda candidate: ways[candidate][2])
+                    tokens = capacity
+
+                allowed = tokens >= 1.0
+                if allowed:
+                    tokens -= 1.0
+                WAY.pack_into(segment, offset + way * WAY.size, digest, tokens, now)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, SET_SIZE, offset)
+        return allowed, 0.0 if allowed else (1.0 - tokens) / rate
+
+    def _segment(self) -> mmap.mmap:
+        # Mapped lazily per process: workers forked from a preloaded master open their own descriptor.
+        if self._pid == os.getpid():
+            return self._map
+        with self._open_lock:
+            if self._pid != os.getpid():
+                self._sets = max(self.slots // WAYS_PER_SET, 1)
+                size = self._sets * SET_SIZE
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self._fd = fd
+                self._map = mmap.mmap(fd, size)
+                self._pid = os.getpid()
+        return self._map
+
+
+shared_token_buckets = SharedTokenBuckets(Path("/tmp/api-queue-throttle"))
+
+
+class SharedAnonRateThrottle(AnonRateThrottle):
+    """`AnonRateThrottle` with the same scope and rate, enforced as one token bucket per client across workers.
+
+    A rate of N/period refills N tokens per period and allows bursts of up to
+    N requests, instead of DRF's per-worker sliding list of timestamps.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        allowed, self._wait = shared_token_buckets.consume(key, self.num_requests, self.num_requests / self.duration)
+        return allowed
+
+    def wait(self):
+        return self._wait
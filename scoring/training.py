@@ -0,0 +1,74 @@
+from pathlib import Path
+import json
+import subprocess
+import sys
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from scoring.models import TrainingJob
+
+ACTIVE_STATUSES = [TrainingJob.Status.QUEUED, TrainingJob.Status.RUNNING]
+
+
+def launch_training_job(job: TrainingJob) -> subprocess.Popen:
+    # A separate interpreter keeps the fit off the serving worker's GIL and
+    # lets `train_model` lower its own priority; the worker only reaps it.
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(settings.BASE_DIR / "manage.py"),
+            "train_model",
+            "--job-id",
+            str(job.id),
+            "--size",
+            str(job.size),
+            "--seed",
+            str(job.seed),
+            "--n-jobs",
+            str(job.n_jobs),
+            "--niceness",
+            str(settings.MODEL_TRAIN_NICENESS),
+        ],
+        stdin=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    threading.Thread(target=reap_training_job, args=(process, job.id), name=f"train-job-{job.id}", daemon=True).start()
+    return process
+
+
+def reap_training_job(process: subprocess.Popen, job_id) -> None:
+    # A child killed before it could record its own failure (OOM, SIGKILL, a crash during
+    # start-up) would otherwise leave the job active until it goes stale.
+    returncode = process.wait()
+    if returncode == 0:
+        return
+    try:
+        fail_training_job(job_id, f"train_model exited with status {returncode}.")
+    finally:
+        connection.close()
+
+
+def fail_training_job(job_id, error: str) -> bool:
+    # Conditional so that a failure the child already recorded, or a stale-job sweep, is not overwritten.
+    updated = TrainingJob.objects.filter(pk=job_id, status__in=ACTIVE_STATUSES).update(
+        status=TrainingJob.Status.FAILED,
+        error=error,
+        finished_at=timezone.now(),
+    )
+    return updated == 1
+
+
+def model_state_dir() -> Path:
+    # Tuning results and job checkpoints live next to the model artifacts.
+    return Path(settings.MODEL_REGISTRY_DIR or settings.MODEL_PATH.parent)
+
+
+def tuning_path() -> Path:
+    return model_state_dir() / "tuning.json"
+
+
+def read_tuning() -> dict:
+    return json.loads(tuning_path().read_text())
@@ -1,8 +1,22 @@
 from django.urls import path
-from scoring.views import HealthView, ScoreView, TrainModelView
+from scoring.views import (
+    AsyncScoreView,
+    HealthView,
+    LatestScoreView,
+    ReadyView,
+    ScoreBatchView,
+    ScoreView,
+    TrainingJobStatusView,
+    TrainModelView,
+)
 
 urlpatterns = [
     path("health/", HealthView.as_view(), name="health"),
+    path("ready/", ReadyView.as_view(), name="ready"),
     path("score/", ScoreView.as_view(), name="score"),
+    path("score/batch/", ScoreBatchView.as_view(), name="score-batch"),
+    path("score/async/", AsyncScoreView.as_view(), name="score-async"),
+    path("score/<str:email>/", LatestScoreView.as_view(), name="score-latest"),
     path("model/train/", TrainModelView.as_view(), name="model-train"),
+    path("model/train/<uuid:job_id>/", TrainingJobStatusView.as_view(), name="model-train-status"),
 ]
@@ -0,0 +1,131 @@
+from collections.abc import Mapping
+import math
+import re
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import EmailValidator
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from scoring.serializers import ScoreRequestSerializer
+
+# DRF's own coercion constants, so the lean path accepts exactly what the serializer does.
+DECIMAL_SUFFIX = re.compile(r"\.0*\s*$")
+MAX_STRING_LENGTH = 1000
+SURROGATE = re.compile("[\ud800-\udfff]")
+# Distinguishes an absent key (required) from an explicit null.
+MISSING = object()
+
+
+class ProfileValidator:
+    """Validate score payloads with `ScoreRequestSerializer`'s rules, minus its per-row overhead.
+
+    Field types, bounds and error messages are read from the serializer once;
+    each call then only coerces and range-checks values. Returns
+    `(validated, errors)` with the same shapes and messages as the serializer's
+    `validated_data` and `errors`; exactly one of them is non-empty.
+    """
+
+    def __init__(self, serializer_class: type[serializers.Serializer] = ScoreRequestSerializer) -> None:
+        self._fields = [(name, self._compile(field)) for name, field in serializer_class().fields.items()]
+
+    def __call__(self, data: dict) -> tuple[dict, dict]:
+        if not isinstance(data, Mapping):
+            message = f"Invalid data. Expected a dictionary, but got {type(data).__name__}."
+            return {}, {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+        validated = {}
+        errors = {}
+        for name, check in self._fields:
+            value, messages = check(data.get(name, MISSING))
+            if messages:
+                errors[name] = messages
+            else:
+                validated[name] = value
+        return ({}, errors) if errors else (validated, {})
+
+    def _compile(self, field: serializers.Field):
+        messages = {key: str(message) for key, message in field.error_messages.items()}
+
+        def fail(key, **kwargs):
+            return None, [messages[key].format(**kwargs)]
+
+        def empty(value):
+            if value is MISSING:
+                return fail("required")
+            if value is None:
+                return fail("null")
+            return None
+
+        if isinstance(field, serializers.IntegerField):
+            coerce = _int
+        elif isinstance(field, serializers.FloatField):
+            coerce = _float
+        elif isinstance(field, serializers.CharField):
+            coerce = _string
+        else:
+            raise TypeError(f"{type(field).__name__} has no lean validator")
+
+        minimum = getattr(field, "min_value", None)
+        maximum = getattr(field, "max_value", None)
+        max_length = getattr(field, "max_length", None)
+        email = EmailValidator() if isinstance(field, serializers.EmailField) else None
+
+        def check(value):
+            failed = empty(value)
+            if failed:
+                return failed
+            value, key = coerce(value)
+            if key:
+                return fail(key)
+            errors = []
+            if minimum is not None and value < minimum:
+                errors.append(messages["min_value"].format(min_value=minimum))
+            if maximum is not None and value > maximum:
+                errors.append(messages["max_value"].format(max_value=maximum))
+            if isinstance(value, str):
+                if max_length is not None and len(value) > max_length:
+                    errors.append(messages["max_length"].format(max_length=max_length))
+                if "\x00" in value:
+                    errors.append("Null characters are not allowed.")
+                surrogate = SURROGATE.search(value)
+                if surrogate:
+                    errors.append(f"Surrogate characters are not allowed: U+{ord(surrogate.group()):X}.")
+                if email is not None:
+                    try:
+                        email(value)
+                    except DjangoValidationError:
+                        errors.append(messages["invalid"])
+            return (None, errors) if errors else (value, None)
+
+        return check
+
+
+def _int(value):
+    if type(value) is int:
+        return value, None
+    if isinstance(value, str) and len(value) > MAX_STRING_LENGTH:
+        return None, "max_string_length"
+    try:
+        return int(DECIMAL_SUFFIX.sub("", str(value))), None
+    except (ValueError, TypeError):
+        return None, "invalid"
+
+
+def _float(value):
+    if isinstance(value, str) and len(value) > MAX_STRING_LENGTH:
+        return None, "max_string_length"
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None, "invalid"
+    except OverflowError:
+        return None, "overflow"
+    return (value, None) if math.isfinite(value) else (None, "invalid")
+
+
+def _string(value):
+    if value == "" or str(value).strip() == "":
+        return None, "blank"
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        return None, "invalid"
+    return str(value).strip(), None
@@ -1,27 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import asyncio
+import json
 import logging
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from scoring.ml.service import model_service
-from scoring.models import Prediction, UserProfile
+from scoring.fastjson import dumps, loads
+from scoring.metrics import count_connection_checkout, observe_stage
+from scoring.ml.batching import micro_batcher
+from scoring.ml.pool import UnknownModelKey, model_pool
+from scoring.ml.service import ModelService, model_service
+from scoring.models import LatestPrediction, Prediction, TrainingJob, UserProfile
+from scoring.persistence import bulk_save_scores, latest_score, save_latest_predictions, write_behind_buffer
 from scoring.serializers import (
     DetailResponseSerializer,
     HealthResponseSerializer,
+    LatestScoreResponseSerializer,
+    ReadyResponseSerializer,
+    ScoreBatchRequestSerializer,
+    ScoreBatchResponseSerializer,
     ScoreRequestSerializer,
     ScoreResponseSerializer,
     TrainModelResponseSerializer,
+    TrainingJobSerializer,
     ValidationErrorResponseSerializer,
     EmptyRequestSerializer,
 )
+from scoring.training import launch_training_job
+from scoring.validation import ProfileValidator
 
-model_service.model_path = settings.MODEL_PATH
 logger = logging.getLogger(__name__)
+# Fixed-size pool for CPU-bound predict_proba calls issued from async views.
+inference_executor = ThreadPoolExecutor(
+    max_workers=settings.SCORE_INFERENCE_THREADS,
+    thread_name_prefix="inference",
+)
+
+
+profile_validator = ProfileValidator()
+
+
+def validate_score_payload(data) -> tuple[dict, dict]:
+    """`(validated_data, errors)` for a score payload, shaped like `ScoreRequestSerializer`'s."""
+    if settings.SCORE_LEAN_VALIDATION:
+        return profile_validator(data)
+    serializer = ScoreRequestSerializer(data=data)
+    if serializer.is_valid():
+        return serializer.validated_data, {}
+    return {}, serializer.errors
+
+
+def score_response_data(result: tuple[float, float, str], model_version: str) -> dict:
+    attendance_probability, reseller_probability, risk_label = result
+    data = {
+        "attendance_probability": attendance_probability,
+        "reseller_probability": reseller_probability,
+        "risk_label": risk_label,
+        "model_version": model_version,
+    }
+    # The response serializer only copies these primitives; the lean path skips that pass.
+    return data if settings.SCORE_LEAN_VALIDATION else ScoreResponseSerializer(data).data
+
+
+MODEL_KEY_PARAMETER = OpenApiParameter(
+    name="model_key",
+    required=False,
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description="Score with the model trained for this event or region (MODEL_POOL_DIR) instead of the default one.",
+)
+
+
+def scoring_service(model_key: str | None) -> ModelService:
+    """The default model, or the pooled one for `model_key` (loading it on first use)."""
+    if not model_key:
+        return model_service
+    try:
+        return model_pool.service(model_key)
+    except UnknownModelKey:
+        raise ValidationError({"model_key": [f"Unknown model key {model_key!r}."]}) from None
+
+
+def predict_one(features: dict, service: ModelService) -> tuple[float, float, str]:
+    # The micro-batcher only coalesces requests for the default model.
+    if settings.SCORE_MICROBATCH and service is model_service:
+        return micro_batcher.predict(features)
+    return service.predict(features)
+
+
+def skip_duplicate_write(payload: dict, features: dict, service: ModelService) -> bool:
+    # Retries with an identical payload inside the result cache TTL keep the first Prediction row.
+    return settings.SCORE_CACHE_DEDUPE_PREDICTIONS and not service.claim_write(payload["email"], features)
+
+
+def release_duplicate_write(payload: dict, features: dict, service: ModelService) -> None:
+    # The claim is taken before writing; a failed write must not turn the client's retry into a no-op.
+    if settings.SCORE_CACHE_DEDUPE_PREDICTIONS:
+        service.release_write(payload["email"], features)
+
+
+def result_version(result: tuple[float, float, str], service: ModelService) -> str:
+    # Read from the result, not the service: a hot reload may have swapped the model since it predicted.
+    return getattr(result, "model_version", None) or service.version
+
+
+async def timed_stage(view: str, stage: str, awaitable):
+    with observe_stage(view, stage):
+        return await awaitable
+
+
+async def apredict_one(features: dict, service: ModelService) -> tuple[float, float, str]:
+    if settings.SCORE_MICROBATCH and service is model_service:
+        return await asyncio.wrap_future(micro_batcher.submit(features))
+    return await asyncio.get_running_loop().run_in_executor(inference_executor, service.predict, features)
 
 
 class HealthView(APIView):
@@ -43,6 +152,29 @@ class HealthView(APIView):
         return Response({"status": "ok"})
 
 
+class ReadyView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        operation_id="readinessCheck",
+        summary="Readiness check",
+        description=(
+            "Returns 200 once this worker has loaded the model and run a warm-up prediction. "
+            "Before that it returns 503 and starts the warm-up in the background."
+        ),
+        responses={
+            200: OpenApiResponse(response=ReadyResponseSerializer, description="Model loaded and warmed up."),
+            503: OpenApiResponse(response=ReadyResponseSerializer, description="Model still warming up."),
+        },
+    )
+    def get(self, request):
+        if model_service.ready:
+            return Response({"status": "ready", "model_version": model_service.version})
+        model_service.start_warm_up()
+        return Response({"status": "warming_up", "model_version": None}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
 class ScoreView(APIView):
     authentication_classes = []
     permission_classes = []
@@ -50,8 +182,12 @@ class ScoreView(APIView):
     @extend_schema(
         operation_id="scoreUser",
         summary="Score user risk",
-        description="Computes attendance and reseller risk probabilities from user behavioral features.",
+        description=(
+            "Computes attendance and reseller risk probabilities from user behavioral features. "
+            "`model_version` reports the model that served the request."
+        ),
         request=ScoreRequestSerializer,
+        parameters=[MODEL_KEY_PARAMETER],
         responses={
             200: OpenApiResponse(response=ScoreResponseSerializer, description="Scoring completed."),
             400: OpenApiResponse(response=ValidationErrorResponseSerializer, description="Invalid request payload."),
@@ -60,40 +196,295 @@ class ScoreView(APIView):
     )
     def post(self, request):
         try:
-            serializer = ScoreRequestSerializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
-            payload = serializer.validated_data
+            with observe_stage("score", "validate"):
+                payload, errors = validate_score_payload(request.data)
+                if errors:
+                    raise ValidationError(errors)
+
+            features = {k: v for k, v in payload.items() if k != "email"}
+            with observe_stage("score", "predict"):
+                service = scoring_service(request.query_params.get("model_key"))
+                result = predict_one(features, service)
+                model_version = result_version(result, service)
+            if not skip_duplicate_write(payload, features, service):
+                try:
+                    self.save_score(payload, result, model_version)
+                except Exception:
+                    release_duplicate_write(payload, features, service)
+                    raise
 
+            response_data = score_response_data(result, model_version)
+            return Response(response_data, status=status.HTTP_200_OK)
+        except ValidationError:
+            raise
+        except Exception:
+            logger.exception("Unhandled error while scoring user request")
+            raise
+
+    @staticmethod
+    def save_score(payload: dict, result: tuple[float, float, str], model_version: str) -> None:
+        if settings.SCORE_WRITE_BEHIND:
+            with observe_stage("score", "enqueue"):
+                write_behind_buffer.add(payload, result, model_version)
+            return
+        attendance_probability, reseller_probability, risk_label = result
+        count_connection_checkout(connection)
+        with observe_stage("score", "upsert"):
             user, _ = UserProfile.objects.update_or_create(
                 email=payload["email"],
                 defaults=payload,
             )
+        with observe_stage("score", "insert"):
+            prediction = Prediction.objects.create(
+                user=user,
+                attendance_probability=attendance_probability,
+                reseller_probability=reseller_probability,
+                risk_label=risk_label,
+                model_version=model_version,
+            )
+        with observe_stage("score", "latest"):
+            save_latest_predictions([LatestPrediction.from_prediction(user.email, prediction)])
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Render here (Django would do it right after) so it is timed as its own stage.
+        with observe_stage("score", "render"):
+            response = super().finalize_response(request, response, *args, **kwargs)
+            response.render()
+        return response
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncScoreView(View):
+    """Native async variant of `ScoreView` for the ASGI deployment.
+
+    The profile upsert runs on Django's async ORM while the model runs on the
+    bounded `inference_executor`, so a worker holds many in-flight requests
+    without a thread each. Not part of the OpenAPI schema: request and
+    response bodies are the same as `POST /score/`.
+    """
+
+    http_method_names = ["post"]
+    # None: DEFAULT_THROTTLE_CLASSES, read per request so settings overrides apply.
+    throttle_classes = None
+
+    def get_throttles(self):
+        throttle_classes = self.throttle_classes
+        if throttle_classes is None:
+            throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+        return [throttle_class() for throttle_class in throttle_classes]
+
+    async def post(self, request):
+        # Like ScoreView (no authenticators), throttles must see an anonymous user
+        # without touching the session store from the event loop.
+        throttled_request = Request(request, authenticators=())
+        for throttle in self.get_throttles():
+            if not throttle.allow_request(throttled_request, self):
+                return JsonResponse({"detail": "Request was throttled."}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+
+        try:
+            data = loads(request.body) if settings.API_FAST_JSON else json.loads(request.body)
+        except ValueError as exc:
+            return self.json_response({"detail": f"JSON parse error - {exc}"}, status.HTTP_400_BAD_REQUEST)
+
+        with observe_stage("score_async", "validate"):
+            payload, errors = validate_score_payload(data)
+            if errors:
+                return self.json_response(errors, status.HTTP_400_BAD_REQUEST)
+
+        service = model_service
+        if model_key := request.GET.get("model_key"):
+            # A pooled model may have to be loaded first; keep that off the event loop.
+            try:
+                service = await asyncio.get_running_loop().run_in_executor(inference_executor, scoring_service, model_key)
+            except ValidationError as exc:
+                return self.json_response(exc.detail, status.HTTP_400_BAD_REQUEST)
 
+        try:
             features = {k: v for k, v in payload.items() if k != "email"}
-            attendance_probability, reseller_probability, risk_label = model_service.predict(features)
+            prediction = asyncio.ensure_future(timed_stage("score_async", "predict", apredict_one(features, service)))
+            if settings.SCORE_WRITE_BEHIND or settings.SCORE_CACHE_DEDUPE_PREDICTIONS:
+                # Where (and whether) to write depends on the result, so it comes first.
+                result = await prediction
+                model_version = result_version(result, service)
+                if not skip_duplicate_write(payload, features, service):
+                    try:
+                        if settings.SCORE_WRITE_BEHIND:
+                            # A full buffer flushes inline (ORM, flush lock): never on the event loop.
+                            await sync_to_async(write_behind_buffer.add)(payload, result, model_version)
+                        else:
+                            user, _ = await self.aupsert_profile(payload)
+                            await self.acreate_prediction(user, result, model_version)
+                    except Exception:
+                        release_duplicate_write(payload, features, service)
+                        raise
+            else:
+                (user, _), result = await asyncio.gather(self.aupsert_profile(payload), prediction)
+                model_version = result_version(result, service)
+                await self.acreate_prediction(user, result, model_version)
+        except Exception:
+            logger.exception("Unhandled error while scoring user request")
+            raise
 
-            Prediction.objects.create(
+        with observe_stage("score_async", "render"):
+            return self.json_response(score_response_data(result, model_version), status.HTTP_200_OK)
+
+    @staticmethod
+    def json_response(data: dict, status_code: int) -> HttpResponse:
+        if settings.API_FAST_JSON:
+            return HttpResponse(dumps(data), status=status_code, content_type="application/json")
+        return JsonResponse(data, status=status_code)
+
+    @staticmethod
+    async def aupsert_profile(payload: dict) -> tuple[UserProfile, bool]:
+        return await timed_stage(
+            "score_async",
+            "upsert",
+            UserProfile.objects.aupdate_or_create(email=payload["email"], defaults=payload),
+        )
+
+    @staticmethod
+    async def acreate_prediction(user: UserProfile, result: tuple[float, float, str], model_version: str) -> Prediction:
+        attendance_probability, reseller_probability, risk_label = result
+        prediction = await timed_stage(
+            "score_async",
+            "insert",
+            Prediction.objects.acreate(
                 user=user,
                 attendance_probability=attendance_probability,
                 reseller_probability=reseller_probability,
                 risk_label=risk_label,
-                model_version=model_service.version,
-            )
+                model_version=model_version,
+            ),
+        )
+        await timed_stage(
+            "score_async",
+            "latest",
+            sync_to_async(save_latest_predictions)([LatestPrediction.from_prediction(user.email, prediction)]),
+        )
+        return prediction
 
-            response_payload = {
-                "attendance_probability": attendance_probability,
-                "reseller_probability": reseller_probability,
-                "risk_label": risk_label,
-                "model_version": model_service.version,
-            }
-            response = ScoreResponseSerializer(response_payload)
-            return Response(response.data, status=status.HTTP_200_OK)
+
+class LatestScoreView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        operation_id="latestUserScore",
+        summary="Latest score of a user",
+        description=(
+            "Returns the most recent stored score for an email without running the model. Responses carry an "
+            "ETag; send it back in If-None-Match to get 304 Not Modified while the score is unchanged."
+        ),
+        responses={
+            200: OpenApiResponse(response=LatestScoreResponseSerializer, description="Latest score found."),
+            304: OpenApiResponse(description="Score unchanged since the given ETag."),
+            404: OpenApiResponse(response=DetailResponseSerializer, description="Email never scored."),
+        },
+    )
+    def get(self, request, email):
+        with observe_stage("score_latest", "lookup"):
+            found = latest_score(email)
+        if found is None:
+            return Response({"detail": "No score for this email."}, status=status.HTTP_404_NOT_FOUND)
+
+        row, etag = found
+        response = get_conditional_response(request, etag=etag) or Response(LatestScoreResponseSerializer(row).data)
+        response["ETag"] = etag
+        # Clients may keep the body but must revalidate, since a new score can land at any time.
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+class ScoreBatchView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        operation_id="scoreUsersBatch",
+        summary="Score many users in one call",
+        description=(
+            "Validates each item independently, scores all valid items with a single vectorized model call "
+            "and reports per-item validation errors without failing the whole batch."
+        ),
+        request=ScoreBatchRequestSerializer,
+        parameters=[MODEL_KEY_PARAMETER],
+        responses={
+            200: OpenApiResponse(response=ScoreBatchResponseSerializer, description="Batch scoring completed."),
+            400: OpenApiResponse(response=ValidationErrorResponseSerializer, description="Invalid batch envelope."),
+            500: OpenApiResponse(description="Unhandled server error."),
+        },
+    )
+    def post(self, request):
+        with observe_stage("score_batch", "validate"):
+            envelope = ScoreBatchRequestSerializer(data=request.data)
+            envelope.is_valid(raise_exception=True)
+
+            indexes = []
+            payloads = []
+            errors = []
+            for index, item in enumerate(envelope.validated_data["items"]):
+                payload, item_errors = validate_score_payload(item)
+                if item_errors:
+                    errors.append({"index": index, "errors": item_errors})
+                else:
+                    indexes.append(index)
+                    payloads.append(payload)
+
+        try:
+            with observe_stage("score_batch", "predict"):
+                service = scoring_service(request.query_params.get("model_key"))
+                results = service.predict_many([{k: v for k, v in p.items() if k != "email"} for p in payloads])
+                # One predict_many call scores every row with the same model.
+                model_version = result_version(results[0], service) if results else service.version
+            if payloads:
+                with observe_stage("score_batch", "insert"):
+                    bulk_save_scores(payloads, results, model_version)
         except ValidationError:
             raise
         except Exception:
-            logger.exception("Unhandled error while scoring user request")
+            logger.exception("Unhandled error while scoring batch request")
             raise
 
+        response = ScoreBatchResponseSerializer(
+            {
+                "model_version": model_version,
+                "results": [
+                    {
+                        "index": index,
+                        "email": payload["email"],
+                        "attendance_probability": attendance_probability,
+                        "reseller_probability": reseller_probability,
+                        "risk_label": risk_label,
+                        "model_version": model_version,
+                    }
+                    for index, payload, (attendance_probability, reseller_probability, risk_label) in zip(
+                        indexes, payloads, results
+                    )
+                ],
+                "errors": errors,
+            }
+        )
+        return Response(response.data, status=status.HTTP_200_OK)
+
+
+TRAIN_TOKEN_PARAMETER = OpenApiParameter(
+    name="X-Train-Token",
+    required=True,
+    type=str,
+    location=OpenApiParameter.HEADER,
+    description="Training authorization token.",
+)
+
+
+def check_train_access(request):
+    if not settings.ENABLE_MODEL_TRAIN_ENDPOINT:
+        return Response({"detail": "Training endpoint disabled."}, status=status.HTTP_404_NOT_FOUND)
+
+    token = request.headers.get("X-Train-Token", "")
+    if not settings.MODEL_TRAIN_TOKEN or token != settings.MODEL_TRAIN_TOKEN:
+        return Response({"detail": "Unauthorized."}, status=status.HTTP_401_UNAUTHORIZED)
+    return None
+
 
 class TrainModelView(APIView):
     authentication_classes = []
@@ -102,31 +493,84 @@ class TrainModelView(APIView):
     @extend_schema(
         operation_id="trainModel",
         summary="Trigger model training",
-        description="Triggers synchronous model retraining when endpoint is enabled and token is valid.",
+        description=(
+            "Queues a background training job in a separate process when the endpoint is enabled and the token "
+            "is valid. Live scoring keeps using the current model until the new artifact is promoted."
+        ),
         request=EmptyRequestSerializer,
-        parameters=[
-            OpenApiParameter(
-                name="X-Train-Token",
-                required=True,
-                type=str,
-                location=OpenApiParameter.HEADER,
-                description="Training authorization token.",
-            )
-        ],
+        parameters=[TRAIN_TOKEN_PARAMETER],
         responses={
-            202: OpenApiResponse(response=TrainModelResponseSerializer, description="Model retraining triggered."),
+            202: OpenApiResponse(response=TrainModelResponseSerializer, description="Model retraining queued."),
             401: OpenApiResponse(response=DetailResponseSerializer, description="Invalid or missing token."),
             404: OpenApiResponse(response=DetailResponseSerializer, description="Training endpoint disabled."),
+            409: OpenApiResponse(response=DetailResponseSerializer, description="Another training job is active."),
         },
     )
     def post(self, request):
-        if not settings.ENABLE_MODEL_TRAIN_ENDPOINT:
-            return Response({"detail": "Training endpoint disabled."}, status=status.HTTP_404_NOT_FOUND)
+        denied = check_train_access(request)
+        if denied is not None:
+            return denied
+
+        now = timezone.now()
+        stale_before = now - timedelta(seconds=settings.MODEL_TRAIN_JOB_STALE_AFTER)
+        try:
+            # The single-active-job constraint decides between concurrent requests; a read-then-insert would let both in.
+            with transaction.atomic():
+                TrainingJob.objects.filter(
+                    status__in=[TrainingJob.Status.QUEUED, TrainingJob.Status.RUNNING],
+                    created_at__lt=stale_before,
+                ).update(
+                    status=TrainingJob.Status.FAILED,
+                    error="Abandoned: still active after MODEL_TRAIN_JOB_STALE_AFTER.",
+                    finished_at=now,
+                )
+                job = TrainingJob.objects.create(
+                    size=settings.MODEL_TRAIN_SIZE,
+                    seed=settings.MODEL_TRAIN_SEED,
+                    n_jobs=settings.MODEL_TRAIN_N_JOBS,
+                )
+        except IntegrityError:
+            return Response({"detail": "Another training job is active."}, status=status.HTTP_409_CONFLICT)
+        try:
+            launch_training_job(job)
+        except Exception as exc:
+            job.status = TrainingJob.Status.FAILED
+            job.error = repr(exc)
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at"])
+            logger.exception("Unable to launch training job %s", job.id)
+            raise
+
+        response = TrainModelResponseSerializer(
+            {
+                "status": job.status,
+                "job_id": job.id,
+                "status_url": reverse("model-train-status", kwargs={"job_id": job.id}),
+                "model_path": str(settings.MODEL_REGISTRY_DIR or settings.MODEL_PATH),
+            }
+        )
+        return Response(response.data, status=status.HTTP_202_ACCEPTED)
+
+
+class TrainingJobStatusView(APIView):
+    authentication_classes = []
+    permission_classes = []
 
-        token = request.headers.get("X-Train-Token", "")
-        if not settings.MODEL_TRAIN_TOKEN or token != settings.MODEL_TRAIN_TOKEN:
-            return Response({"detail": "Unauthorized."}, status=status.HTTP_401_UNAUTHORIZED)
+    @extend_schema(
+        operation_id="trainModelStatus",
+        summary="Training job status",
+        description="Returns status, validation accuracy and timings of a training job.",
+        parameters=[TRAIN_TOKEN_PARAMETER],
+        responses={
+            200: OpenApiResponse(response=TrainingJobSerializer, description="Training job found."),
+            401: OpenApiResponse(response=DetailResponseSerializer, description="Invalid or missing token."),
+            404: OpenApiResponse(response=DetailResponseSerializer, description="Endpoint disabled or job not found."),
+        },
+    )
+    def get(self, request, job_id):
+        denied = check_train_access(request)
+        if denied is not None:
+            return denied
 
-        call_command("train_model")
-        model_service._model = None
-        return Response({"status": "trained", "model_path": str(settings.MODEL_PATH)}, status=status.HTTP_202_ACCEPTED)
+        job = get_object_or_404(TrainingJob, pk=job_id)
+        return Response(TrainingJobSerializer(job).data)
@@ -0,0 +1,44 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
+
+
+@pytest.fixture(scope="session")
+def trained_model_path(tmp_path_factory, django_db_blocker):
+    """Saved `attendance_model.joblib`, or a small freshly trained one when none exists yet."""
+    if Path(settings.MODEL_PATH).exists():
+        return Path(settings.MODEL_PATH)
+
+    model_path = tmp_path_factory.mktemp("model") / "attendance_model.joblib"
+    with override_settings(MODEL_PATH=model_path), django_db_blocker.unblock():
+        call_command("train_model", size=2000, stdout=StringIO())
+    return model_path
+
+
+@pytest.fixture
+def score_features():
+    """A valid feature row: a `/score/` payload without the email."""
+    return {
+        "age": 29,
+        "country": "CL",
+        "city": "Santiago",
+        "account_age_days": 950,
+        "purchases_last_12_months": 8,
+        "canceled_orders": 0,
+        "tickets_per_order_avg": 1.4,
+        "distance_to_venue_km": 12.5,
+        "payment_failures_ratio": 0.02,
+        "event_affinity_score": 0.91,
+        "night_purchase_ratio": 0.12,
+        "resale_reports_count": 0,
+        "attendance_rate": 0.88,
+    }
+
+
+@pytest.fixture
+def score_payload(score_features):
+    return {"email": "persona@example.com", **score_features}
@@ -0,0 +1,69 @@
+import pytest
+from django.urls import reverse
+
+from scoring import throttling
+from scoring.models import Prediction, UserProfile
+from scoring.throttling import SharedAnonRateThrottle, SharedTokenBuckets
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_score_endpoint_returns_prediction_and_persists_data(client, monkeypatch, score_payload):
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: (0.93, 0.07, "attendee"))
+
+    response = client.post(reverse("score-async"), data=score_payload, content_type="application/json")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "attendance_probability": 0.93,
+        "reseller_probability": 0.07,
+        "risk_label": "attendee",
+        "model_version": "v1",
+    }
+    assert UserProfile.objects.filter(email="persona@example.com").exists()
+    assert Prediction.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_score_endpoint_validates_payload(client, score_payload):
+    response = client.post(reverse("score-async"), data={**score_payload, "age": 12}, content_type="application/json")
+    malformed = client.post(reverse("score-async"), data="{", content_type="application/json")
+
+    assert response.status_code == 400
+    assert "age" in response.json()
+    assert malformed.status_code == 400
+    assert "detail" in malformed.json()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_score_endpoint_logs_unhandled_errors(client, monkeypatch, caplog, score_payload):
+    def boom(_):
+        raise RuntimeError("model missing")
+
+    monkeypatch.setattr("scoring.views.model_service.predict", boom)
+    client.raise_request_exception = False
+
+    with caplog.at_level("ERROR"):
+        response = client.post(reverse("score-async"), data=score_payload, content_type="application/json")
+
+    assert response.status_code == 500
+    assert "Unhandled error while scoring user request" in caplog.text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_score_endpoint_reads_throttle_classes_per_request(
+    client, settings, monkeypatch, tmp_path, score_payload
+):
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: (0.93, 0.07, "attendee"))
+    monkeypatch.setattr(throttling, "shared_token_buckets", SharedTokenBuckets(tmp_path / "buckets", slots=16))
+    monkeypatch.setattr(SharedAnonRateThrottle, "THROTTLE_RATES", {"anon": "1/min"})
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_CLASSES": ["scoring.throttling.SharedAnonRateThrottle"],
+    }
+
+    statuses = [
+        client.post(reverse("score-async"), data=score_payload, content_type="application/json").status_code
+        for _ in range(2)
+    ]
+
+    assert statuses == [200, 429]
@@ -0,0 +1,59 @@
+import pytest
+
+from benchmarks.run import compare, failed_requests, metric_direction
+
+
+def test_metric_direction_by_suffix():
+    assert metric_direction("p99_ms") == -1
+    assert metric_direction("predict_us") == -1
+    assert metric_direction("mean_rss_kb") == -1
+    assert metric_direction("requests_per_second") == 1
+    assert metric_direction("batch_size") == 0
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = {
+        "results": {
+            "score_load/sync/c16": {"p99_ms": 100.0, "requests_per_second": 200.0, "concurrency": 16},
+            "validate/serializer": {"validate_us": 50.0},
+        }
+    }
+    report = {
+        "results": {
+            "score_load/sync/c16": {"p99_ms": 130.0, "requests_per_second": 190.0, "concurrency": 16},
+            "validate/serializer": {"validate_us": 20.0},
+            "predict_warm/native": {"predict_us": 900.0},
+        }
+    }
+
+    comparisons = {(item["name"], item["metric"]): item for item in compare(report, baseline, tolerance=0.15)}
+
+    assert set(comparisons) == {
+        ("score_load/sync/c16", "p99_ms"),
+        ("score_load/sync/c16", "requests_per_second"),
+        ("validate/serializer", "validate_us"),
+    }
+    assert comparisons["score_load/sync/c16", "p99_ms"]["regression"]
+    assert not comparisons["score_load/sync/c16", "requests_per_second"]["regression"]
+    assert not comparisons["validate/serializer", "validate_us"]["regression"]
+    assert comparisons["validate/serializer", "validate_us"]["change"] == -0.6
+
+
+def test_compare_skips_results_with_failed_requests():
+    load = {"statuses": {"200": 40, "500": 24}, "p99_ms": 5.0}
+    assert failed_requests(load) == 24
+    assert failed_requests({"statuses": {"200": 64}}) == 0
+    baseline = {"results": {"score_load/sync/c64": {"statuses": {"200": 64}, "p99_ms": 50.0}}}
+    report = {"results": {"score_load/sync/c64": {**load, "invalid": "24 non-2xx responses"}}}
+
+    assert compare(report, baseline, tolerance=0.15) == []
+
+
+def test_compare_refuses_a_baseline_from_another_machine():
+    meta = {"profile": "quick", "cpu_count": 1, "platform": "Linux-x86_64", "settings": "config.test_settings"}
+    baseline = {"meta": meta, "results": {"validate/serializer": {"validate_us": 50.0}}}
+    report = {"meta": {**meta, "cpu_count": 8}, "results": {"validate/serializer": {"validate_us": 20.0}}}
+
+    with pytest.raises(ValueError, match="cpu_count 1 != 8"):
+        compare(report, baseline, tolerance=0.15)
+    assert compare({**report, "meta": meta}, baseline, tolerance=0.15)[0]["change"] == -0.6
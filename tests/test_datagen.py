@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from scoring.ml.datagen import CITIES, COUNTRIES, generate_chunk, generate_dataset, iter_chunks
+
+
+def test_generate_dataset_is_reproducible_across_worker_counts():
+    serial, serial_labels = generate_dataset(2500, seed=11, chunk_size=1000)
+    parallel, parallel_labels = generate_dataset(2500, seed=11, chunk_size=1000, workers=2)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    np.testing.assert_array_equal(serial_labels, parallel_labels)
+    assert len(serial) == len(serial_labels) == 2500
+    assert list(serial["country"].cat.categories) == COUNTRIES
+    assert list(serial["city"].cat.categories) == CITIES
+    assert serial["tickets_per_order_avg"].dtype == np.float32
+    assert set(np.unique(serial_labels)) == {0, 1}
+
+
+def test_chunks_are_seeded_independently():
+    starts = [start for start, _, _ in iter_chunks(2500, seed=11, chunk_size=1000)]
+    first, _ = generate_chunk(11, 0, 1000)
+    again, _ = generate_chunk(11, 0, 1000)
+    other, _ = generate_chunk(11, 1, 1000)
+
+    assert starts == [0, 1000, 2000]
+    np.testing.assert_array_equal(first["attendance_rate"], again["attendance_rate"])
+    assert not np.array_equal(first["attendance_rate"], other["attendance_rate"])
@@ -0,0 +1,78 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.urls import reverse
+from rest_framework.exceptions import ParseError
+
+from scoring import fastjson
+from scoring.fastjson import FastJSONParser, FastJSONRenderer
+from scoring.views import ScoreView
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    if request.param == "orjson":
+        if fastjson.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(fastjson, "orjson", None)
+    return request.param
+
+
+@pytest.mark.usefixtures("json_backend")
+def test_fast_json_round_trips_and_rejects_invalid_documents():
+    rendered = FastJSONRenderer().render(
+        {"name": "Ñuñoa", "at": datetime(2025, 8, 1, 12, tzinfo=UTC), "amount": Decimal("1.5"), "items": [1, None]}
+    )
+
+    assert FastJSONParser().parse(BytesIO(rendered)) == {
+        "name": "Ñuñoa",
+        "at": "2025-08-01T12:00:00Z",
+        "amount": 1.5,
+        "items": [1, None],
+    }
+    assert FastJSONRenderer().render(None) == b""
+    for document in (b"{not json", b'{"value": NaN}'):
+        with pytest.raises(ParseError, match="JSON parse error"):
+            FastJSONParser().parse(BytesIO(document))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("json_backend")
+@pytest.mark.parametrize("lean", [False, True])
+def test_score_endpoint_responses_match_with_fast_json_and_lean_validation(
+    client, settings, monkeypatch, lean, score_payload
+):
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: (0.93, 0.07, "attendee"))
+    monkeypatch.setattr(ScoreView, "parser_classes", [FastJSONParser])
+    monkeypatch.setattr(ScoreView, "renderer_classes", [FastJSONRenderer])
+    settings.SCORE_LEAN_VALIDATION = lean
+    url = reverse("score")
+
+    response = client.post(url, data={**score_payload, "age": "29"}, content_type="application/json")
+    assert response.status_code == 200
+    assert response.json() == {
+        "attendance_probability": 0.93,
+        "reseller_probability": 0.07,
+        "risk_label": "attendee",
+        "model_version": "v1",
+    }
+
+    invalid = {**score_payload, "age": 12, "email": "nope"}
+    del invalid["city"]
+    response = client.post(url, data=invalid, content_type="application/json")
+    assert response.status_code == 400
+    assert response.json() == {
+        "email": ["Enter a valid email address."],
+        "age": ["Ensure this value is greater than or equal to 13."],
+        "city": ["This field is required."],
+    }
+
+    response = client.post(url, data=[score_payload], content_type="application/json")
+    assert response.status_code == 400
+    assert response.json() == {"non_field_errors": ["Invalid data. Expected a dictionary, but got list."]}
+
+    response = client.post(url, data="{oops", content_type="application/json")
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("JSON parse error")
@@ -0,0 +1,50 @@
+import numpy as np
+import joblib
+import pytest
+
+from scoring.ml.compiled import PipelineNotCompilable
+from scoring.ml.forest import FlatForest
+from scoring.ml.service import ModelService
+
+
+def random_rows(classifier, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(scale=2.0, size=(n_rows, classifier.n_features_in_))
+
+
+@pytest.mark.parametrize("n_rows", [1, 16, 300])
+def test_flat_forest_matches_sklearn_probabilities(trained_model_path, n_rows):
+    classifier = joblib.load(trained_model_path).named_steps["classifier"]
+    rows = random_rows(classifier, n_rows)
+    forest = FlatForest(classifier, chunk_size=64, max_rows=n_rows)
+
+    np.testing.assert_allclose(forest.predict_proba(rows), classifier.predict_proba(rows), rtol=0, atol=1e-12)
+
+
+def test_flat_forest_hands_large_batches_to_sklearn(trained_model_path, mocker):
+    classifier = joblib.load(trained_model_path).named_steps["classifier"]
+    forest = FlatForest(classifier, max_rows=8)
+    spy = mocker.spy(classifier, "predict_proba")
+
+    forest.predict_proba(random_rows(classifier, 8))
+    forest.predict_proba(random_rows(classifier, 9))
+
+    assert spy.call_count == 1
+    with pytest.raises(PipelineNotCompilable):
+        FlatForest(object())
+
+
+def test_forest_inference_mode_matches_pandas_path(trained_model_path, score_features):
+    cases = [
+        score_features,
+        {**score_features, "country": "AR", "city": "Cordoba", "tickets_per_order_avg": 6.5, "resale_reports_count": 4},
+        {**score_features, "country": "ZZ", "city": "Atlantis", "night_purchase_ratio": 0.99, "attendance_rate": 0.01},
+    ]
+    pandas_service = ModelService(trained_model_path, inference_mode="pandas")
+    forest_service = ModelService(trained_model_path, inference_mode="forest")
+
+    assert isinstance(forest_service.current().compiled.classifier, FlatForest)
+    for expected, actual in zip(pandas_service.predict_many(cases), forest_service.predict_many(cases)):
+        assert actual[0] == pytest.approx(expected[0], abs=1e-12)
+        assert actual[2] == expected[2]
+    assert forest_service.predict(cases[0])[0] == pytest.approx(pandas_service.predict(cases[0])[0], abs=1e-12)
@@ -0,0 +1,85 @@
+from io import StringIO
+import csv
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+
+from scoring.models import UserProfile
+from scoring.serializers import ScoreRequestSerializer
+from scoring.validation import ProfileValidator
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {},
+        {"age": "29"},
+        {"age": "29.0"},
+        {"age": "29.5"},
+        {"age": True},
+        {"age": 12},
+        {"age": None},
+        {"age": ""},
+        {"email": "not-an-email"},
+        {"email": "  persona@example.com "},
+        {"country": "x" * 65},
+        {"city": "   "},
+        {"city": "a\x00b"},
+        {"payment_failures_ratio": "nan"},
+        {"payment_failures_ratio": 1.5},
+        {"tickets_per_order_avg": 10**400},
+        {"unknown": "ignored"},
+    ],
+)
+def test_profile_validator_matches_score_request_serializer(changes, score_payload):
+    payload = {**score_payload, **changes}
+    serializer = ScoreRequestSerializer(data=payload)
+    valid = serializer.is_valid()
+    expected_errors = {field: [str(error) for error in errors] for field, errors in serializer.errors.items()}
+
+    validated, errors = ProfileValidator()(payload)
+
+    assert errors == expected_errors
+    assert validated == (dict(serializer.validated_data) if valid else {})
+
+
+@pytest.mark.django_db
+def test_import_profiles_upserts_csv_rows_and_reports_rejects(tmp_path, score_payload):
+    UserProfile.objects.create(**{**score_payload, "age": 50})
+    path = tmp_path / "profiles.csv"
+    with path.open("w", newline="") as output:
+        writer = csv.DictWriter(output, fieldnames=list(score_payload))
+        writer.writeheader()
+        writer.writerow(score_payload)
+        writer.writerow({**score_payload, "email": "otra@example.com", "age": 40})
+        writer.writerow({**score_payload, "email": "rechazo@example.com", "age": 5})
+        writer.writerow({**score_payload, "email": "otra@example.com", "age": 41})
+    rejects = tmp_path / "rejects.jsonl"
+
+    call_command("import_profiles", str(path), batch_size=2, rejects=rejects, stdout=StringIO())
+
+    assert dict(UserProfile.objects.values_list("email", "age")) == {
+        "persona@example.com": 29,
+        "otra@example.com": 41,
+    }
+    assert [json.loads(line) for line in rejects.read_text().splitlines()] == [
+        {"line": 4, "errors": {"age": ["Ensure this value is greater than or equal to 13."]}}
+    ]
+
+
+@pytest.mark.django_db
+def test_import_profiles_reads_gzipped_jsonl(tmp_path, score_payload):
+    path = tmp_path / "profiles.jsonl.gz"
+    with gzip.open(path, "wt") as output:
+        output.write(json.dumps(score_payload) + "\n")
+        output.write("{not json\n")
+        output.write("\n")
+        output.write(json.dumps({**score_payload, "email": "otra@example.com"}) + "\n")
+    errors = StringIO()
+
+    call_command("import_profiles", str(path), stdout=StringIO(), stderr=errors)
+
+    assert UserProfile.objects.count() == 2
+    assert UserProfile.objects.get(email="otra@example.com").tickets_per_order_avg == 1.4
+    assert errors.getvalue().startswith("Line 2: ")
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+
+from scoring.models import LatestPrediction, Prediction
+from scoring.persistence import latest_score_cache, save_latest_predictions, save_score_entries
+
+
+@pytest.fixture(autouse=True)
+def empty_latest_score_cache():
+    latest_score_cache.clear()
+    yield
+    latest_score_cache.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_latest_score_follows_each_score_and_supports_conditional_get(client, monkeypatch, score_payload):
+    url = reverse("score-latest", kwargs={"email": score_payload["email"]})
+    assert client.get(url).status_code == 404
+
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: (0.93, 0.07, "attendee"))
+    client.post(reverse("score"), data=score_payload, content_type="application/json")
+
+    response = client.get(url)
+    assert response.status_code == 200
+    body = response.json()
+    assert {key: body[key] for key in ("email", "risk_label", "attendance_probability", "model_version")} == {
+        "email": score_payload["email"],
+        "risk_label": "attendee",
+        "attendance_probability": 0.93,
+        "model_version": "v1",
+    }
+    etag = response["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: (0.2, 0.8, "reseller_risk"))
+    client.post(reverse("score"), data={**score_payload, "age": 30}, content_type="application/json")
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()["risk_label"] == "reseller_risk"
+    assert response["ETag"] != etag
+    assert Prediction.objects.count() == 2
+    assert LatestPrediction.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_score_writes_keep_the_last_prediction_per_email(score_payload):
+    save_score_entries(
+        [
+            (score_payload, (0.9, 0.1, "attendee"), "v1"),
+            ({**score_payload, "email": "otra@example.com"}, (0.5, 0.5, "attendee"), "v1"),
+            (score_payload, (0.3, 0.7, "reseller_risk"), "v2"),
+        ]
+    )
+
+    latest = LatestPrediction.objects.get(email=score_payload["email"])
+    assert (latest.risk_label, latest.model_version) == ("reseller_risk", "v2")
+    assert latest.scored_at == Prediction.objects.filter(user=latest.user).latest("id").created_at
+    assert LatestPrediction.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_older_latest_prediction_does_not_overwrite_a_newer_one(score_payload):
+    save_score_entries([(score_payload, (0.9, 0.1, "attendee"), "v1")])
+    newer = LatestPrediction.objects.get(email=score_payload["email"])
+    older = LatestPrediction(
+        email=newer.email,
+        user_id=newer.user_id,
+        attendance_probability=0.2,
+        reseller_probability=0.8,
+        risk_label="reseller_risk",
+        model_version="v0",
+        scored_at=newer.scored_at - timedelta(seconds=5),
+    )
+
+    save_latest_predictions([older])
+
+    latest = LatestPrediction.objects.get(email=score_payload["email"])
+    assert (latest.risk_label, latest.model_version, latest.scored_at) == ("attendee", "v1", newer.scored_at)
+
+    older.scored_at = newer.scored_at + timedelta(seconds=5)
+    save_latest_predictions([older])
+
+    assert LatestPrediction.objects.get(email=score_payload["email"]).model_version == "v0"
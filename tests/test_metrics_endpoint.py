@@ -0,0 +1,94 @@
+import pytest
+from django.urls import reverse
+
+
+def stage_count(body: str, view: str, stage: str) -> float:
+    prefix = f'score_stage_seconds_count{{stage="{stage}",view="{view}"}} '
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return 0.0
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_exposes_score_stage_timings(client, monkeypatch, score_payload):
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: (0.93, 0.07, "attendee"))
+    before = client.get(reverse("metrics")).content.decode()
+
+    response = client.post(reverse("score"), data=score_payload, content_type="application/json")
+    metrics = client.get(reverse("metrics"))
+
+    assert response.status_code == 200
+    assert metrics.status_code == 200
+    assert metrics["Content-Type"].startswith("text/plain")
+    body = metrics.content.decode()
+    for stage in ("validate", "predict", "upsert", "insert", "render"):
+        assert stage_count(body, "score", stage) == stage_count(before, "score", stage) + 1
+    # DB_POOL is on by default: connection reuse comes from the pool's stats instead.
+    assert "db_connection_checkouts_total" not in body
+    assert "db_connections_opened_total" not in body
+
+
+@pytest.mark.django_db
+def test_connection_metrics_count_checkouts_without_pool(client, monkeypatch, score_payload):
+    from prometheus_client import CollectorRegistry
+
+    from scoring.metrics import register_connection_metrics
+
+    registry = CollectorRegistry()
+    monkeypatch.setattr("scoring.metrics.connection_metrics", {})
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: (0.93, 0.07, "attendee"))
+    register_connection_metrics(registry)
+
+    client.post(reverse("score"), data=score_payload, content_type="application/json")
+
+    assert registry.get_sample_value("db_connection_checkouts_total", {"state": "reused"}) == 1
+
+
+class FakePool:
+    def pop_stats(self):
+        return {
+            "pool_min": 2,
+            "pool_max": 8,
+            "pool_size": 3,
+            "pool_available": 1,
+            "requests_waiting": 2,
+            "requests_num": 10,
+            "requests_queued": 4,
+            "requests_wait_ms": 250,
+            "requests_errors": 1,
+            "connections_num": 3,
+        }
+
+
+def sample(body: str, name: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_exposes_db_pool_stats(client, monkeypatch):
+    from django.db import connections
+
+    from scoring.metrics import record_db_pool_stats
+
+    before = client.get(reverse("metrics")).content.decode()
+    monkeypatch.setattr(connections["default"], "pool", FakePool(), raising=False)
+    record_db_pool_stats()
+    monkeypatch.delattr(connections["default"], "pool")
+    body = client.get(reverse("metrics")).content.decode()
+
+    assert sample(body, 'db_pool_connections{alias="default",state="idle"}') == 1
+    assert sample(body, 'db_pool_connections{alias="default",state="in_use"}') == 2
+    assert sample(body, 'db_pool_requests_waiting{alias="default"}') == 2
+    for name, delta in (
+        ('db_pool_acquires_total{alias="default",outcome="ok"}', 9),
+        ('db_pool_acquires_total{alias="default",outcome="queued"}', 4),
+        ('db_pool_acquires_total{alias="default",outcome="error"}', 1),
+        ('db_pool_acquire_wait_seconds_total{alias="default"}', 0.25),
+        ('db_pool_connections_opened_total{alias="default"}', 3),
+        ('db_pool_connections_reused_total{alias="default"}', 6),
+    ):
+        assert sample(body, name) == pytest.approx(sample(before, name) + delta)
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+from django.urls import reverse
+
+from scoring.ml.batching import MicroBatcher
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    calls = []
+
+    def predict_many(features_list):
+        calls.append(len(features_list))
+        return [(feature["value"], 1 - feature["value"], "attendee") for feature in features_list]
+
+    batcher = MicroBatcher(predict_many, max_batch_size=64, max_wait=0.2)
+    futures = [batcher.submit({"value": index / 10}) for index in range(10)]
+
+    assert [future.result(timeout=2)[0] for future in futures] == [index / 10 for index in range(10)]
+    assert calls == [10]
+    assert batcher.stats()["batch_size_histogram"] == {16: 1}
+
+
+def test_micro_batcher_caps_batch_size():
+    calls = []
+
+    def predict_many(features_list):
+        calls.append(len(features_list))
+        return [(0.9, 0.1, "attendee")] * len(features_list)
+
+    batcher = MicroBatcher(predict_many, max_batch_size=2, max_wait=0.2)
+    futures = [batcher.submit({}) for _ in range(5)]
+    for future in futures:
+        future.result(timeout=2)
+
+    stats = batcher.stats()
+    assert max(calls) == 2
+    assert stats["requests"] == 5
+    assert stats["max_batch_size"] == 2
+
+
+def test_micro_batcher_propagates_errors_to_every_caller():
+    def predict_many(features_list):
+        raise RuntimeError("model missing")
+
+    batcher = MicroBatcher(predict_many, max_wait=0.05)
+    futures = [batcher.submit({}) for _ in range(3)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=2)
+
+
+def test_micro_batcher_skips_cancelled_futures_and_keeps_serving():
+    calls = []
+    release = threading.Event()
+
+    def predict_many(features_list):
+        calls.append([features["value"] for features in features_list])
+        release.wait(timeout=2)
+        return [(features["value"], 0.0, "attendee") for features in features_list]
+
+    batcher = MicroBatcher(predict_many, max_batch_size=64, max_wait=0.2)
+    futures = [batcher.submit({"value": index}) for index in range(3)]
+    assert futures[1].cancel()
+    release.set()
+
+    assert futures[0].result(timeout=2)[0] == 0
+    assert futures[2].result(timeout=2)[0] == 2
+    assert calls == [[0, 2]]
+    assert batcher.submit({"value": 7}).result(timeout=2)[0] == 7
+    assert batcher.stats()["requests"] == 3
+
+
+def test_micro_batcher_survives_a_malformed_batch_result():
+    results = iter([[], [(0.5, 0.5, "attendee")]])
+    batcher = MicroBatcher(lambda features_list: next(results), max_wait=0)
+
+    with pytest.raises(ValueError):
+        batcher.submit({}).result(timeout=2)
+
+    assert batcher.submit({}).result(timeout=2) == (0.5, 0.5, "attendee")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_score_endpoint_uses_micro_batcher_when_enabled(client, settings, monkeypatch, score_payload):
+    settings.SCORE_MICROBATCH = True
+    monkeypatch.setattr(
+        "scoring.views.micro_batcher",
+        MicroBatcher(lambda features_list: [(0.2, 0.8, "reseller_risk")] * len(features_list), max_wait=0),
+    )
+    response = client.post(reverse("score"), data=score_payload, content_type="application/json")
+    async_response = client.post(reverse("score-async"), data=score_payload, content_type="application/json")
+
+    assert response.status_code == 200
+    assert response.json()["risk_label"] == "reseller_risk"
+    assert async_response.json()["risk_label"] == "reseller_risk"
@@ -0,0 +1,119 @@
+import shutil
+import threading
+
+import joblib
+import pytest
+
+from scoring.ml.pool import ModelPool, UnknownModelKey
+from scoring.ml.registry import ModelRegistry
+from scoring.ml.service import ModelService
+from scoring.models import LatestPrediction, Prediction
+
+@pytest.fixture
+def pool_root(trained_model_path, tmp_path):
+    root = tmp_path / "models"
+    root.mkdir()
+    for key in ("rock-fest", "jazz-night", "opera"):
+        shutil.copy(trained_model_path, root / f"{key}.joblib")
+    return root
+
+
+def test_pool_evicts_least_recently_used_models_over_the_memory_budget(pool_root):
+    size = (pool_root / "opera.joblib").stat().st_size
+    pool = ModelPool(pool_root, max_bytes=2 * size, reload_check_interval=-1)
+
+    rock = pool.service("rock-fest")
+    assert pool.service("rock-fest") is rock
+    pool.service("jazz-night")
+    # Touching rock-fest makes jazz-night the least recently used.
+    pool.service("rock-fest")
+    pool.service("opera")
+
+    assert pool.stats() == {"models": ["rock-fest", "opera"], "bytes": 2 * size, "max_bytes": 2 * size}
+    assert pool.service("rock-fest") is rock
+    assert pool.service("jazz-night").version == "jazz-night"
+    assert pool.stats()["models"] == ["rock-fest", "jazz-night"]
+
+
+def test_pool_keeps_a_model_larger_than_the_budget(pool_root):
+    pool = ModelPool(pool_root, max_bytes=1, reload_check_interval=-1)
+
+    pool.service("rock-fest")
+    pool.service("opera")
+
+    assert pool.stats()["models"] == ["opera"]
+
+
+def test_concurrent_requests_for_a_key_load_it_once(pool_root, monkeypatch):
+    loads = []
+    original = ModelService._load
+    monkeypatch.setattr(ModelService, "_load", lambda self, generation: loads.append(self) or original(self, generation))
+    pool = ModelPool(pool_root, reload_check_interval=-1)
+    barrier = threading.Barrier(8)
+    services = []
+
+    def request():
+        barrier.wait()
+        services.append(pool.service("rock-fest"))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len(services) == 8 and all(service is services[0] for service in services)
+
+
+@pytest.mark.parametrize("key", ["missing", "../models/opera", "opera.joblib", ""])
+def test_pool_rejects_unknown_and_unsafe_keys(pool_root, key):
+    pool = ModelPool(pool_root, reload_check_interval=-1)
+
+    with pytest.raises(UnknownModelKey):
+        pool.service(key)
+    assert pool.stats()["models"] == []
+
+
+def test_pool_serves_the_promoted_version_of_a_registry_key(trained_model_path, pool_root):
+    registry = ModelRegistry(pool_root / "pop-tour")
+    version = registry.register(joblib.load(trained_model_path), {})["version"]
+    pool = ModelPool(pool_root, reload_check_interval=-1)
+
+    with pytest.raises(UnknownModelKey):
+        pool.service("pop-tour")
+    registry.promote(version)
+
+    assert pool.service("pop-tour").version == version
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", ["/api/v1/score/", "/api/v1/score/async/"])
+def test_score_endpoint_serves_the_requested_model_key(client, monkeypatch, pool_root, path, score_payload):
+    pool = ModelPool(pool_root, reload_check_interval=-1)
+    monkeypatch.setattr("scoring.views.model_pool", pool)
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: pytest.fail("default model used"))
+
+    response = client.post(f"{path}?model_key=opera", data=score_payload, content_type="application/json")
+
+    assert response.status_code == 200
+    assert response.json()["model_version"] == "opera"
+    assert Prediction.objects.get().model_version == "opera"
+    assert LatestPrediction.objects.get().model_version == "opera"
+
+    response = client.post(f"{path}?model_key=unknown", data=score_payload, content_type="application/json")
+    assert response.status_code == 400
+    assert response.json() == {"model_key": ["Unknown model key 'unknown'."]}
+
+
+@pytest.mark.django_db
+def test_score_batch_endpoint_serves_the_requested_model_key(client, monkeypatch, pool_root, score_payload):
+    monkeypatch.setattr("scoring.views.model_pool", ModelPool(pool_root, reload_check_interval=-1))
+
+    response = client.post(
+        "/api/v1/score/batch/?model_key=jazz-night", data={"items": [score_payload]}, content_type="application/json"
+    )
+
+    assert response.status_code == 200
+    assert response.json()["model_version"] == "jazz-night"
+    assert response.json()["results"][0]["model_version"] == "jazz-night"
@@ -0,0 +1,120 @@
+from io import StringIO
+
+import joblib
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from scoring.ml.registry import ModelRegistry, UnknownModelVersion
+from scoring.ml.service import ModelService
+from scoring.models import Prediction
+
+
+def test_registry_promotes_and_rolls_back_without_retraining(trained_model_path, tmp_path):
+    pipeline = joblib.load(trained_model_path)
+    registry = ModelRegistry(tmp_path / "registry")
+    first = registry.register(pipeline, {"validation_accuracy": 0.8})
+    second = registry.register(pipeline.set_params(classifier__n_jobs=1), {"validation_accuracy": 0.9})
+
+    assert registry.register(pipeline, {"validation_accuracy": 0.0}) == second
+    assert first["version"] != second["version"]
+    assert registry.artifact_path(first["version"]).name == f"{first['sha256'][:12]}.joblib"
+
+    service = ModelService(tmp_path / "unused.joblib", reload_check_interval=0, registry=registry)
+    with pytest.raises(FileNotFoundError):
+        service.current()
+
+    registry.promote(first["version"])
+    assert service.current().version == first["version"]
+    assert service.version == first["version"]
+
+    registry.promote(second["version"])
+    assert service.current().version == first["version"]
+    service._reload_thread.join()
+    assert service.current().version == second["version"]
+    assert service.current().generation == 2
+
+    assert registry.rollback()["version"] == first["version"]
+    service.current()
+    service._reload_thread.join()
+    assert service.current().version == first["version"]
+    with pytest.raises(UnknownModelVersion):
+        registry.rollback()
+    with pytest.raises(UnknownModelVersion):
+        registry.promote("deadbeef")
+
+
+@pytest.mark.django_db
+def test_train_model_registers_artifact_with_metadata(settings, tmp_path):
+    settings.MODEL_REGISTRY_DIR = tmp_path / "registry"
+    registry = ModelRegistry(settings.MODEL_REGISTRY_DIR)
+
+    call_command("train_model", size=1000, seed=7, n_jobs=1, stdout=StringIO())
+    call_command("train_model", size=1000, seed=8, n_jobs=1, no_promote=True, stdout=StringIO())
+
+    first, second = registry.versions()
+    assert registry.current_version() == first["version"]
+    assert first["training_size"] == 1000
+    assert first["seed"] == 7
+    assert first["fit_seconds"] > 0
+    assert 0 <= first["validation_accuracy"] <= 1
+    assert "country" in first["features"]["categorical"]
+
+    call_command("model_registry", "promote", second["version"], stdout=StringIO())
+    assert registry.current_version() == second["version"]
+    call_command("model_registry", "rollback", stdout=StringIO())
+    assert registry.current_version() == first["version"]
+
+    output = StringIO()
+    call_command("model_registry", "list", stdout=output)
+    assert f"* {first['version']}" in output.getvalue()
+    with pytest.raises(CommandError):
+        call_command("model_registry", "promote", "unknown", stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_score_endpoint_reports_registry_version(client, monkeypatch, trained_model_path, tmp_path, score_payload):
+    registry = ModelRegistry(tmp_path / "registry")
+    version = registry.register(joblib.load(trained_model_path), {})["version"]
+    registry.promote(version)
+    service = ModelService(tmp_path / "unused.joblib", reload_check_interval=-1, registry=registry)
+    monkeypatch.setattr("scoring.views.model_service", service)
+
+    response = client.post("/api/v1/score/", data=score_payload, content_type="application/json")
+
+    assert response.status_code == 200
+    assert response.json()["model_version"] == version
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("path", ["/api/v1/score/", "/api/v1/score/async/", "/api/v1/score/batch/"])
+def test_score_endpoints_label_results_with_the_model_that_produced_them(
+    client, monkeypatch, trained_model_path, tmp_path, path, score_payload
+):
+    pipeline = joblib.load(trained_model_path)
+    registry = ModelRegistry(tmp_path / "registry")
+    first = registry.register(pipeline, {})["version"]
+    second = registry.register(pipeline.set_params(classifier__n_jobs=1), {})["version"]
+    registry.promote(first)
+    service = ModelService(tmp_path / "unused.joblib", reload_check_interval=-1, registry=registry)
+    monkeypatch.setattr("scoring.views.model_service", service)
+
+    def promote_after(predict):
+        def wrapper(*args):
+            result = predict(*args)
+            registry.promote(second)
+            service.reload()
+            return result
+
+        return wrapper
+
+    monkeypatch.setattr(service, "predict", promote_after(service.predict))
+    monkeypatch.setattr(service, "predict_many", promote_after(service.predict_many))
+    data = {"items": [score_payload]} if path.endswith("batch/") else score_payload
+
+    response = client.post(path, data=data, content_type="application/json")
+
+    assert response.status_code == 200
+    assert service.version == second
+    assert response.json()["model_version"] == first
+    assert Prediction.objects.get().model_version == first
@@ -0,0 +1,86 @@
+import os
+import shutil
+import threading
+
+import joblib
+
+from scoring.ml.service import ModelService
+
+
+def test_model_service_hot_swaps_when_artifact_changes(trained_model_path, tmp_path):
+    model_path = tmp_path / "attendance_model.joblib"
+    shutil.copy(trained_model_path, model_path)
+    service = ModelService(model_path, reload_check_interval=0)
+
+    first = service.current()
+    assert service.current() is first
+
+    replacement = tmp_path / "replacement.joblib"
+    joblib.dump(first.pipeline, replacement)
+    os.replace(replacement, model_path)
+
+    assert service.current() is first
+    service._reload_thread.join()
+    second = service.current()
+    assert second is not first
+    assert second.generation == first.generation + 1
+
+
+def test_model_service_keeps_serving_while_another_thread_reloads(trained_model_path, tmp_path):
+    model_path = tmp_path / "attendance_model.joblib"
+    shutil.copy(trained_model_path, model_path)
+    service = ModelService(model_path, reload_check_interval=0)
+    handle = service.current()
+    os.utime(model_path, ns=(0, 0))
+
+    service._lock.acquire()
+    try:
+        result = []
+        reader = threading.Thread(target=lambda: result.append(service.current()))
+        reader.start()
+        reader.join(timeout=2)
+        assert result == [handle]
+    finally:
+        service._lock.release()
+
+    assert service.current() is handle
+    service._reload_thread.join()
+    assert service.current().generation == handle.generation + 1
+
+
+def test_model_service_serves_old_handle_while_new_model_loads(trained_model_path, tmp_path):
+    model_path = tmp_path / "attendance_model.joblib"
+    shutil.copy(trained_model_path, model_path)
+    service = ModelService(model_path, reload_check_interval=0)
+    handle = service.current()
+    os.utime(model_path, ns=(0, 0))
+    load = service._load
+    release = threading.Event()
+
+    def slow_load(generation):
+        release.wait(timeout=5)
+        return load(generation)
+
+    service._load = slow_load
+    try:
+        assert service.current() is handle
+        assert service._reload_thread.is_alive()
+        assert service.current() is handle
+    finally:
+        release.set()
+    service._reload_thread.join()
+
+    assert service.current().generation == handle.generation + 1
+
+
+def test_model_service_keeps_current_model_when_reload_fails(trained_model_path, tmp_path):
+    model_path = tmp_path / "attendance_model.joblib"
+    shutil.copy(trained_model_path, model_path)
+    service = ModelService(model_path, reload_check_interval=0)
+    handle = service.current()
+
+    model_path.write_bytes(b"truncated pickle")
+
+    assert service.current() is handle
+    service._reload_thread.join()
+    assert service.current() is handle
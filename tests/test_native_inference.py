@@ -0,0 +1,43 @@
+import numpy as np
+import joblib
+import pandas as pd
+import pytest
+
+from scoring.ml.compiled import CompiledPipeline, PipelineNotCompilable
+from scoring.ml.service import ModelService
+
+
+@pytest.fixture
+def feature_cases(score_features):
+    return [
+        score_features,
+        {**score_features, "country": "AR", "city": "Cordoba", "tickets_per_order_avg": 6.5, "resale_reports_count": 4},
+        {**score_features, "country": "ZZ", "city": "Atlantis", "night_purchase_ratio": 0.99, "attendance_rate": 0.01},
+        {**score_features, "age": 74, "account_age_days": 0, "payment_failures_ratio": 1.0, "event_affinity_score": 0.0},
+    ]
+
+
+def test_compiled_pipeline_matches_column_transformer_output(trained_model_path, feature_cases):
+    pipeline = joblib.load(trained_model_path)
+    compiled = CompiledPipeline(pipeline)
+
+    expected = pipeline.named_steps["preprocessor"].transform(pd.DataFrame(feature_cases))
+    if hasattr(expected, "toarray"):
+        expected = expected.toarray()
+
+    np.testing.assert_array_equal(compiled.transform_many(feature_cases), expected)
+
+
+def test_native_inference_is_bit_identical_to_pandas_path(trained_model_path, feature_cases):
+    pandas_service = ModelService(trained_model_path, inference_mode="pandas")
+    native_service = ModelService(trained_model_path, inference_mode="native")
+
+    for features in feature_cases:
+        assert native_service.predict(features) == pandas_service.predict(features)
+    assert native_service.predict_many(feature_cases) == pandas_service.predict_many(feature_cases)
+    assert native_service.current().compiled is not None
+
+
+def test_compiled_pipeline_rejects_unexpected_pipelines():
+    with pytest.raises(PipelineNotCompilable):
+        CompiledPipeline(type("FakePipeline", (), {"steps": [("classifier", object())]})())
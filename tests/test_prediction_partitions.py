@@ -0,0 +1,46 @@
+from datetime import UTC, datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from scoring.management.commands.prediction_partitions import next_period, parse_bound, partition_name, period_start
+from scoring.models import Prediction
+
+
+@pytest.mark.django_db
+def test_prediction_indexes_are_migrated():
+    call_command("makemigrations", "scoring", check=True, dry_run=True, stdout=StringIO())
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, Prediction._meta.db_table)
+
+    assert constraints["prediction_user_latest_idx"]["columns"] == ["user_id", "created_at", "id"]
+    assert constraints["prediction_version_time_idx"]["columns"] == ["model_version", "created_at"]
+    assert constraints["prediction_label_time_idx"]["columns"] == ["risk_label", "created_at"]
+    # The composite index replaces the foreign key's single-column one.
+    assert not [
+        name for name, constraint in constraints.items() if constraint["index"] and constraint["columns"] == ["user_id"]
+    ]
+
+
+def test_partition_periods_roll_over_months_and_days():
+    moment = datetime(2026, 12, 31, 23, 30, tzinfo=UTC)
+
+    assert period_start(moment, "month") == datetime(2026, 12, 1, tzinfo=UTC)
+    assert next_period(period_start(moment, "month"), "month") == datetime(2027, 1, 1, tzinfo=UTC)
+    assert next_period(period_start(moment, "day"), "day") == datetime(2027, 1, 1, tzinfo=UTC)
+    assert partition_name(moment, "month") == "scoring_prediction_p2026_12"
+    assert partition_name(moment, "day") == "scoring_prediction_p2026_12_31"
+    assert parse_bound("'2026-12-01 00:00:00+00'") == datetime(2026, 12, 1, tzinfo=UTC)
+    assert parse_bound("MINVALUE") is None
+
+
+@pytest.mark.django_db
+def test_prediction_partitions_requires_postgresql():
+    if connection.vendor == "postgresql":
+        pytest.skip("partitioning is available on PostgreSQL")
+
+    with pytest.raises(CommandError, match="requires PostgreSQL"):
+        call_command("prediction_partitions", "status")
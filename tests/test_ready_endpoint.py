@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.urls import reverse
+
+from scoring.ml.service import ModelService
+
+
+def test_ready_endpoint_is_503_and_starts_warm_up_until_the_model_is_loaded(trained_model_path, client, monkeypatch):
+    service = ModelService(trained_model_path, reload_check_interval=-1)
+    monkeypatch.setattr("scoring.views.model_service", service)
+
+    response = client.get(reverse("ready"))
+    assert response.status_code == 503
+    assert response.json() == {"status": "warming_up", "model_version": None}
+
+    service._warm_up_thread.join(timeout=60)
+    assert service.ready
+    response = client.get(reverse("ready"))
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "model_version": "v1"}
+
+
+def test_every_load_runs_a_warm_up_prediction_before_serving(trained_model_path, monkeypatch):
+    warmed = []
+    original = ModelService._warm
+    monkeypatch.setattr(ModelService, "_warm", staticmethod(lambda handle: warmed.append(handle) or original(handle)))
+    service = ModelService(trained_model_path, inference_mode="native", reload_check_interval=-1)
+
+    assert not service.ready
+    assert service.warm_up() > 0
+    assert service.ready
+    handle = service.current()
+    assert warmed == [handle, handle]
+
+    service.reload()
+    assert warmed[-1] is service.current() is not handle
+
+
+def test_warm_up_failure_keeps_the_service_not_ready(tmp_path):
+    service = ModelService(tmp_path / "missing.joblib", reload_check_interval=-1)
+
+    service.start_warm_up()
+    service._warm_up_thread.join(timeout=10)
+
+    assert not service.ready
+
+
+def test_app_import_does_not_load_the_ml_stack():
+    code = (
+        "import sys, django; django.setup(); import config.urls, config.asgi; "
+        "print(sorted({'joblib', 'numpy', 'pandas', 'sklearn'} & set(sys.modules)))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parent.parent,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "config.test_settings"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == "[]"
@@ -0,0 +1,77 @@
+from io import StringIO
+import json
+
+import pytest
+from django.core.management import call_command
+
+from scoring.ml.service import ModelService
+from scoring.models import LatestPrediction, Prediction, UserProfile
+from scoring.persistence import PROFILE_FIELDS
+
+
+def create_profiles(count):
+    for index in range(count):
+        UserProfile.objects.create(
+            email=f"rescore-{index}@example.com",
+            age=20 + index % 50,
+            country=["CL", "AR", "ZZ"][index % 3],
+            city=["Santiago", "Cordoba", "Atlantis"][index % 3],
+            account_age_days=30 * index,
+            purchases_last_12_months=index % 10,
+            canceled_orders=index % 4,
+            tickets_per_order_avg=1 + index % 6,
+            distance_to_venue_km=float(index),
+            payment_failures_ratio=(index % 10) / 20,
+            event_affinity_score=(index % 7) / 7,
+            night_purchase_ratio=(index % 5) / 5,
+            resale_reports_count=index % 3,
+            attendance_rate=(index % 9) / 9,
+        )
+
+
+@pytest.fixture
+def served_model(monkeypatch, trained_model_path):
+    service = ModelService(trained_model_path, reload_check_interval=-1)
+    monkeypatch.setattr("scoring.management.commands.rescore_profiles.model_service", service)
+    return service
+
+
+@pytest.mark.django_db
+def test_rescore_profiles_scores_all_profiles_and_resumes_from_checkpoint(served_model, tmp_path):
+    create_profiles(25)
+    checkpoint = tmp_path / "checkpoint.json"
+    output = StringIO()
+
+    call_command("rescore_profiles", chunk_size=10, checkpoint=checkpoint, stdout=output)
+
+    assert Prediction.objects.count() == 25
+    assert set(Prediction.objects.values_list("model_version", flat=True)) == {"v1"}
+    assert LatestPrediction.objects.count() == 25
+    assert set(LatestPrediction.objects.values_list("email", "user__email")) == {
+        (email, email) for email in UserProfile.objects.values_list("email", flat=True)
+    }
+    assert json.loads(checkpoint.read_text())["last_pk"] == UserProfile.objects.latest("pk").pk
+    assert "rows/s" in output.getvalue()
+    first = UserProfile.objects.order_by("pk").values(*PROFILE_FIELDS).first()
+    stored = Prediction.objects.get(user__email="rescore-0@example.com")
+    assert stored.attendance_probability == served_model.predict(first)[0]
+
+    UserProfile.objects.create(**{**first, "email": "rescore-new@example.com"})
+    call_command("rescore_profiles", chunk_size=10, checkpoint=checkpoint, stdout=StringIO())
+    assert Prediction.objects.count() == 26
+
+    call_command("rescore_profiles", chunk_size=10, checkpoint=checkpoint, restart=True, stdout=StringIO())
+    assert Prediction.objects.count() == 52
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rescore_profiles_matches_across_worker_processes(served_model, tmp_path):
+    create_profiles(30)
+
+    call_command("rescore_profiles", chunk_size=7, checkpoint=tmp_path / "serial.json", stdout=StringIO())
+    serial = dict(Prediction.objects.values_list("user_id", "attendance_probability"))
+    Prediction.objects.all().delete()
+    call_command("rescore_profiles", chunk_size=7, workers=2, checkpoint=tmp_path / "pool.json", stdout=StringIO())
+
+    assert dict(Prediction.objects.values_list("user_id", "attendance_probability")) == serial
+
@@ -0,0 +1,111 @@
+import os
+import shutil
+
+import joblib
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import Client
+from django.urls import reverse
+
+from scoring.ml.cache import ResultCache
+from scoring.ml.service import ModelService, Score
+from scoring.models import Prediction
+
+def test_result_cache_normalizes_keys_and_evicts_lru():
+    cache = ResultCache(max_entries=2, ttl=60)
+
+    assert cache.key({"age": 29, "city": "Santiago"}, "v1") == cache.key({"city": "Santiago", "age": 29.0}, "v1")
+    assert cache.key({"age": 29}, "v1") != cache.key({"age": 29}, "v2")
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats() == {"hits": 2, "shared_hits": 0, "misses": 1, "evictions": 1, "expirations": 0, "size": 2}
+
+
+def test_result_cache_expires_entries_and_shares_through_backend():
+    backend = LocMemCache("result-cache-test", {})
+    writer = ResultCache(ttl=60, backend=backend)
+    reader = ResultCache(ttl=60, backend=backend)
+    expiring = ResultCache(ttl=0)
+
+    writer.set("key", Score((0.9, 0.1, "attendee"), "v2"))
+    expiring.set("key", 1)
+
+    assert reader.get("key") == (0.9, 0.1, "attendee")
+    assert reader.get("key").model_version == "v2"
+    assert reader.stats()["shared_hits"] == 1
+    assert expiring.get("key") is None
+    assert expiring.stats()["expirations"] == 1
+
+
+def test_model_service_serves_repeated_features_from_cache_until_model_changes(
+    trained_model_path, tmp_path, score_features
+):
+    model_path = tmp_path / "attendance_model.joblib"
+    shutil.copy(trained_model_path, model_path)
+    service = ModelService(model_path, reload_check_interval=0)
+    service.result_cache = ResultCache(ttl=60)
+
+    first = service.predict(score_features)
+    assert service.predict(dict(score_features)) == first
+    assert service.predict_many([score_features, {**score_features, "age": 50}])[0] == first
+    assert service.result_cache.stats()["hits"] == 2
+
+    replacement = tmp_path / "replacement.joblib"
+    joblib.dump(service.current().pipeline, replacement)
+    os.replace(replacement, model_path)
+    service.current()
+    service._reload_thread.join()
+
+    service.predict(score_features)
+    assert service.result_cache.stats()["hits"] == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_score_endpoint_dedupes_prediction_writes_for_cached_retries(
+    client, settings, monkeypatch, trained_model_path, score_payload
+):
+    settings.SCORE_CACHE_DEDUPE_PREDICTIONS = True
+    service = ModelService(trained_model_path, reload_check_interval=-1)
+    service.result_cache = ResultCache(ttl=60)
+    monkeypatch.setattr("scoring.views.model_service", service)
+
+    for _ in range(3):
+        response = client.post(reverse("score"), data=score_payload, content_type="application/json")
+        assert response.status_code == 200
+    client.post(reverse("score"), data={**score_payload, "email": "otra@example.com"}, content_type="application/json")
+
+    assert Prediction.objects.count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    ("url_name", "write"),
+    [("score", "scoring.views.ScoreView.save_score"), ("score-async", "scoring.views.AsyncScoreView.aupsert_profile")],
+)
+def test_failed_prediction_write_releases_the_dedupe_claim(
+    settings, monkeypatch, trained_model_path, url_name, write, score_payload
+):
+    settings.SCORE_CACHE_DEDUPE_PREDICTIONS = True
+    service = ModelService(trained_model_path, reload_check_interval=-1)
+    service.result_cache = ResultCache(ttl=60)
+    monkeypatch.setattr("scoring.views.model_service", service)
+
+    def database_down(*args):
+        raise RuntimeError("database down")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(write, staticmethod(database_down))
+        failed = Client(raise_request_exception=False).post(
+            reverse(url_name), data=score_payload, content_type="application/json"
+        )
+    retried = Client().post(reverse(url_name), data=score_payload, content_type="application/json")
+
+    assert failed.status_code == 500
+    assert retried.status_code == 200
+    assert Prediction.objects.count() == 1
@@ -0,0 +1,81 @@
+import pytest
+from django.urls import reverse
+from scoring.models import Prediction, UserProfile
+
+
+@pytest.mark.django_db(transaction=True)
+def test_score_batch_scores_valid_items_in_one_call_and_reports_errors(client, monkeypatch, score_payload):
+    calls = []
+
+    def fake_predict_many(features_list):
+        calls.append(features_list)
+        return [(0.93, 0.07, "attendee"), (0.2, 0.8, "reseller_risk")]
+
+    monkeypatch.setattr("scoring.views.model_service.predict_many", fake_predict_many)
+
+    response = client.post(
+        reverse("score-batch"),
+        data={
+            "items": [
+                {**score_payload, "email": "uno@example.com"},
+                {**score_payload, "email": "dos@example.com", "age": 12},
+                {**score_payload, "email": "tres@example.com"},
+            ]
+        },
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(calls) == 1
+    assert len(calls[0]) == 2
+    assert "email" not in calls[0][0]
+    assert [result["index"] for result in body["results"]] == [0, 2]
+    assert body["results"][1]["risk_label"] == "reseller_risk"
+    assert body["errors"][0]["index"] == 1
+    assert "age" in body["errors"][0]["errors"]
+    assert UserProfile.objects.count() == 2
+    assert Prediction.objects.count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_score_batch_upserts_existing_profiles(client, monkeypatch, score_payload):
+    monkeypatch.setattr(
+        "scoring.views.model_service.predict_many",
+        lambda features_list: [(0.93, 0.07, "attendee")] * len(features_list),
+    )
+
+    client.post(
+        reverse("score-batch"),
+        data={"items": [{**score_payload, "email": "uno@example.com"}]},
+        content_type="application/json",
+    )
+    response = client.post(
+        reverse("score-batch"),
+        data={
+            "items": [
+                {**score_payload, "email": "uno@example.com", "age": 40},
+                {**score_payload, "email": "uno@example.com", "age": 41},
+            ]
+        },
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert UserProfile.objects.count() == 1
+    assert UserProfile.objects.get().age == 41
+    assert Prediction.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_score_batch_rejects_oversized_batches(client, settings, score_payload):
+    settings.SCORE_BATCH_MAX_ITEMS = 1
+
+    response = client.post(
+        reverse("score-batch"),
+        data={"items": [{**score_payload, "email": "uno@example.com"}, {**score_payload, "email": "dos@example.com"}]},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+    assert "items" in response.json()
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from scoring import throttling
+from scoring.throttling import SharedAnonRateThrottle, SharedTokenBuckets
+from scoring.views import ScoreView
+
+CONSUMER = """
+import sys
+from scoring.throttling import SharedTokenBuckets
+buckets = SharedTokenBuckets(sys.argv[1])
+print(sum(buckets.consume("client", 100, 1e-9)[0] for _ in range(60)))
+"""
+
+
+def test_token_bucket_bursts_then_refills_at_rate(tmp_path):
+    buckets = SharedTokenBuckets(tmp_path / "buckets", slots=16)
+
+    assert [buckets.consume("a", 3, 1.0, now=10.0)[0] for _ in range(3)] == [True, True, True]
+    allowed, wait = buckets.consume("a", 3, 1.0, now=10.0)
+    assert not allowed and wait == pytest.approx(1.0)
+    # Other keys have their own bucket.
+    assert buckets.consume("b", 3, 1.0, now=10.0)[0]
+
+    assert buckets.consume("a", 3, 1.0, now=11.5) == (True, 0.0)
+    allowed, wait = buckets.consume("a", 3, 1.0, now=11.5)
+    assert not allowed and wait == pytest.approx(0.5)
+    # Refill is capped at the capacity.
+    assert sum(buckets.consume("a", 3, 1.0, now=1000.0)[0] for _ in range(5)) == 3
+
+
+def test_token_bucket_limit_is_global_across_processes(tmp_path):
+    path = tmp_path / "buckets"
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "config.test_settings"}
+    consumers = [
+        subprocess.Popen(
+            [sys.executable, "-c", CONSUMER, str(path)],
+            cwd=Path(__file__).resolve().parent.parent,
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(4)
+    ]
+    allowed = [int(consumer.communicate(timeout=60)[0]) for consumer in consumers]
+
+    assert all(consumer.returncode == 0 for consumer in consumers)
+    assert sum(allowed) == 100
+
+
+def test_score_view_returns_429_once_the_shared_bucket_is_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(throttling, "shared_token_buckets", SharedTokenBuckets(tmp_path / "buckets", slots=16))
+    monkeypatch.setattr(SharedAnonRateThrottle, "THROTTLE_RATES", {"anon": "2/min"})
+    view = ScoreView.as_view(throttle_classes=[SharedAnonRateThrottle])
+    factory = APIRequestFactory()
+
+    # Throttling runs before validation, so invalid bodies still spend tokens.
+    statuses = [view(factory.post("/api/v1/score/", {}, format="json")).status_code for _ in range(3)]
+    assert statuses == [400, 400, 429]
+
+    response = view(factory.post("/api/v1/score/", {}, format="json"))
+    assert response.status_code == 429
+    assert 0 < int(response["Retry-After"]) <= 30
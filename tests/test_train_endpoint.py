@@ -1,5 +1,16 @@
+from datetime import timedelta
+from io import StringIO
+import threading
+
 import pytest
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, close_old_connections
+from django.test import Client
 from django.urls import reverse
+from django.utils import timezone
+
+from scoring.models import TrainingJob
+from scoring.training import reap_training_job
 
 
 @pytest.mark.django_db
@@ -23,16 +34,35 @@ def test_train_endpoint_requires_token(client, settings):
 
 
 @pytest.mark.django_db
-def test_train_endpoint_trains_when_enabled_and_token_is_valid(client, settings, monkeypatch):
+def test_train_endpoint_queues_background_job_when_enabled_and_token_is_valid(client, settings, monkeypatch):
     settings.ENABLE_MODEL_TRAIN_ENDPOINT = True
     settings.MODEL_TRAIN_TOKEN = "secret"
+    settings.MODEL_TRAIN_N_JOBS = 2
 
-    trained = {"called": False}
+    launched = []
+    monkeypatch.setattr("scoring.views.launch_training_job", launched.append)
 
-    def fake_call_command(*args, **kwargs):
-        trained["called"] = True
+    response = client.post(
+        reverse("model-train"),
+        content_type="application/json",
+        HTTP_X_TRAIN_TOKEN="secret",
+    )
 
-    monkeypatch.setattr("scoring.views.call_command", fake_call_command)
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+    job = TrainingJob.objects.get(pk=body["job_id"])
+    assert launched == [job]
+    assert job.n_jobs == 2
+    assert body["status_url"] == reverse("model-train-status", kwargs={"job_id": job.id})
+
+
+@pytest.mark.django_db
+def test_train_endpoint_rejects_concurrent_jobs(client, settings, monkeypatch):
+    settings.ENABLE_MODEL_TRAIN_ENDPOINT = True
+    settings.MODEL_TRAIN_TOKEN = "secret"
+    TrainingJob.objects.create(size=1000, seed=42, n_jobs=1, status=TrainingJob.Status.RUNNING)
+    monkeypatch.setattr("scoring.views.launch_training_job", lambda job: None)
 
     response = client.post(
         reverse("model-train"),
@@ -40,6 +70,152 @@ def test_train_endpoint_trains_when_enabled_and_token_is_valid(client, settings,
         HTTP_X_TRAIN_TOKEN="secret",
     )
 
+    assert response.status_code == 409
+
+
+@pytest.mark.django_db(transaction=True)
+def test_train_endpoint_starts_one_job_for_simultaneous_requests(settings, monkeypatch):
+    settings.ENABLE_MODEL_TRAIN_ENDPOINT = True
+    settings.MODEL_TRAIN_TOKEN = "secret"
+    launched = []
+    monkeypatch.setattr("scoring.views.launch_training_job", launched.append)
+    barrier = threading.Barrier(4)
+    statuses = []
+
+    def post():
+        barrier.wait()
+        try:
+            statuses.append(Client().post(reverse("model-train"), HTTP_X_TRAIN_TOKEN="secret").status_code)
+        finally:
+            close_old_connections()
+
+    threads = [threading.Thread(target=post) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [202, 409, 409, 409]
+    assert len(launched) == 1
+    assert TrainingJob.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_train_endpoint_fails_stale_jobs_and_starts_a_new_one(client, settings, monkeypatch):
+    settings.ENABLE_MODEL_TRAIN_ENDPOINT = True
+    settings.MODEL_TRAIN_TOKEN = "secret"
+    settings.MODEL_TRAIN_JOB_STALE_AFTER = 60
+    stale = TrainingJob.objects.create(size=1000, seed=42, n_jobs=1, status=TrainingJob.Status.RUNNING)
+    TrainingJob.objects.filter(pk=stale.pk).update(created_at=timezone.now() - timedelta(minutes=5))
+    monkeypatch.setattr("scoring.views.launch_training_job", lambda job: None)
+
+    response = client.post(reverse("model-train"), HTTP_X_TRAIN_TOKEN="secret")
+
     assert response.status_code == 202
-    assert response.json()["status"] == "trained"
-    assert trained["called"] is True
+    stale.refresh_from_db()
+    assert stale.status == TrainingJob.Status.FAILED
+    assert stale.finished_at is not None
+    with pytest.raises(IntegrityError):
+        TrainingJob.objects.create(size=1000, seed=42, n_jobs=1)
+
+
+@pytest.mark.django_db
+def test_train_status_endpoint_reports_job(client, settings):
+    settings.ENABLE_MODEL_TRAIN_ENDPOINT = True
+    settings.MODEL_TRAIN_TOKEN = "secret"
+    job = TrainingJob.objects.create(
+        size=1000,
+        seed=42,
+        n_jobs=1,
+        status=TrainingJob.Status.SUCCEEDED,
+        validation_accuracy=0.8,
+        timings={"fit_seconds": 1.5},
+    )
+
+    unauthorized = client.get(reverse("model-train-status", kwargs={"job_id": job.id}))
+    response = client.get(reverse("model-train-status", kwargs={"job_id": job.id}), HTTP_X_TRAIN_TOKEN="secret")
+
+    assert unauthorized.status_code == 401
+    assert response.status_code == 200
+    assert response.json()["status"] == "succeeded"
+    assert response.json()["validation_accuracy"] == 0.8
+    assert response.json()["timings"] == {"fit_seconds": 1.5}
+
+
+@pytest.mark.django_db
+def test_train_model_command_updates_job(settings, tmp_path):
+    settings.MODEL_PATH = tmp_path / "attendance_model.joblib"
+    job = TrainingJob.objects.create(size=1000, seed=7, n_jobs=1)
+
+    call_command("train_model", size=1000, seed=7, n_jobs=1, job_id=str(job.id), stdout=StringIO())
+
+    job.refresh_from_db()
+    assert job.status == TrainingJob.Status.SUCCEEDED
+    assert job.validation_accuracy is not None
+    assert job.timings["fit_seconds"] > 0
+    assert job.started_at is not None and job.finished_at is not None
+    assert settings.MODEL_PATH.exists()
+
+
+@pytest.mark.django_db
+def test_train_model_command_records_invalid_arguments_on_job(settings, tmp_path):
+    settings.MODEL_PATH = tmp_path / "attendance_model.joblib"
+    job = TrainingJob.objects.create(size=1000, seed=7, n_jobs=1)
+
+    with pytest.raises(CommandError):
+        call_command("train_model", since="yesterday", job_id=str(job.id), stdout=StringIO())
+
+    job.refresh_from_db()
+    assert job.status == TrainingJob.Status.FAILED
+    assert "--since" in job.error
+    assert job.finished_at is not None
+
+
+@pytest.mark.django_db
+def test_train_model_command_does_not_revive_a_failed_job(settings, tmp_path):
+    settings.MODEL_PATH = tmp_path / "attendance_model.joblib"
+    job = TrainingJob.objects.create(size=1000, seed=7, n_jobs=1, status=TrainingJob.Status.FAILED, error="stale")
+
+    with pytest.raises(CommandError, match="no longer active"):
+        call_command("train_model", size=1000, seed=7, n_jobs=1, job_id=str(job.id), stdout=StringIO())
+
+    job.refresh_from_db()
+    assert job.status == TrainingJob.Status.FAILED
+    assert job.error == "stale"
+    assert not settings.MODEL_PATH.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("returncode, expected", [(-9, TrainingJob.Status.FAILED), (0, TrainingJob.Status.RUNNING)])
+def test_reaper_fails_jobs_whose_process_exits_non_zero(returncode, expected):
+    job = TrainingJob.objects.create(size=1000, seed=7, n_jobs=1, status=TrainingJob.Status.RUNNING)
+
+    class Process:
+        def wait(self):
+            return returncode
+
+    reaper = threading.Thread(target=reap_training_job, args=(Process(), job.id))
+    reaper.start()
+    reaper.join()
+
+    job.refresh_from_db()
+    assert job.status == expected
+    if returncode:
+        assert job.error == "train_model exited with status -9."
+        assert job.finished_at is not None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reaper_keeps_the_error_recorded_by_the_command():
+    job = TrainingJob.objects.create(size=1000, seed=7, n_jobs=1, status=TrainingJob.Status.FAILED, error="ValueError()")
+
+    class Process:
+        def wait(self):
+            return 1
+
+    reaper = threading.Thread(target=reap_training_job, args=(Process(), job.id))
+    reaper.start()
+    reaper.join()
+
+    job.refresh_from_db()
+    assert job.error == "ValueError()"
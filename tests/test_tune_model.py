@@ -0,0 +1,49 @@
+from io import StringIO
+import json
+
+import pytest
+from django.core.management import call_command
+
+from scoring.management.commands.tune_model import pareto_front
+from scoring.ml.registry import ModelRegistry
+
+
+def test_pareto_front_keeps_only_undominated_candidates():
+    candidates = [
+        {"name": "fast", "accuracy": 0.80, "latency_us": 100},
+        {"name": "slow_worse", "accuracy": 0.79, "latency_us": 300},
+        {"name": "balanced", "accuracy": 0.85, "latency_us": 200},
+        {"name": "best", "accuracy": 0.86, "latency_us": 900},
+    ]
+
+    assert [candidate["name"] for candidate in pareto_front(candidates)] == ["fast", "balanced", "best"]
+
+
+@pytest.mark.django_db
+def test_tune_model_writes_choice_used_by_train_model(settings, tmp_path):
+    settings.MODEL_REGISTRY_DIR = tmp_path / "registry"
+    output = StringIO()
+
+    call_command(
+        "tune_model",
+        size=2000,
+        n_estimators=[4, 8],
+        max_depth=[3, None],
+        cv=2,
+        n_jobs=1,
+        latency_rows=5,
+        stdout=output,
+    )
+
+    tuning = json.loads((settings.MODEL_REGISTRY_DIR / "tuning.json").read_text())
+    assert len(tuning["candidates"]) == 4
+    assert tuning["params"] in tuning["pareto_front"]
+    assert all(candidate["latency_us"] > 0 for candidate in tuning["candidates"])
+    assert "> n_estimators" in output.getvalue()
+
+    call_command("train_model", size=1000, n_jobs=1, tuned=True, min_samples_leaf=5, stdout=StringIO())
+
+    registry = ModelRegistry(settings.MODEL_REGISTRY_DIR)
+    record = registry.metadata(registry.current_version())
+    assert record["params"] == {**tuning["params"], "min_samples_leaf": 5}
+    assert record["tuned_at"] == tuning["created_at"]
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from io import StringIO
+import shutil
+
+import joblib
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from scoring.ml.registry import ModelRegistry
+from scoring.models import Prediction, UserProfile
+
+
+def create_history(count, seed=3):
+    rng = np.random.default_rng(seed)
+    for index in range(count):
+        attendee = index % 3 != 0
+        user = UserProfile.objects.create(
+            email=f"history-{index}@example.com",
+            age=int(rng.integers(18, 70)),
+            country=["CL", "AR", "PE"][index % 3],
+            city=["Santiago", "Cordoba", "Lima"][index % 3],
+            account_age_days=int(rng.integers(1, 3650)),
+            purchases_last_12_months=int(rng.poisson(6)),
+            canceled_orders=int(rng.poisson(1)),
+            tickets_per_order_avg=float(rng.uniform(1, 2) if attendee else rng.uniform(4, 8)),
+            distance_to_venue_km=float(rng.uniform(0, 400)),
+            payment_failures_ratio=float(rng.uniform(0, 0.1) if attendee else rng.uniform(0.2, 0.5)),
+            event_affinity_score=float(rng.uniform(0, 1)),
+            night_purchase_ratio=float(rng.uniform(0, 1)),
+            resale_reports_count=0 if attendee else int(rng.integers(2, 6)),
+            attendance_rate=float(rng.uniform(0.6, 1) if attendee else rng.uniform(0, 0.4)),
+        )
+        Prediction.objects.create(
+            user=user,
+            attendance_probability=0.9 if attendee else 0.2,
+            reseller_probability=0.1 if attendee else 0.8,
+            risk_label="attendee" if attendee else "reseller_risk",
+            model_version="v1",
+        )
+
+
+@pytest.mark.django_db
+def test_train_model_grows_served_forest_from_database_history(settings, tmp_path, trained_model_path):
+    settings.MODEL_REGISTRY_DIR = None
+    settings.MODEL_PATH = tmp_path / "attendance_model.joblib"
+    shutil.copy(trained_model_path, settings.MODEL_PATH)
+    base_trees = len(joblib.load(settings.MODEL_PATH).named_steps["classifier"].estimators_)
+    create_history(200)
+    output = StringIO()
+
+    call_command(
+        "train_model",
+        source="database",
+        self_label=True,
+        add_trees=5,
+        batch_size=64,
+        n_jobs=1,
+        stdout=output,
+        stderr=StringIO(),
+    )
+
+    classifier = joblib.load(settings.MODEL_PATH).named_steps["classifier"]
+    assert len(classifier.estimators_) == classifier.n_estimators == base_trees + 5
+    assert classifier.warm_start is False
+    assert "Rows read from database: 200" in output.getvalue()
+    assert "rows/s" in output.getvalue() and "per tree" in output.getvalue()
+
+
+@pytest.mark.django_db
+def test_warm_start_registers_new_version_and_caps_tree_count(settings, tmp_path, trained_model_path):
+    settings.MODEL_REGISTRY_DIR = tmp_path / "registry"
+    registry = ModelRegistry(settings.MODEL_REGISTRY_DIR)
+    base = registry.register(joblib.load(trained_model_path), {"source": "synthetic"})
+    registry.promote(base["version"])
+    create_history(120)
+
+    call_command(
+        "train_model",
+        source="database",
+        self_label=True,
+        add_trees=4,
+        max_trees=10,
+        n_jobs=1,
+        stdout=StringIO(),
+        stderr=StringIO(),
+    )
+
+    record = registry.metadata(registry.current_version())
+    assert record["base_version"] == base["version"]
+    assert record["training_size"] == 120
+    assert record["added_trees"] == 4
+    assert record["labels"] == "self"
+    assert record["params"]["n_estimators"] == 10
+    assert record["seconds_per_tree"] > 0
+    with pytest.raises(CommandError):
+        call_command(
+            "train_model",
+            source="database",
+            self_label=True,
+            since=(timezone.now() + timedelta(days=1)).isoformat(),
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+
+
+@pytest.mark.django_db
+def test_database_source_requires_explicit_self_label(settings, tmp_path, trained_model_path):
+    settings.MODEL_REGISTRY_DIR = None
+    settings.MODEL_PATH = tmp_path / "attendance_model.joblib"
+    shutil.copy(trained_model_path, settings.MODEL_PATH)
+    create_history(30)
+
+    with pytest.raises(CommandError, match="--self-label"):
+        call_command("train_model", source="database", add_trees=2, n_jobs=1, stdout=StringIO())
+
+    assert settings.MODEL_PATH.read_bytes() == trained_model_path.read_bytes()
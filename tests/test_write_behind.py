@@ -0,0 +1,77 @@
+import pytest
+from django.urls import reverse
+
+from scoring.models import Prediction, UserProfile
+from scoring.persistence import WriteBehindBuffer
+
+
+@pytest.mark.django_db(transaction=True)
+def test_score_endpoint_defers_writes_in_write_behind_mode(client, settings, monkeypatch, score_payload):
+    settings.SCORE_WRITE_BEHIND = True
+    buffer = WriteBehindBuffer(flush_interval=60)
+    monkeypatch.setattr("scoring.views.write_behind_buffer", buffer)
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: (0.93, 0.07, "attendee"))
+    payload = {**score_payload, "email": "uno@example.com"}
+
+    response = client.post(reverse("score"), data=payload, content_type="application/json")
+
+    assert response.status_code == 200
+    assert response.json()["risk_label"] == "attendee"
+    assert Prediction.objects.count() == 0
+    assert buffer.stats()["depth"] == 1
+
+    buffer.close()
+
+    assert UserProfile.objects.get().email == "uno@example.com"
+    assert Prediction.objects.get().model_version == "v1"
+    assert buffer.stats()["flushed"] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_write_behind_buffer_flushes_in_batches_and_upserts_profiles(score_payload):
+    buffer = WriteBehindBuffer(max_batch=2, flush_interval=60)
+    buffer.add({**score_payload, "email": "uno@example.com"}, (0.93, 0.07, "attendee"), "v1")
+    buffer.add({**score_payload, "email": "uno@example.com", "age": 40}, (0.2, 0.8, "reseller_risk"), "v1")
+    buffer.add({**score_payload, "email": "dos@example.com"}, (0.93, 0.07, "attendee"), "v2")
+
+    assert buffer.flush() == 3
+
+    stats = buffer.stats()
+    assert stats["flushes"] == 2
+    assert stats["depth"] == 0
+    assert stats["max_flush_seconds"] > 0
+    assert UserProfile.objects.get(email="uno@example.com").age == 40
+    assert Prediction.objects.count() == 3
+    assert Prediction.objects.filter(model_version="v2").count() == 1
+    buffer.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_write_behind_buffer_flushes_inline_when_full(score_payload):
+    buffer = WriteBehindBuffer(max_batch=10, flush_interval=60, max_pending=2)
+    for index in range(5):
+        buffer.add({**score_payload, "email": f"user{index}@example.com"}, (0.93, 0.07, "attendee"), "v1")
+        assert buffer.stats()["depth"] <= 2
+
+    assert Prediction.objects.count() >= 3
+    buffer.close()
+    assert Prediction.objects.count() == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_score_endpoint_flushes_a_full_write_behind_buffer_off_the_event_loop(
+    client, settings, monkeypatch, score_payload
+):
+    settings.SCORE_WRITE_BEHIND = True
+    buffer = WriteBehindBuffer(max_batch=10, flush_interval=60, max_pending=2)
+    monkeypatch.setattr("scoring.views.write_behind_buffer", buffer)
+    monkeypatch.setattr("scoring.views.model_service.predict", lambda _: (0.93, 0.07, "attendee"))
+
+    for index in range(3):
+        payload = {**score_payload, "email": f"user{index}@example.com"}
+        response = client.post(reverse("score-async"), data=payload, content_type="application/json")
+        assert response.status_code == 200
+
+    assert Prediction.objects.count() >= 1
+    buffer.close()
+    assert Prediction.objects.count() == 3